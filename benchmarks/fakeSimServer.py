@@ -0,0 +1,127 @@
+"""
+Fake SIM Server
+Local stand-in for the SIM token-holders endpoint, serving deterministic synthetic holders
+"""
+import json
+import multiprocessing
+import re
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+HOLDERS_PATH = re.compile(r"^/evm/token-holders/(\d+)/(0x[0-9a-fA-F]+)$")
+
+# Same page cap as the real endpoint
+MAX_PAGE_SIZE = 500
+
+
+def synthetic_holder(index: int) -> dict:
+    """
+    Build the holder at a given position
+    
+    Balances span many orders of magnitude, like real token distributions.
+    
+    Args:
+        index: Holder position
+        
+    Returns:
+        Holder record in SIM API format
+    """
+    mantissa = (index * 2654435761) % 1_000_000 + 1
+    return {
+        "wallet_address": f"0x{index:040x}",
+        "balance": str(mantissa * 10 ** (12 + index % 10)),
+        "first_acquired": f"2024-{index % 12 + 1:02d}-{index % 28 + 1:02d}T12:00:00+00:00",
+        "has_initiated_transfer": index % 3 == 0
+    }
+
+
+def holders_page(total_holders: int, offset: int, limit: int) -> bytes:
+    """
+    Encode one page of synthetic holders
+    
+    Args:
+        total_holders: Number of holders the token has
+        offset: Position of the first holder of the page
+        limit: Requested page size
+        
+    Returns:
+        JSON response body
+    """
+    end = min(offset + min(limit, MAX_PAGE_SIZE), total_holders)
+    holders = [synthetic_holder(index) for index in range(offset, end)]
+    next_offset = str(end) if end < total_holders else None
+    return json.dumps({"holders": holders, "next_offset": next_offset}).encode()
+
+
+class _HoldersHandler(BaseHTTPRequestHandler):
+    """Serves ``/evm/token-holders/{chain_id}/{address}?limit=&offset=``"""
+    
+    total_holders = 0
+    
+    def do_GET(self) -> None:
+        url = urlparse(self.path)
+        if not HOLDERS_PATH.match(url.path):
+            self.send_error(404)
+            return
+        query = parse_qs(url.query)
+        limit = int(query.get("limit", [MAX_PAGE_SIZE])[0])
+        offset = int(query.get("offset", ["0"])[0])
+        body = holders_page(self.total_holders, offset, limit)
+        
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+    
+    def log_message(self, *args) -> None:
+        pass
+
+
+def _serve(total_holders: int, ports: multiprocessing.Queue) -> None:
+    """Run the server until the process is terminated"""
+    handler = type("HoldersHandler", (_HoldersHandler,), {"total_holders": total_holders})
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    ports.put(server.server_port)
+    server.serve_forever()
+
+
+class FakeSimServer:
+    """Fake SIM endpoint running in a child process, so it does not share the benchmark's GIL"""
+    
+    def __init__(self, total_holders: int):
+        """
+        Initialize the server (started by ``start`` or ``with``)
+        
+        Args:
+            total_holders: Number of holders every token reports
+        """
+        self.total_holders = total_holders
+        self.port = None
+        self._process = None
+    
+    @property
+    def base_url(self) -> str:
+        """Base URL to use in place of ``DUNE_SIM_BASE_URL``"""
+        return f"http://127.0.0.1:{self.port}"
+    
+    def start(self) -> "FakeSimServer":
+        """Start the server process and wait until it listens"""
+        ports = multiprocessing.Queue()
+        self._process = multiprocessing.Process(target=_serve, args=(self.total_holders, ports), daemon=True)
+        self._process.start()
+        self.port = ports.get(timeout=30)
+        return self
+    
+    def stop(self) -> None:
+        """Terminate the server process"""
+        if self._process is not None:
+            self._process.terminate()
+            self._process.join()
+            self._process = None
+    
+    def __enter__(self) -> "FakeSimServer":
+        return self.start()
+    
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
@@ -0,0 +1,182 @@
+"""
+Pipeline Benchmark
+Times and memory-profiles each stage of fetch -> normalize -> metrics -> render
+
+Usage:
+    python -m benchmarks.pipeline                              # 1k, 100k and 1M holders
+    python -m benchmarks.pipeline --sizes 1000 100000 --output results.json
+"""
+import argparse
+import json
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+import pandas as pd
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List
+from src.api import DuneAPI, DuneHttpClient, RateLimiter, ResponseCache
+from src.api.dune.decoding import decode_holders_page
+from src.api.dune.endpoints import DEFAULT_HOLDERS_PAGE_SIZE, sort_holders_by_balance
+from src.helpers.dune import (
+    normalize_token_balance,
+    calculate_holder_metrics,
+    create_comparison_dataframe,
+    prepare_holder_display_columns
+)
+from src.models import apply_holder_schema
+from src.utility.graphs import create_comparison_bar_chart
+from .fakeSimServer import FakeSimServer
+
+DEFAULT_SIZES = [1_000, 100_000, 1_000_000]
+
+CHAIN_ID = 137
+TOKEN_ADDRESS = "0x" + "ab" * 20
+
+
+def fetch_pages(client: DuneHttpClient, base_url: str) -> List[bytes]:
+    """Download every holder page as raw bytes through ``DuneHttpClient.get``"""
+    url = f"{base_url}/evm/token-holders/{CHAIN_ID}/{TOKEN_ADDRESS}"
+    bodies, offset = [], None
+    while True:
+        params = {"limit": DEFAULT_HOLDERS_PAGE_SIZE}
+        if offset:
+            params["offset"] = offset
+        body = client.get(url, use_sim=True, params=params, decoder=bytes)
+        bodies.append(body)
+        offset = json.loads(body).get("next_offset")
+        if not offset:
+            return bodies
+
+
+def build_frame(bodies: List[bytes]) -> pd.DataFrame:
+    """Turn raw pages into the holders frame exactly as ``DuneAPI.get_token_holders`` does"""
+    pages = [decode_holders_page(body)["holders"] for body in bodies]
+    df = apply_holder_schema(pd.concat(pages, ignore_index=True, copy=False))
+    return sort_holders_by_balance(df)
+
+
+def measure(func: Callable[[], Any], repeat: int) -> Dict[str, Any]:
+    """
+    Time a stage and measure its peak Python heap allocation
+    
+    Timings come from untraced runs (best of ``repeat``); the peak comes from
+    one extra run under ``tracemalloc``, which only sees allocations made
+    through Python and NumPy, not Arrow's memory pool.
+    
+    Args:
+        func: Zero-argument stage callable
+        repeat: Number of timed runs
+        
+    Returns:
+        Dictionary with the stage result, timings and peak bytes
+    """
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = func()
+        timings.append(time.perf_counter() - started)
+    
+    tracemalloc.start()
+    try:
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    
+    return {
+        "result": result,
+        "seconds": min(timings),
+        "mean_seconds": sum(timings) / len(timings),
+        "peak_bytes": peak
+    }
+
+
+def benchmark_size(rows: int, repeat: int) -> List[Dict[str, Any]]:
+    """
+    Run every stage against a fake SIM server with ``rows`` holders
+    
+    Args:
+        rows: Number of synthetic holders
+        repeat: Timed runs per stage
+        
+    Returns:
+        One result record per stage
+    """
+    records = []
+    with FakeSimServer(rows) as server:
+        client = DuneHttpClient(api_key="benchmark", rate_limiter=RateLimiter(0),
+                                response_cache=ResponseCache(max_bytes=0, directory=None))
+        api = DuneAPI(client=client)
+        api.sim_base_url = server.base_url
+        
+        state: Dict[str, Any] = {}
+        
+        def run(name: str, func: Callable[[], Any]) -> Any:
+            measured = measure(func, repeat)
+            records.append({
+                "rows": rows,
+                "stage": name,
+                "seconds": measured["seconds"],
+                "mean_seconds": measured["mean_seconds"],
+                "peak_bytes": measured["peak_bytes"],
+                "repeat": repeat
+            })
+            print(f"{rows:>9,} rows  {name:<28} {measured['seconds']:8.3f}s  "
+                  f"peak {measured['peak_bytes'] / 2 ** 20:8.1f} MiB", file=sys.stderr)
+            return measured["result"]
+        
+        state["bodies"] = run("http_get", lambda: fetch_pages(client, server.base_url))
+        state["holders"] = run("frame_construction", lambda: build_frame(state["bodies"]))
+        run("get_token_holders", lambda: api.get_token_holders(CHAIN_ID, TOKEN_ADDRESS))
+        state["normalized"] = run("normalize_token_balance",
+                                  lambda: normalize_token_balance(state["holders"].copy(deep=False)))
+        run("calculate_holder_metrics", lambda: calculate_holder_metrics(state["normalized"]))
+        run("prepare_holder_display_columns", lambda: prepare_holder_display_columns(state["normalized"]))
+        # The unwrapped builder, so repeats measure a build instead of a figure cache hit
+        run("create_comparison_bar_chart", lambda: create_comparison_bar_chart.__wrapped__(
+            create_comparison_dataframe({"COPM": state["normalized"], "COPW": state["normalized"]})))
+        client.close()
+    return records
+
+
+def git_revision() -> str:
+    """Return the current commit, or None outside a git checkout"""
+    try:
+        return subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main() -> None:
+    """Parse arguments, run the benchmark and write the JSON report"""
+    parser = argparse.ArgumentParser(description="Benchmark the holders pipeline stage by stage")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES,
+                        help="Holder counts to benchmark (default: 1000 100000 1000000)")
+    parser.add_argument("--repeat", type=int, default=3, help="Timed runs per stage (default: 3)")
+    parser.add_argument("--output", help="Write the JSON report to this file (default: stdout)")
+    args = parser.parse_args()
+    
+    results = []
+    for rows in args.sizes:
+        results.extend(benchmark_size(rows, args.repeat))
+    
+    report = {
+        "commit": git_revision(),
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "pandas": pd.__version__,
+        "results": results
+    }
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as output:
+            output.write(text + "\n")
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
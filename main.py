@@ -1,77 +1,273 @@
 import streamlit as st
 from datetime import datetime
 
-from src.config import validate_config
+from src.config import DUNE_INSTRUMENTATION, DUNE_TRANSFERS_QUERY_ID, DUNE_VOLUME_QUERY_ID, validate_config
+from src.api import DuneAPI
 from src.services import DashboardService
 from src.utility import (
     create_comparison_bar_chart,
+    create_line_chart,
     create_token_volume_chart,
-    format_number_with_commas
+    format_number_with_commas,
+    metrics_registry
 )
 
+# Formato de columnas de las tablas de holders (el balance se envía numérico)
+HOLDER_COLUMN_CONFIG = {
+    "balance": st.column_config.NumberColumn("balance", format="%.2f")
+}
+
+# Paginación de las tablas de holders
+HOLDERS_PAGE_SIZE = 50
+HOLDER_SORT_OPTIONS = {
+    "Balance (mayor a menor)": ("balance_token", False),
+    "Balance (menor a mayor)": ("balance_token", True),
+    "Primera adquisición": ("first_acquired", True)
+}
+
+# Series históricas disponibles en la sección de tendencias
+TREND_METRICS = {
+    "Total holders": "total_holders",
+    "Active holders": "active_holders",
+    "Supply en manos de holders": "total_balance",
+    "Gini": "gini",
+    "Top 10 holders (participación)": "top_10_share"
+}
+TREND_GRANULARITIES = {
+    "Hora": "hourly",
+    "Día": "daily",
+    "Semana": "weekly"
+}
+
+# Wallets activas (remitentes) en ventanas de 1, 7 y 30 días
+ACTIVITY_SERIES = {
+    "dau": "Diarias",
+    "wau": "Semanales",
+    "mau": "Mensuales"
+}
+COHORT_GRANULARITIES = {
+    "Semana": "weekly",
+    "Mes": "monthly",
+    "Día": "daily"
+}
+COHORT_PERIODS = 8
+
+# Puntos máximos por línea en los gráficos de series (más no se distinguen en pantalla)
+CHART_MAX_POINTS = 2000
+
+# Número de tokens por fila en tablas y métricas
+TOKENS_PER_ROW = 2
+
+
+def token_columns(symbols):
+    """Yield (column, symbol) pairs laid out in rows of TOKENS_PER_ROW"""
+    for start in range(0, len(symbols), TOKENS_PER_ROW):
+        row = symbols[start:start + TOKENS_PER_ROW]
+        yield from zip(st.columns(TOKENS_PER_ROW), row)
+
+
+@st.cache_resource
+def get_dune_api():
+    """One Dune client per process, so reruns and sessions share its pooled HTTP session"""
+    return DuneAPI()
+
+
 # Validación de configuración
 validate_config()
 
 # --- Initialize service ---
-dashboard = DashboardService()
+dashboard = DashboardService(api=get_dune_api())
+symbols = [token.symbol for token in dashboard.tokens]
+tokens_label = " vs ".join(symbols)
 
 # --- Configuración de página ---
-st.set_page_config(layout="wide", page_title="Dashboard COPM vs COPW")
+st.set_page_config(layout="wide", page_title=f"Dashboard {tokens_label}")
 
 # --- Streamlit ---
-st.title("Dashboard de adopción COPM vs COPW")
+st.title(f"Dashboard de adopción {tokens_label}")
 st.markdown(f"*Última actualización: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}*")
 
 # Botón de refresco
 if st.button("Actualizar datos"):
     st.experimental_rerun()
 
+# Panel de instrumentación; solo DUNE_INSTRUMENTATION activa el registro (es común a todo el proceso)
+show_instrumentation = st.sidebar.checkbox("Panel de instrumentación", value=DUNE_INSTRUMENTATION,
+                                           key="show_instrumentation")
+
 # --- Obtener data ---
-df_copm, df_copw = dashboard.get_holders_data()
+holders = dashboard.get_holders_data()
 
 # --- Tablas lado a lado ---
 st.subheader("Holders por token")
-col1, col2 = st.columns(2)
 
-with col1:
-    st.markdown("**COPM**")
-    if not df_copm.empty:
-        st.dataframe(dashboard.get_display_data(df_copm), use_container_width=True)
-    else:
-        st.warning("No hay datos para COPM")
+for column, symbol in token_columns(symbols):
+    df = holders[symbol]
+    with column:
+        st.markdown(f"**{symbol}**")
+        if df.empty:
+            st.warning(f"No hay datos para {symbol}")
+            if symbol in dashboard.errors:
+                st.caption(f"Error al consultar Dune: {dashboard.errors[symbol]}")
+            continue
 
-with col2:
-    st.markdown("**COPW**")
-    if not df_copw.empty:
-        st.dataframe(dashboard.get_display_data(df_copw), use_container_width=True)
-    else:
-        st.warning("No hay datos para COPW")
+        search_col, sort_col, page_col = st.columns([2, 2, 1])
+        wallet_prefix = search_col.text_input("Buscar wallet", placeholder="0x...", key=f"search_{symbol}")
+        sort_label = sort_col.selectbox("Ordenar por", list(HOLDER_SORT_OPTIONS), key=f"sort_{symbol}")
+        page = page_col.number_input("Página", min_value=1, value=1, step=1, key=f"page_{symbol}")
+
+        sort_by, ascending = HOLDER_SORT_OPTIONS[sort_label]
+        page_df, total_rows = dashboard.get_holders_page(
+            df, page=int(page), page_size=HOLDERS_PAGE_SIZE,
+            sort_by=sort_by, ascending=ascending, wallet_prefix=wallet_prefix
+        )
+        page_count = max(1, -(-total_rows // HOLDERS_PAGE_SIZE))
+        st.dataframe(page_df, column_config=HOLDER_COLUMN_CONFIG, use_container_width=True, hide_index=True)
+        st.caption(f"Página {min(int(page), page_count)} de {page_count} · {total_rows:,} holders")
 
 # --- Métricas principales ---
 st.subheader("Métricas principales")
-copm_metrics, copw_metrics = dashboard.get_metrics(df_copm, df_copw)
+metrics = dashboard.get_metrics(holders)
 
-metrics_col1, metrics_col2 = st.columns(2)
+for column, symbol in token_columns(symbols):
+    if holders[symbol].empty:
+        column.write(f"No hay datos {symbol}")
+        continue
+    column.metric(f"{symbol} - Total holders", metrics[symbol]['total_holders'])
+    column.metric(f"{symbol} - Active holders", metrics[symbol]['active_holders'])
+    column.metric(f"{symbol} - Balance promedio", format_number_with_commas(metrics[symbol]['average_balance']))
 
-with metrics_col1:
-    if not df_copm.empty:
-        metrics_col1.metric("COPM - Total holders", copm_metrics['total_holders'])
-        metrics_col1.metric("COPM - Active holders", copm_metrics['active_holders'])
-        metrics_col1.metric("COPM - Balance promedio", format_number_with_commas(copm_metrics['average_balance']))
-    else:
-        metrics_col1.write("No hay datos COPM")
+# --- Concentración de holders ---
+st.subheader("Concentración de holders")
 
-with metrics_col2:
-    if not df_copw.empty:
-        metrics_col2.metric("COPW - Total holders", copw_metrics['total_holders'])
-        metrics_col2.metric("COPW - Active holders", copw_metrics['active_holders'])
-        metrics_col2.metric("COPW - Balance promedio", format_number_with_commas(copw_metrics['average_balance']))
-    else:
-        metrics_col2.write("No hay datos COPW")
+for column, symbol in token_columns(symbols):
+    if holders[symbol].empty:
+        continue
+    token_metrics = metrics[symbol]
+    column.metric(f"{symbol} - Gini", f"{token_metrics['gini']:.3f}")
+    column.metric(f"{symbol} - Coeficiente Nakamoto", token_metrics['nakamoto_coefficient'])
+    column.metric(f"{symbol} - Top 10 holders", f"{token_metrics['top_10_share']:.1%}")
+    column.caption(
+        f"Top 1: {token_metrics['top_1_share']:.1%} · Top 100: {token_metrics['top_100_share']:.1%}"
+        f" · HHI: {token_metrics['hhi']:.4f}"
+    )
 
 # --- Comparativa de adopción ---
 st.subheader("Comparativa de adopción")
-compare_df = dashboard.get_comparison_data(df_copm, df_copw)
+compare_df = dashboard.get_comparison_data(holders)
 fig = create_comparison_bar_chart(compare_df)
 st.plotly_chart(fig, use_container_width=True)
 
+# --- Wallets compartidas ---
+if len(symbols) > 1:
+    st.subheader("Wallets compartidas")
+    address_index = dashboard.get_address_index(holders)
+    overlap_df = address_index.balance_overlap().set_index("Token")
+
+    for column, symbol in token_columns(symbols):
+        column.metric(f"{symbol} - Wallets en común", f"{overlap_df.at[symbol, 'Shared Holders']:,}")
+        column.metric(f"{symbol} - Supply en wallets compartidas", f"{overlap_df.at[symbol, 'Supply Share']:.1%}")
+
+    st.caption("Wallets en común por par de tokens (la diagonal es el total de holders de cada token)")
+    st.dataframe(address_index.overlap_matrix(), use_container_width=True)
+
+    st.markdown("**Principales wallets en común**")
+    st.dataframe(address_index.shared_holders(limit=HOLDERS_PAGE_SIZE),
+                 use_container_width=True, hide_index=True)
+
+    migrations_df = dashboard.get_wallet_migrations(address_index)
+    st.markdown("**Migraciones entre tokens**")
+    st.caption("Wallets que dejaron un token y empezaron a tener el otro desde los snapshots de hace una semana")
+    if migrations_df.empty:
+        st.info("Aún no hay snapshots suficientemente antiguos para detectar migraciones.")
+    else:
+        st.dataframe(migrations_df, use_container_width=True, hide_index=True)
+
+# --- Volumen diario ---
+# Sin volumen en caché la consulta corre en segundo plano y no bloquea la página
+volumes = dashboard.get_volume_data(block=False) if DUNE_VOLUME_QUERY_ID else {}
+if volumes:
+    st.subheader("Volumen diario de transacciones")
+    for column, symbol in token_columns(symbols):
+        with column:
+            if symbol in dashboard.volume_pending:
+                st.info(f"Consultando el volumen de {symbol} en Dune; aparecerá en la próxima actualización.")
+            elif symbol in dashboard.volume_errors:
+                st.caption(f"No se pudo consultar el volumen de {symbol}: {dashboard.volume_errors[symbol]}")
+            elif volumes[symbol].empty:
+                st.write(f"No hay datos de volumen {symbol}")
+            else:
+                fig = create_token_volume_chart(volumes[symbol], symbol, max_points=CHART_MAX_POINTS)
+                st.plotly_chart(fig, use_container_width=True)
+
+# --- Tendencias ---
+st.subheader("Tendencias")
+trend_metric_col, trend_granularity_col = st.columns(2)
+trend_label = trend_metric_col.selectbox("Métrica", list(TREND_METRICS), key="trend_metric")
+granularity_label = trend_granularity_col.selectbox("Agrupación", list(TREND_GRANULARITIES),
+                                                    index=1, key="trend_granularity")
+trend_df = dashboard.get_metric_trends(TREND_METRICS[trend_label], TREND_GRANULARITIES[granularity_label])
+
+if trend_df.empty:
+    st.info("Aún no hay historial de métricas; se registra en cada actualización de holders.")
+else:
+    fig = create_line_chart(trend_df, x="timestamp", y=[c for c in trend_df.columns if c != "timestamp"],
+                            x_label="Fecha", y_label=trend_label, max_points=CHART_MAX_POINTS)
+    st.plotly_chart(fig, use_container_width=True)
+
+# --- Actividad de wallets ---
+if DUNE_TRANSFERS_QUERY_ID:
+    st.subheader("Actividad de wallets")
+    st.caption("Wallets que enviaron al menos una transferencia en los últimos 1, 7 y 30 días")
+    activity = dashboard.get_active_wallets()
+    for column, symbol in token_columns(symbols):
+        with column:
+            if activity[symbol].empty:
+                st.write(f"Aún no hay transferencias de {symbol}; se guardan con python -m src.ingest")
+                continue
+            activity_df = activity[symbol].rename(columns=ACTIVITY_SERIES)
+            fig = create_line_chart(activity_df, x="day", y=list(ACTIVITY_SERIES.values()), title=symbol,
+                                    x_label="Fecha", y_label="Wallets activas", max_points=CHART_MAX_POINTS)
+            st.plotly_chart(fig, use_container_width=True)
+
+    cohort_token_col, cohort_granularity_col = st.columns(2)
+    cohort_symbol = cohort_token_col.selectbox("Token", symbols, key="cohort_token")
+    cohort_label = cohort_granularity_col.selectbox("Cohorte", list(COHORT_GRANULARITIES), key="cohort_granularity")
+    cohort_token = dashboard.tokens[symbols.index(cohort_symbol)]
+    cohorts_df = dashboard.get_retention_cohorts(cohort_token, COHORT_GRANULARITIES[cohort_label],
+                                                 periods=COHORT_PERIODS)
+
+    st.markdown("**Retención por cohorte**")
+    st.caption("Porcentaje de las wallets de cada cohorte (según su primera transferencia) que siguen activas")
+    if cohorts_df.empty:
+        st.info(f"Aún no hay transferencias de {cohort_symbol}.")
+    else:
+        period_columns = [str(k) for k in range(COHORT_PERIODS)]
+        st.dataframe(
+            cohorts_df.assign(**{col: cohorts_df[col] * 100 for col in period_columns}),
+            column_config={col: st.column_config.NumberColumn(f"+{col}", format="%.0f%%") for col in period_columns},
+            use_container_width=True, hide_index=True
+        )
+
+    st.markdown("**Wallets más activas**")
+    st.dataframe(dashboard.get_wallet_activity(cohort_token, limit=HOLDERS_PAGE_SIZE),
+                 use_container_width=True, hide_index=True)
+
+# --- Instrumentación ---
+if show_instrumentation:
+    st.subheader("Instrumentación")
+    if not metrics_registry.enabled:
+        st.info("La instrumentación está desactivada; inicia la app con DUNE_INSTRUMENTATION=1 para registrar métricas.")
+    st.caption("Tiempos acumulados en este proceso desde que se activó la instrumentación")
+    st.dataframe(metrics_registry.operations(), use_container_width=True, hide_index=True)
+
+    st.markdown("**Cachés**")
+    st.dataframe(metrics_registry.caches(), use_container_width=True, hide_index=True)
+
+    prometheus_col, json_col, reset_col = st.columns(3)
+    prometheus_col.download_button("Descargar (Prometheus)", metrics_registry.to_prometheus(),
+                                   file_name="metrics.prom", mime="text/plain")
+    json_col.download_button("Descargar (JSON)", metrics_registry.to_json(),
+                             file_name="metrics.json", mime="application/json")
+    if reset_col.button("Reiniciar métricas"):
+        metrics_registry.reset()
@@ -1,4 +1,2 @@
 """API package"""
-from .index import DuneAPI, DuneHttpClient
-
-__all__ = ['DuneAPI', 'DuneHttpClient']
\ No newline at end of file
+from .index import __all__, __getattr__, __dir__
@@ -1,5 +1,2 @@
 """Dune API package"""
-from .httpClient import DuneHttpClient
-from .endpoints import DuneAPI
-
-__all__ = ['DuneHttpClient', 'DuneAPI']
\ No newline at end of file
+from .index import __all__, __getattr__, __dir__
@@ -0,0 +1,117 @@
+"""
+Async Dune API Endpoints
+asyncio counterpart of DuneAPI for background holder ingestion
+"""
+import asyncio
+import pandas as pd
+from typing import Dict, AsyncIterator, Iterable, Optional, Tuple, Union
+from .asyncHttpClient import AsyncDuneHttpClient
+from .decoding import decode_holders_page
+from .endpoints import DEFAULT_HOLDERS_PAGE_SIZE, sort_holders_by_balance
+from src.models import apply_holder_schema
+from src.config import DUNE_SIM_BASE_URL, DUNE_BASE_URL
+
+
+class AsyncDuneAPI:
+    """Async API wrapper for Dune endpoints"""
+    
+    def __init__(self, client: AsyncDuneHttpClient = None):
+        """
+        Initialize async Dune API wrapper
+        
+        Args:
+            client: Async HTTP client for making requests (defaults to new client)
+        """
+        self.client = client or AsyncDuneHttpClient()
+        self.sim_base_url = DUNE_SIM_BASE_URL
+        self.dune_base_url = DUNE_BASE_URL
+    
+    async def __aenter__(self) -> "AsyncDuneAPI":
+        return self
+    
+    async def __aexit__(self, *exc_info) -> None:
+        await self.client.close()
+    
+    async def iter_token_holder_pages(self, chain_id: int, token_address: str,
+                                      page_size: int = DEFAULT_HOLDERS_PAGE_SIZE,
+                                      max_holders: Optional[int] = None) -> AsyncIterator[pd.DataFrame]:
+        """
+        Stream token holders from Dune SIM API one page at a time
+        
+        Args:
+            chain_id: Blockchain chain ID
+            token_address: Token contract address
+            page_size: Number of holders requested per page (default: 500)
+            max_holders: Stop after this many holders (optional, no cap by default)
+            
+        Yields:
+            DataFrame with the typed holders of each page, in API order
+        """
+        url = f"{self.sim_base_url}/evm/token-holders/{chain_id}/{token_address}"
+        offset = None
+        remaining = max_holders
+        
+        while remaining is None or remaining > 0:
+            limit = page_size if remaining is None else min(page_size, remaining)
+            params = {"limit": limit}
+            if offset:
+                params["offset"] = offset
+            
+            data = await self.client.get(url, use_sim=True, params=params, decoder=decode_holders_page)
+            holders = data["holders"]
+            if remaining is not None:
+                holders = holders.iloc[:remaining]
+                remaining -= len(holders)
+            
+            if not holders.empty:
+                yield holders
+            
+            offset = data.get("next_offset")
+            if not offset or holders.empty:
+                break
+    
+    async def get_token_holders(self, chain_id: int, token_address: str,
+                                page_size: int = DEFAULT_HOLDERS_PAGE_SIZE,
+                                max_holders: Optional[int] = None) -> pd.DataFrame:
+        """
+        Get token holders from Dune SIM API
+        
+        Args:
+            chain_id: Blockchain chain ID
+            token_address: Token contract address
+            page_size: Number of holders requested per page (default: 500)
+            max_holders: Maximum number of holders to fetch (optional)
+            
+        Returns:
+            DataFrame with holders data sorted by balance (descending)
+        """
+        pages = [page async for page in self.iter_token_holder_pages(
+            chain_id, token_address, page_size=page_size, max_holders=max_holders)]
+        if not pages:
+            return pd.DataFrame()
+        
+        df = apply_holder_schema(pd.concat(pages, ignore_index=True, copy=False))
+        return sort_holders_by_balance(df)
+    
+    async def get_many_token_holders(self, tokens: Iterable[Tuple[int, str]],
+                                     **kwargs) -> Dict[Tuple[int, str], Union[pd.DataFrame, Exception]]:
+        """
+        Fetch holders for many (chain_id, token_address) pairs concurrently
+        
+        Concurrency is bounded by the client's semaphore. A failing token does
+        not cancel the others; its exception is returned in place of a frame.
+        
+        Args:
+            tokens: Iterable of (chain_id, token_address) pairs
+            **kwargs: Extra arguments forwarded to ``get_token_holders``
+            
+        Returns:
+            Dictionary mapping each pair to its holders DataFrame or the raised exception
+        """
+        tokens = list(tokens)
+        results = await asyncio.gather(
+            *(self.get_token_holders(chain_id, token_address, **kwargs)
+              for chain_id, token_address in tokens),
+            return_exceptions=True
+        )
+        return dict(zip(tokens, results))
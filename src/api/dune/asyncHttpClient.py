@@ -0,0 +1,230 @@
+"""
+Async HTTP Client for Dune API
+asyncio counterpart of DuneHttpClient for fanning out many requests
+"""
+import asyncio
+import aiohttp
+from typing import Callable, Dict, Any, Optional, Tuple
+from .decoding import json_loads
+from .httpClient import RETRY_STATUS_CODES, BODY_CHUNK_SIZE, parse_retry_after, compute_backoff
+from .rateLimiter import RateLimiter, PRIORITY_INTERACTIVE, default_rate_limiter
+from src.config import (
+    DUNE_API_KEY,
+    DUNE_HTTP_POOL_SIZE,
+    DUNE_HTTP_CONNECT_TIMEOUT,
+    DUNE_HTTP_READ_TIMEOUT,
+    DUNE_HTTP_MAX_RETRIES,
+    DUNE_HTTP_BACKOFF_BASE,
+    DUNE_HTTP_BACKOFF_MAX,
+    DUNE_ASYNC_MAX_CONCURRENCY
+)
+
+
+def request_never_sent(error: Exception) -> bool:
+    """
+    Check whether a failed request certainly never reached the server
+    
+    Async counterpart of ``httpClient.request_never_sent``: failed and
+    timed-out connects are safe to retry, read timeouts and dropped
+    connections are not.
+    
+    Args:
+        error: Exception raised by ``aiohttp``
+        
+    Returns:
+        True if the request can be sent again without risking a duplicate
+    """
+    if isinstance(error, aiohttp.ClientConnectorError):
+        return True
+    connect_timeout = getattr(aiohttp, "ConnectionTimeoutError", None)
+    if connect_timeout is not None:
+        return isinstance(error, connect_timeout)
+    # Before aiohttp 3.10 connect and read timeouts share ServerTimeoutError
+    return isinstance(error, aiohttp.ServerTimeoutError) and str(error).startswith("Connection timeout")
+
+
+class AsyncDuneHttpClient:
+    """asyncio HTTP client for interacting with Dune APIs"""
+    
+    def __init__(self, api_key: str = None,
+                 max_concurrency: int = DUNE_ASYNC_MAX_CONCURRENCY,
+                 pool_size: int = DUNE_HTTP_POOL_SIZE,
+                 connect_timeout: float = DUNE_HTTP_CONNECT_TIMEOUT,
+                 read_timeout: float = DUNE_HTTP_READ_TIMEOUT,
+                 max_retries: int = DUNE_HTTP_MAX_RETRIES,
+                 backoff_base: float = DUNE_HTTP_BACKOFF_BASE,
+                 backoff_max: float = DUNE_HTTP_BACKOFF_MAX,
+                 rate_limiter: RateLimiter = None, priority: int = PRIORITY_INTERACTIVE):
+        """
+        Initialize the async Dune HTTP client
+        
+        The underlying ``aiohttp.ClientSession`` and the concurrency semaphore are
+        created lazily on first use, and again whenever the client is used from a
+        different event loop, so one client can be built outside of a running
+        loop and reused across ``asyncio.run`` calls (e.g. Streamlit reruns).
+        
+        Args:
+            api_key: Dune API key for authentication (defaults to config)
+            max_concurrency: Maximum number of requests in flight at once
+            pool_size: Maximum number of pooled keep-alive connections per host
+            connect_timeout: Seconds to wait for a connection to be established
+            read_timeout: Seconds to wait for the server to send data
+            max_retries: Number of retries for rate-limited or transient failures
+            backoff_base: Base delay in seconds for exponential backoff
+            backoff_max: Upper bound in seconds for a single backoff delay
+            rate_limiter: Scheduler shared with other clients (defaults to the process-wide one)
+            priority: Scheduling class of this client's requests (default: interactive)
+        """
+        self.api_key = api_key or DUNE_API_KEY
+        self.headers = {
+            "X-Dune-Api-Key": self.api_key,
+            "Authorization": f"Bearer {self.api_key}"
+        }
+        self.sim_headers = {
+            "X-Sim-Api-Key": self.api_key,
+            "Authorization": f"Bearer {self.api_key}"
+        }
+        self.max_concurrency = max_concurrency
+        self.pool_size = pool_size
+        self.timeout = aiohttp.ClientTimeout(sock_connect=connect_timeout, sock_read=read_timeout)
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.rate_limiter = rate_limiter or default_rate_limiter
+        self.priority = priority
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+    
+    async def __aenter__(self) -> "AsyncDuneHttpClient":
+        return self
+    
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+    
+    def _get_session(self) -> Tuple[aiohttp.ClientSession, asyncio.Semaphore]:
+        """Return the session and semaphore of the running loop, creating them on first use"""
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop or self._session is None or self._session.closed:
+            # Both are bound to the loop they were first used in; one left over
+            # from an earlier asyncio.run cannot be used (or closed) from this one
+            connector = aiohttp.TCPConnector(limit_per_host=self.pool_size)
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=self.timeout,
+                headers={"Accept-Encoding": "gzip, deflate"}
+            )
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+            self._loop = loop
+        return self._session, self._semaphore
+    
+    async def _request(self, method: str, url: str, retry_statuses: set = RETRY_STATUS_CODES,
+                       decoder: Callable[[bytes], Any] = json_loads, idempotent: bool = True,
+                       credits: float = 0, **kwargs) -> Any:
+        """
+        Send a request, retrying transient failures, and decode its body
+        
+        The concurrency semaphore is held only while a request is on the wire,
+        not while backing off, so sleeping retries do not starve other requests.
+        Credits are charged once, with the first attempt.
+        Requests that are not idempotent are only retried after connection
+        errors that happened before anything was sent.
+        
+        Args:
+            method: HTTP method
+            url: Full URL to request
+            retry_statuses: Status codes that trigger a retry
+            idempotent: Whether a request that may have reached the server can be sent again
+            decoder: Turns the raw body into the result (default: JSON)
+            credits: Credits charged to the rate limiter's budget once per request (default: 0)
+            **kwargs: Extra arguments forwarded to ``aiohttp.ClientSession.request``
+            
+        Returns:
+            Decoded response
+            
+        Raises:
+            aiohttp.ClientResponseError: If the request still fails after all retries
+            aiohttp.ClientError: If the connection keeps failing
+        """
+        session, semaphore = self._get_session()
+        await self.rate_limiter.acquire_async(self.priority, credits)
+        attempt = 0
+        while True:
+            retry_after = None
+            if attempt:
+                await self.rate_limiter.acquire_async(self.priority, 0)
+            try:
+                async with semaphore:
+                    async with session.request(method, url, **kwargs) as response:
+                        if response.status in retry_statuses and attempt < self.max_retries:
+                            retry_after = parse_retry_after(response.headers.get("Retry-After"))
+                            if response.status == 429:
+                                retry_after = compute_backoff(attempt, self.backoff_base,
+                                                              self.backoff_max, retry_after)
+                                self.rate_limiter.penalize(retry_after)
+                        else:
+                            response.raise_for_status()
+                            body = bytearray()
+                            async for chunk in response.content.iter_chunked(BODY_CHUNK_SIZE):
+                                body += chunk
+                            return decoder(bytes(body))
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError) as error:
+                if attempt >= self.max_retries or not (idempotent or request_never_sent(error)):
+                    raise
+            
+            await asyncio.sleep(compute_backoff(attempt, self.backoff_base,
+                                                self.backoff_max, retry_after))
+            attempt += 1
+    
+    async def get(self, url: str, use_sim: bool = False, params: Dict[str, Any] = None,
+                  decoder: Callable[[bytes], Any] = json_loads) -> Any:
+        """
+        Make a GET request to Dune API
+        
+        Args:
+            url: Full URL to request
+            use_sim: If True, use SIM API headers instead of standard headers
+            params: Query string parameters (optional)
+            decoder: Turns the raw body into the result (default: JSON)
+            
+        Returns:
+            Decoded response, a dictionary for the default JSON decoder
+            
+        Raises:
+            aiohttp.ClientResponseError: If request fails
+        """
+        headers = self.sim_headers if use_sim else self.headers
+        return await self._request("GET", url, decoder=decoder, headers=headers, params=params)
+    
+    async def post(self, url: str, data: Dict[str, Any] = None, use_sim: bool = False,
+                   credits: float = 0) -> Dict[str, Any]:
+        """
+        Make a POST request to Dune API
+        
+        Only rate-limited (429) responses and connections that failed before the
+        request was sent are retried, since other failures may already have
+        triggered a billable execution upstream.
+        
+        Args:
+            url: Full URL to request
+            data: JSON payload to send
+            use_sim: If True, use SIM API headers instead of standard headers
+            credits: Credits the request costs, e.g. a query execution (default: 0)
+            
+        Returns:
+            JSON response as dictionary
+            
+        Raises:
+            aiohttp.ClientResponseError: If request fails
+        """
+        headers = self.sim_headers if use_sim else self.headers
+        return await self._request("POST", url, retry_statuses={429}, idempotent=False,
+                                   credits=credits, json=data, headers=headers)
+    
+    async def close(self) -> None:
+        """Close the pooled session and release its connections"""
+        if self._session is not None and not self._session.closed and self._loop is asyncio.get_running_loop():
+            await self._session.close()
+        self._session = None
+        self._semaphore = None
+        self._loop = None
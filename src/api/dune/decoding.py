@@ -0,0 +1,129 @@
+"""
+Response Decoding for Dune API
+Fast JSON decoding and direct-to-columnar parsing of holder pages
+"""
+import json
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.json as pa_json
+from typing import Any, Dict, List
+from src.models import apply_holder_schema
+from src.utility.numbers import split_wei
+
+try:
+    import orjson
+except ImportError:  # optional speedup
+    orjson = None
+
+# Typed layout of a SIM API holder record; other fields are inferred
+HOLDER_STRUCT = pa.struct([
+    pa.field("wallet_address", pa.string()),
+    pa.field("balance", pa.string()),
+    pa.field("first_acquired", pa.timestamp("us", tz="UTC")),
+    pa.field("has_initiated_transfer", pa.bool_())
+])
+
+HOLDERS_PAGE_SCHEMA = pa.schema([
+    pa.field("holders", pa.list_(HOLDER_STRUCT)),
+    pa.field("next_offset", pa.string())
+])
+
+# A page is a single (possibly pretty-printed) JSON object, so newlines may
+# appear anywhere inside it
+_HOLDERS_PARSE_OPTIONS = pa_json.ParseOptions(
+    explicit_schema=HOLDERS_PAGE_SCHEMA,
+    newlines_in_values=True,
+    unexpected_field_behavior="infer"
+)
+
+
+def json_loads(body: bytes) -> Any:
+    """
+    Decode a JSON body, with orjson when it is installed
+    
+    Args:
+        body: Raw response body
+        
+    Returns:
+        Decoded JSON value
+    """
+    if orjson is not None:
+        return orjson.loads(body)
+    return json.loads(body)
+
+
+def holders_page_to_frame(holders: List[Dict[str, Any]]) -> pd.DataFrame:
+    """
+    Build a typed DataFrame from a single page of SIM API holders
+    
+    The raw wei ``balance`` string is replaced by exact int64 limbs
+    (``balance_hi``, ``balance_lo``), see ``src.utility.numbers.wei``, and
+    the other columns are cast to ``src.models.HOLDER_DTYPES``.
+    
+    Args:
+        holders: List of holder records as returned by the API
+        
+    Returns:
+        DataFrame with the page holders and limb-encoded balance columns
+    """
+    df = pd.DataFrame(holders)
+    if not df.empty:
+        df['balance_hi'], df['balance_lo'] = split_wei(df['balance'])
+        df = apply_holder_schema(df.drop(columns='balance'))
+    return df
+
+
+def _holders_struct_to_frame(holders: pa.StructArray) -> pd.DataFrame:
+    """Convert a typed holders struct array to a DataFrame without per-row Python objects"""
+    columns, names = [], []
+    for index, field in enumerate(holders.type):
+        if field.name == "balance":
+            continue
+        columns.append(holders.field(index))
+        names.append(field.name)
+    
+    hi, lo = split_wei(holders.field("balance"))
+    table = pa.Table.from_arrays(columns + [pa.array(hi), pa.array(lo)],
+                                 names=names + ["balance_hi", "balance_lo"])
+    # Strings stay in their Arrow buffers instead of becoming Python objects
+    df = table.to_pandas(types_mapper={pa.string(): pd.StringDtype('pyarrow')}.get)
+    return apply_holder_schema(df)
+
+
+def decode_holders_page(body: bytes) -> Dict[str, Any]:
+    """
+    Decode a SIM API token-holders response straight into typed columns
+    
+    The body is parsed by Arrow's JSON reader against ``HOLDERS_PAGE_SCHEMA``,
+    so holders never exist as a list of Python dicts. Bodies Arrow cannot
+    parse with that schema fall back to ``json_loads`` and
+    ``holders_page_to_frame``.
+    
+    Args:
+        body: Raw response body
+        
+    Returns:
+        Dictionary with ``holders`` (typed DataFrame, see ``holders_page_to_frame``)
+        and ``next_offset`` (cursor of the next page, or None)
+    """
+    try:
+        # The reader wraps the body's own buffer instead of copying it
+        table = pa_json.read_json(
+            pa.BufferReader(body),
+            read_options=pa_json.ReadOptions(block_size=max(len(body) + 1, 1 << 20)),
+            parse_options=_HOLDERS_PARSE_OPTIONS
+        )
+        holders = pc.list_flatten(table.column("holders")).combine_chunks()
+        holders = holders if isinstance(holders, pa.StructArray) else None
+        next_offset = table.column("next_offset")[0].as_py()
+    except (pa.ArrowInvalid, pa.ArrowNotImplementedError, KeyError):
+        data = json_loads(body)
+        return {
+            "holders": holders_page_to_frame(data.get("holders") or []),
+            "next_offset": data.get("next_offset")
+        }
+    
+    if holders is None or len(holders) == 0:
+        return {"holders": pd.DataFrame(), "next_offset": next_offset}
+    return {"holders": _holders_struct_to_frame(holders), "next_offset": next_offset}
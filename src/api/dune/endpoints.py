@@ -2,17 +2,77 @@
 Dune API Endpoints
 Defines API endpoints and business logic for Dune data retrieval
 """
+import json
+import logging
+import threading
+import time
 import pandas as pd
-from typing import List, Dict, Any
+from datetime import datetime, timezone
+from typing import List, Dict, Any, Iterator, Optional
 from .httpClient import DuneHttpClient
-from src.config import (
-    DUNE_SIM_BASE_URL,
-    DUNE_BASE_URL,
-    DUNE_CHAIN_ID_ETH,
-    DUNE_CHAIN_ID_POLYGON,
-    DUNE_COPM_TOKEN_ADDRESS,
-    DUNE_COPW_TOKEN_ADDRESS
-)
+from .decoding import decode_holders_page
+from src.models import apply_holder_schema, apply_transfer_schema
+from src.utility.instrumentation import instrumented, metrics_registry
+from src.config import DUNE_SIM_BASE_URL, DUNE_BASE_URL, DUNE_QUERY_TIMEOUT
+
+logger = logging.getLogger(__name__)
+
+# SIM API accepts up to 500 holders per page
+DEFAULT_HOLDERS_PAGE_SIZE = 500
+
+# Credits Dune charges per query execution, by performance tier; other
+# requests are not charged against DUNE_CREDITS_PER_MINUTE
+EXECUTION_CREDITS = {"medium": 10, "large": 20}
+
+# Rows requested per page of query execution results
+DEFAULT_RESULTS_PAGE_SIZE = 10000
+
+# Downloaded execution results kept per DuneAPI, least recently used dropped first
+RESULTS_CACHE_ENTRIES = 8
+
+# Execution states after which polling stops
+EXECUTION_SUCCESS_STATES = {"QUERY_STATE_COMPLETED"}
+# Finished, but the results were truncated (e.g. over Dune's result size limit)
+EXECUTION_PARTIAL_STATES = {"QUERY_STATE_COMPLETED_PARTIAL"}
+EXECUTION_FAILURE_STATES = {
+    "QUERY_STATE_FAILED",
+    "QUERY_STATE_CANCELLED",
+    "QUERY_STATE_EXPIRED"
+}
+
+# Status polling starts fast and slows down while the execution keeps running
+POLL_INTERVAL_INITIAL = 1.0
+POLL_INTERVAL_MAX = 15.0
+POLL_INTERVAL_FACTOR = 1.5
+
+# Format of datetime query parameters
+QUERY_DATETIME_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+
+def query_params_key(params: Optional[Dict[str, Any]]) -> str:
+    """
+    Build a stable key for query parameters
+    
+    Args:
+        params: Query parameters (optional)
+        
+    Returns:
+        Canonical JSON string, independent of key order
+    """
+    return json.dumps(params or {}, sort_keys=True, default=str)
+
+
+def sort_holders_by_balance(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Sort holders by exact balance, largest first
+    
+    Args:
+        df: Holders DataFrame with limb-encoded balance columns
+        
+    Returns:
+        Sorted DataFrame with a fresh index
+    """
+    return df.sort_values(by=['balance_hi', 'balance_lo'], ascending=False).reset_index(drop=True)
 
 
 class DuneAPI:
@@ -28,45 +88,279 @@ class DuneAPI:
         self.client = client or DuneHttpClient()
         self.sim_base_url = DUNE_SIM_BASE_URL
         self.dune_base_url = DUNE_BASE_URL
+        # Results keyed by execution id; a finished execution never changes
+        self._results: Dict[str, pd.DataFrame] = {}
+        self._results_lock = threading.Lock()
     
-    def get_token_holders(self, chain_id: int = None, token_address: str = None) -> pd.DataFrame:
+    @instrumented("api.iter_token_holder_pages")
+    def iter_token_holder_pages(self, chain_id: int = None, token_address: str = None,
+                                page_size: int = DEFAULT_HOLDERS_PAGE_SIZE,
+                                max_holders: Optional[int] = None) -> Iterator[pd.DataFrame]:
+        """
+        Stream token holders from Dune SIM API one page at a time
+        
+        Follows the ``next_offset`` cursor returned by the SIM API until the
+        holder list is exhausted or ``max_holders`` rows have been yielded.
+        
+        Args:
+            chain_id: Blockchain chain ID
+            token_address: Token contract address
+            page_size: Number of holders requested per page (default: 500)
+            max_holders: Stop after this many holders (optional, no cap by default)
+            
+        Yields:
+            DataFrame with the typed holders of each page, in API order
+        """
+        url = f"{self.sim_base_url}/evm/token-holders/{chain_id}/{token_address}"
+        offset = None
+        remaining = max_holders
+        
+        while remaining is None or remaining > 0:
+            limit = page_size if remaining is None else min(page_size, remaining)
+            params = {"limit": limit}
+            if offset:
+                params["offset"] = offset
+            
+            data = self.client.get(url, use_sim=True, params=params, decoder=decode_holders_page)
+            holders = data["holders"]
+            if remaining is not None:
+                holders = holders.iloc[:remaining]
+                remaining -= len(holders)
+            
+            if not holders.empty:
+                yield holders
+            
+            offset = data.get("next_offset")
+            if not offset or holders.empty:
+                break
+    
+    @instrumented("api.get_token_holders")
+    def get_token_holders(self, chain_id: int = None, token_address: str = None,
+                          page_size: int = DEFAULT_HOLDERS_PAGE_SIZE,
+                          max_holders: Optional[int] = None) -> pd.DataFrame:
         """
         Get token holders from Dune SIM API
         
         Args:
             chain_id: Blockchain chain ID (uses config if not provided)
             token_address: Token contract address (uses config if not provided)
+            page_size: Number of holders requested per page (default: 500)
+            max_holders: Maximum number of holders to fetch (optional)
             
         Returns:
-            DataFrame with holders data sorted by balance (descending)
+            DataFrame with holders data sorted by balance (descending), typed
+            with ``src.models.HOLDER_DTYPES``
         """
-        url = f"{self.sim_base_url}/evm/token-holders/{chain_id}/{token_address}"
-        data = self.client.get(url, use_sim=True)
+        pages = list(self.iter_token_holder_pages(chain_id, token_address,
+                                                  page_size=page_size,
+                                                  max_holders=max_holders))
+        if not pages:
+            return pd.DataFrame()
         
-        holders = data.get("holders", [])
-        df = pd.DataFrame(holders)
+        df = apply_holder_schema(pd.concat(pages, ignore_index=True, copy=False))
+        return sort_holders_by_balance(df)
+    
+    @instrumented("api.execute_query")
+    def execute_query(self, query_id: int, params: Dict[str, Any] = None,
+                      performance: str = "medium") -> str:
+        """
+        Start an execution of a saved Dune query
         
-        if not df.empty:
-            df['balance'] = df['balance'].astype(float)
-            df = df.sort_values(by='balance', ascending=False).reset_index(drop=True)
+        Args:
+            query_id: Saved query ID
+            params: Query parameters (optional)
+            performance: Execution tier, 'medium' or 'large' (default: 'medium')
+            
+        Returns:
+            Execution ID
+        """
+        url = f"{self.dune_base_url}/query/{query_id}/execute"
+        payload = {"performance": performance}
+        if params:
+            payload["query_parameters"] = params
+        credits = EXECUTION_CREDITS.get(performance, EXECUTION_CREDITS["large"])
+        return self.client.post(url, data=payload, credits=credits)["execution_id"]
+    
+    @instrumented("api.get_execution_status")
+    def get_execution_status(self, execution_id: str) -> Dict[str, Any]:
+        """
+        Get the status of a query execution
         
-        return df
+        Args:
+            execution_id: Execution ID
+            
+        Returns:
+            Status response, including ``state``
+        """
+        return self.client.get(f"{self.dune_base_url}/execution/{execution_id}/status")
+    
+    @instrumented("api.cancel_execution")
+    def cancel_execution(self, execution_id: str) -> None:
+        """
+        Cancel a running query execution
+        
+        Args:
+            execution_id: Execution ID
+        """
+        self.client.post(f"{self.dune_base_url}/execution/{execution_id}/cancel")
+    
+    @instrumented("api.wait_for_execution")
+    def wait_for_execution(self, execution_id: str, timeout: float = DUNE_QUERY_TIMEOUT,
+                           allow_partial: bool = True) -> Dict[str, Any]:
+        """
+        Poll an execution until it finishes
+        
+        The polling interval starts at ``POLL_INTERVAL_INITIAL`` and grows by
+        ``POLL_INTERVAL_FACTOR`` up to ``POLL_INTERVAL_MAX``, so short queries
+        return quickly and long ones do not spend requests on status checks.
+        
+        Args:
+            execution_id: Execution ID
+            timeout: Seconds to wait before cancelling the execution
+            allow_partial: Accept truncated results (``EXECUTION_PARTIAL_STATES``)
+                with a logged warning instead of raising (default: True)
+                
+        Returns:
+            Final status response
+            
+        Raises:
+            RuntimeError: If the execution failed, was cancelled or expired, or
+                returned partial results while ``allow_partial`` is False
+            TimeoutError: If the execution did not finish in time (it is cancelled)
+        """
+        deadline = time.monotonic() + timeout
+        interval = POLL_INTERVAL_INITIAL
+        while True:
+            status = self.get_execution_status(execution_id)
+            state = status.get("state")
+            if state in EXECUTION_SUCCESS_STATES:
+                return status
+            if state in EXECUTION_PARTIAL_STATES:
+                if not allow_partial:
+                    raise RuntimeError(f"Dune execution {execution_id} returned partial results ({state})")
+                logger.warning("Dune execution %s returned partial results (%s)", execution_id, state)
+                return status
+            if state in EXECUTION_FAILURE_STATES:
+                raise RuntimeError(f"Dune execution {execution_id} ended in {state}: {status.get('error')}")
+            
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                self.cancel_execution(execution_id)
+                raise TimeoutError(f"Dune execution {execution_id} did not finish in {timeout:.0f}s")
+            time.sleep(min(interval, remaining))
+            interval = min(interval * POLL_INTERVAL_FACTOR, POLL_INTERVAL_MAX)
+    
+    @instrumented("api.iter_execution_result_pages")
+    def iter_execution_result_pages(self, execution_id: str,
+                                    page_size: int = DEFAULT_RESULTS_PAGE_SIZE) -> Iterator[pd.DataFrame]:
+        """
+        Stream the results of a finished execution one page at a time
+        
+        Args:
+            execution_id: Execution ID
+            page_size: Number of rows requested per page (default: 10000)
+            
+        Yields:
+            DataFrame with the rows of each page, columns in query order
+        """
+        url = f"{self.dune_base_url}/execution/{execution_id}/results"
+        offset = 0
+        while True:
+            data = self.client.get(url, params={"limit": page_size, "offset": offset})
+            result = data.get("result", {})
+            rows = result.get("rows", [])
+            columns = result.get("metadata", {}).get("column_names")
+            if rows or offset == 0:
+                yield pd.DataFrame(rows, columns=columns)
+            
+            next_offset = data.get("next_offset")
+            if next_offset is None or not rows:
+                break
+            offset = next_offset
     
+    @instrumented("api.get_execution_results")
+    def get_execution_results(self, execution_id: str, cache: bool = True) -> pd.DataFrame:
+        """
+        Get the full results of a finished execution
+        
+        Results of the last ``RESULTS_CACHE_ENTRIES`` executions are kept, so an
+        execution read again (e.g. on a rerun) is downloaded only once. Callers
+        that just started the execution pass ``cache=False``: nobody asks for a
+        fresh execution id twice, and repeated queries are shared through the
+        service's query cache instead.
+        
+        Args:
+            execution_id: Execution ID
+            cache: Look up and keep the results by execution id (default: True)
+            
+        Returns:
+            DataFrame with every result row
+        """
+        if cache:
+            with self._results_lock:
+                cached = self._results.pop(execution_id, None)
+                if cached is not None:
+                    self._results[execution_id] = cached
+            metrics_registry.cache_result("query_results", "miss" if cached is None else "hit")
+            if cached is not None:
+                return cached
+        
+        pages = list(self.iter_execution_result_pages(execution_id))
+        df = pd.concat(pages, ignore_index=True) if pages else pd.DataFrame()
+        if cache:
+            with self._results_lock:
+                self._results[execution_id] = df
+                while len(self._results) > RESULTS_CACHE_ENTRIES:
+                    del self._results[next(iter(self._results))]
+        return df
     
-    def get_copm_holders(self) -> pd.DataFrame:
+    @instrumented("api.run_query")
+    def run_query(self, query_id: int, params: Dict[str, Any] = None,
+                  performance: str = "medium", timeout: float = DUNE_QUERY_TIMEOUT) -> pd.DataFrame:
         """
-        Get COPM token holders (uses config values)
+        Execute a saved query, wait for it and return its results
         
+        Args:
+            query_id: Saved query ID
+            params: Query parameters (optional)
+            performance: Execution tier, 'medium' or 'large' (default: 'medium')
+            timeout: Seconds to wait for the execution
+            
         Returns:
-            DataFrame with COPM holders data
+            DataFrame with the query results
         """
-        return self.get_token_holders(DUNE_CHAIN_ID_POLYGON, DUNE_COPM_TOKEN_ADDRESS)
+        execution_id = self.execute_query(query_id, params=params, performance=performance)
+        self.wait_for_execution(execution_id, timeout=timeout)
+        return self.get_execution_results(execution_id, cache=False)
     
-    def get_copw_holders(self) -> pd.DataFrame:
+    @instrumented("api.get_token_transfers")
+    def get_token_transfers(self, query_id: int, chain_id: int, token_address: str,
+                            start: datetime, end: datetime,
+                            timeout: float = DUNE_QUERY_TIMEOUT) -> pd.DataFrame:
         """
-        Get COPW token holders (uses config values)
+        Get a token's transfers in a time window from a saved Dune query
+        
+        The query receives ``chain_id``, ``token_address``, ``start_time`` and
+        ``end_time`` (UTC, ``end_time`` exclusive). Partial results raise, since a
+        truncated window would leave a permanent gap in the event store.
         
+        Args:
+            query_id: Saved transfers query ID (see ``DUNE_TRANSFERS_QUERY_ID``)
+            chain_id: Blockchain chain ID
+            token_address: Token contract address
+            start: Window start, inclusive
+            end: Window end, exclusive
+            timeout: Seconds to wait for the execution
+            
         Returns:
-            DataFrame with COPW holders data
+            DataFrame typed with ``src.models.TRANSFER_DTYPES``
         """
-        return self.get_token_holders(DUNE_CHAIN_ID_ETH, DUNE_COPW_TOKEN_ADDRESS)
+        params = {
+            "chain_id": chain_id,
+            "token_address": token_address,
+            "start_time": start.astimezone(timezone.utc).strftime(QUERY_DATETIME_FORMAT),
+            "end_time": end.astimezone(timezone.utc).strftime(QUERY_DATETIME_FORMAT)
+        }
+        execution_id = self.execute_query(query_id, params=params)
+        self.wait_for_execution(execution_id, timeout=timeout, allow_partial=False)
+        return apply_transfer_schema(self.get_execution_results(execution_id, cache=False))
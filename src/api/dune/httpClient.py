@@ -2,20 +2,132 @@
 HTTP Client for Dune API
 Handles all HTTP requests to Dune endpoints
 """
+import random
+import threading
+import time
 import requests
-from typing import Dict, Any
-from src.config import DUNE_API_KEY
+from concurrent.futures import CancelledError, Future, TimeoutError as FutureTimeoutError
+from email.utils import parsedate_to_datetime
+from datetime import datetime, timezone
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import NewConnectionError
+from typing import Callable, Dict, Any, Hashable, Optional
+from .decoding import json_loads
+from .rateLimiter import RateLimiter, PRIORITY_INTERACTIVE, default_rate_limiter
+from .responseCache import CachedResponse, ResponseCache, default_response_cache, response_cache_key
+from src.utility.instrumentation import instrumented, metrics_registry
+from src.config import (
+    DUNE_API_KEY,
+    DUNE_HTTP_POOL_SIZE,
+    DUNE_HTTP_CONNECT_TIMEOUT,
+    DUNE_HTTP_READ_TIMEOUT,
+    DUNE_HTTP_MAX_RETRIES,
+    DUNE_HTTP_BACKOFF_BASE,
+    DUNE_HTTP_BACKOFF_MAX
+)
+
+# Status codes worth retrying: rate limiting and transient upstream failures
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+
+# Response bodies are read in chunks of this size
+BODY_CHUNK_SIZE = 1024 * 1024
+
+# Identical GETs in flight share a single request, across every client of the process
+_inflight: Dict[Hashable, Future] = {}
+_inflight_lock = threading.Lock()
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """
+    Parse a Retry-After header value into seconds
+    
+    Args:
+        value: Header value, either delay-seconds or an HTTP date
+        
+    Returns:
+        Number of seconds to wait, or None if the header is missing or invalid
+    """
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+
+def compute_backoff(attempt: int, base: float, cap: float,
+                    retry_after: Optional[float] = None) -> float:
+    """
+    Compute the delay before a retry
+    
+    Args:
+        attempt: Zero-based retry attempt number
+        base: Base delay in seconds
+        cap: Upper bound in seconds for the jittered delay
+        retry_after: Server-provided Retry-After delay, takes precedence (optional)
+        
+    Returns:
+        Delay in seconds
+    """
+    if retry_after is not None:
+        return retry_after
+    # Exponential backoff with full jitter
+    return random.uniform(0, min(cap, base * (2 ** attempt)))
+
+
+def request_never_sent(error: Exception) -> bool:
+    """
+    Check whether a failed request certainly never reached the server
+    
+    Connect timeouts and refused connections fail before the request is
+    written; read timeouts and dropped connections may fail after the
+    server already acted on it.
+    
+    Args:
+        error: Exception raised by ``requests``
+        
+    Returns:
+        True if the request can be sent again without risking a duplicate
+    """
+    if isinstance(error, requests.ConnectTimeout):
+        return True
+    if isinstance(error, requests.ConnectionError) and error.args:
+        return isinstance(getattr(error.args[0], "reason", None), NewConnectionError)
+    return False
 
 
 class DuneHttpClient:
     """HTTP client for interacting with Dune APIs"""
     
-    def __init__(self, api_key: str = None):
+    def __init__(self, api_key: str = None, pool_size: int = DUNE_HTTP_POOL_SIZE,
+                 connect_timeout: float = DUNE_HTTP_CONNECT_TIMEOUT,
+                 read_timeout: float = DUNE_HTTP_READ_TIMEOUT,
+                 max_retries: int = DUNE_HTTP_MAX_RETRIES,
+                 backoff_base: float = DUNE_HTTP_BACKOFF_BASE,
+                 backoff_max: float = DUNE_HTTP_BACKOFF_MAX,
+                 rate_limiter: RateLimiter = None, priority: int = PRIORITY_INTERACTIVE,
+                 response_cache: ResponseCache = None):
         """
         Initialize the Dune HTTP client
         
         Args:
             api_key: Dune API key for authentication (defaults to config)
+            pool_size: Maximum number of pooled keep-alive connections per host
+            connect_timeout: Seconds to wait for a connection to be established
+            read_timeout: Seconds to wait for the server to send data
+            max_retries: Number of retries for rate-limited or transient failures
+            backoff_base: Base delay in seconds for exponential backoff
+            backoff_max: Upper bound in seconds for a single backoff delay
+            rate_limiter: Scheduler shared with other clients (defaults to the process-wide one)
+            priority: Scheduling class of this client's requests (default: interactive)
+            response_cache: Conditional GET cache (defaults to the process-wide one)
         """
         self.api_key = api_key or DUNE_API_KEY
         self.headers = {
@@ -26,34 +138,211 @@ class DuneHttpClient:
             "X-Sim-Api-Key": self.api_key,
             "Authorization": f"Bearer {self.api_key}"
         }
+        self.timeout = (connect_timeout, read_timeout)
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.rate_limiter = rate_limiter or default_rate_limiter
+        self.priority = priority
+        self.response_cache = response_cache or default_response_cache
+        
+        # Persistent session so pages and tokens reuse the same TCP+TLS connections
+        self.session = requests.Session()
+        self.session.headers.update({"Accept-Encoding": "gzip, deflate"})
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+    
+    def _backoff_delay(self, attempt: int, response: Optional[requests.Response] = None) -> float:
+        """
+        Compute the delay before the next retry
+        
+        Args:
+            attempt: Zero-based retry attempt number
+            response: Failed response, used to honour Retry-After (optional)
+            
+        Returns:
+            Delay in seconds
+        """
+        retry_after = None
+        if response is not None:
+            retry_after = parse_retry_after(response.headers.get("Retry-After"))
+        return compute_backoff(attempt, self.backoff_base, self.backoff_max, retry_after)
+    
+    def _request(self, method: str, url: str, retry_statuses: set = RETRY_STATUS_CODES,
+                 idempotent: bool = True, credits: float = 0, **kwargs) -> requests.Response:
+        """
+        Send a request through the pooled session, retrying transient failures
+        
+        Every attempt first waits for the rate limiter, but the request's
+        credits are charged only once, with the first attempt: a retry does
+        not cost another execution. A 429 response pauses all clients sharing
+        the limiter, not only this request. Requests that
+        are not idempotent are only retried after connection errors that
+        happened before anything was sent (see ``request_never_sent``).
+        
+        Args:
+            method: HTTP method
+            url: Full URL to request
+            retry_statuses: Status codes that trigger a retry
+            idempotent: Whether a request that may have reached the server can be sent again
+            credits: Credits charged to the rate limiter's budget once per request (default: 0)
+            **kwargs: Extra arguments forwarded to ``requests.Session.request``
+            
+        Returns:
+            Successful response
+            
+        Raises:
+            requests.HTTPError: If the request still fails after all retries
+            requests.RequestException: If the connection keeps failing
+        """
+        kwargs.setdefault("timeout", self.timeout)
+        self.rate_limiter.acquire(self.priority, credits)
+        attempt = 0
+        while True:
+            if attempt:
+                self.rate_limiter.acquire(self.priority, 0)
+            try:
+                response = self.session.request(method, url, **kwargs)
+            except (requests.ConnectionError, requests.Timeout) as error:
+                if attempt >= self.max_retries or not (idempotent or request_never_sent(error)):
+                    raise
+                time.sleep(self._backoff_delay(attempt))
+                attempt += 1
+                continue
+            
+            if response.status_code in retry_statuses and attempt < self.max_retries:
+                delay = self._backoff_delay(attempt, response)
+                if response.status_code == 429:
+                    self.rate_limiter.penalize(delay)
+                response.close()
+                time.sleep(delay)
+                attempt += 1
+                continue
+            
+            response.raise_for_status()
+            return response
     
-    def get(self, url: str, use_sim: bool = False) -> Dict[str, Any]:
+    def _coalesce_timeout(self) -> float:
+        """
+        Longest a coalesced GET waits for the request it joined
+        
+        Returns:
+            Seconds a leader may reasonably spend on every attempt and backoff
+        """
+        return (sum(self.timeout) + self.backoff_max) * (self.max_retries + 1)
+    
+    @instrumented("http.get")
+    def get(self, url: str, use_sim: bool = False, params: Dict[str, Any] = None,
+            decoder: Callable[[bytes], Any] = json_loads) -> Any:
         """
         Make a GET request to Dune API
         
+        Concurrent calls with the same URL, API key and parameters are merged,
+        also across clients: only the first one is sent and the others receive
+        its (shared) result or error. A follower sends its own request when
+        the first one is interrupted or outlasts every attempt it could make.
+        
         Args:
             url: Full URL to request
             use_sim: If True, use SIM API headers instead of standard headers
+            params: Query string parameters (optional)
+            decoder: Turns the raw body into the result (default: JSON)
             
         Returns:
-            JSON response as dictionary
+            Decoded response, a dictionary for the default JSON decoder
             
         Raises:
             requests.HTTPError: If request fails
         """
         headers = self.sim_headers if use_sim else self.headers
-        response = requests.get(url, headers=headers)
-        response.raise_for_status()
-        return response.json()
+        key = (url, self.api_key, use_sim, tuple(sorted((params or {}).items())), decoder)
+        with _inflight_lock:
+            future = _inflight.get(key)
+            leader = future is None
+            if leader:
+                future = Future()
+                _inflight[key] = future
+        if not leader:
+            try:
+                result = future.result(timeout=self._coalesce_timeout())
+            except (FutureTimeoutError, CancelledError):
+                return self._conditional_get(url, headers, params, decoder)
+            metrics_registry.cache_result("http", "coalesced")
+            return result
+        
+        try:
+            result = self._conditional_get(url, headers, params, decoder)
+        except Exception as error:
+            future.set_exception(error)
+            raise
+        except BaseException:
+            # Interrupted (e.g. KeyboardInterrupt or a Streamlit rerun) rather than
+            # failed: followers send their own request instead of waiting for good
+            future.cancel()
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with _inflight_lock:
+                _inflight.pop(key, None)
+    
+    def _conditional_get(self, url: str, headers: Dict[str, str], params: Dict[str, Any] = None,
+                         decoder: Callable[[bytes], Any] = json_loads) -> Any:
+        """
+        Send a GET, revalidating a cached copy with ETag/Last-Modified when there is one
+        
+        A 304 response is answered from the cache without downloading or
+        decoding the body again. Other bodies are streamed in large chunks
+        and handed to ``decoder`` as bytes.
+        
+        Args:
+            url: Full URL to request
+            headers: Request headers
+            params: Query string parameters (optional)
+            decoder: Turns the raw body into the result
+            
+        Returns:
+            Decoded response
+        """
+        key = response_cache_key(url, params, headers)
+        cached = self.response_cache.get(key)
+        request_headers = dict(headers, **cached.conditional_headers()) if cached else headers
+        
+        response = self._request("GET", url, headers=request_headers, params=params, stream=True)
+        if response.status_code == 304 and cached is not None:
+            response.close()
+            metrics_registry.cache_result("http", "hit")
+            return self.response_cache.decode(key, cached, decoder)
+        
+        body = b"".join(response.iter_content(BODY_CHUNK_SIZE))
+        metrics_registry.cache_result("http", "miss")
+        metrics_registry.observe("response_bytes", len(body), operation="http.get")
+        with metrics_registry.timer("http.decode"):
+            result = decoder(body)
+        etag = response.headers.get("ETag")
+        last_modified = response.headers.get("Last-Modified")
+        if etag or last_modified:
+            self.response_cache.put(key, CachedResponse(body, etag, last_modified,
+                                                        parsed=result, decoder=decoder))
+        return result
     
-    def post(self, url: str, data: Dict[str, Any] = None, use_sim: bool = False) -> Dict[str, Any]:
+    @instrumented("http.post", rows=None)
+    def post(self, url: str, data: Dict[str, Any] = None, use_sim: bool = False,
+             credits: float = 0) -> Dict[str, Any]:
         """
         Make a POST request to Dune API
         
+        Only rate-limited (429) responses and connections that failed before the
+        request was sent are retried, since other failures may already have
+        triggered a billable execution upstream.
+        
         Args:
             url: Full URL to request
             data: JSON payload to send
             use_sim: If True, use SIM API headers instead of standard headers
+            credits: Credits the request costs, e.g. a query execution (default: 0)
             
         Returns:
             JSON response as dictionary
@@ -62,6 +351,11 @@ class DuneHttpClient:
             requests.HTTPError: If request fails
         """
         headers = self.sim_headers if use_sim else self.headers
-        response = requests.post(url, json=data, headers=headers)
-        response.raise_for_status()
-        return response.json()
+        response = self._request("POST", url, retry_statuses={429}, idempotent=False,
+                                 credits=credits, json=data, headers=headers)
+        metrics_registry.observe("response_bytes", len(response.content), operation="http.post")
+        return json_loads(response.content)
+    
+    def close(self) -> None:
+        """Close the pooled session and release its connections"""
+        self.session.close()
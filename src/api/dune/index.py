@@ -2,7 +2,21 @@
 Dune API Module
 Main entry point for Dune API functionality
 """
-from .httpClient import DuneHttpClient
-from .endpoints import DuneAPI
+from src.utility.lazy import lazy_exports
 
-__all__ = ['DuneHttpClient', 'DuneAPI']
+# Exported name -> module defining it
+_EXPORTS = {
+    'DuneHttpClient': '.httpClient',
+    'DuneAPI': '.endpoints',
+    'AsyncDuneHttpClient': '.asyncHttpClient',
+    'AsyncDuneAPI': '.asyncEndpoints',
+    'query_params_key': '.endpoints',
+    'RateLimiter': '.rateLimiter',
+    'PRIORITY_INTERACTIVE': '.rateLimiter',
+    'PRIORITY_BACKGROUND': '.rateLimiter',
+    'ResponseCache': '.responseCache'
+}
+
+__getattr__, __dir__ = lazy_exports(__package__, _EXPORTS)
+
+__all__ = list(_EXPORTS)
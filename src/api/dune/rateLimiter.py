@@ -0,0 +1,232 @@
+"""
+Rate Limiter for Dune API
+Token-bucket scheduling with priority classes and a per-minute budget counter
+"""
+import asyncio
+import threading
+import time
+from collections import deque
+from typing import Dict, Any, List, Tuple
+from src.config import DUNE_RATE_LIMIT_RPM, DUNE_RATE_LIMIT_BURST, DUNE_CREDITS_PER_MINUTE
+
+# Priority classes, lower values are served first
+PRIORITY_INTERACTIVE = 0
+PRIORITY_BACKGROUND = 1
+
+# The credit bucket holds this many seconds worth of credits
+CREDIT_BURST_SECONDS = 10
+
+# Window of the budget counter
+BUDGET_WINDOW_SECONDS = 60
+
+# Async waiters cannot be notified through the condition, so while a
+# higher-priority request waits they re-check on this interval
+ASYNC_RECHECK_SECONDS = 0.05
+
+
+class TokenBucket:
+    """Token bucket refilled continuously at a fixed rate (not thread-safe on its own)"""
+    
+    def __init__(self, rate: float, capacity: float):
+        """
+        Initialize a full bucket
+        
+        Args:
+            rate: Tokens added per second
+            capacity: Maximum number of stored tokens
+        """
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+    
+    def _refill(self, now: float) -> None:
+        """Add the tokens accumulated since the last update"""
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+    
+    def wait_time(self, cost: float, now: float) -> float:
+        """
+        Seconds until ``cost`` tokens are available
+        
+        Args:
+            cost: Tokens needed (capped at the bucket capacity)
+            now: Current ``time.monotonic()`` value
+            
+        Returns:
+            0 if the tokens are available now, otherwise the delay in seconds
+        """
+        self._refill(now)
+        missing = min(cost, self.capacity) - self.tokens
+        return 0.0 if missing <= 0 else missing / self.rate
+    
+    def consume(self, cost: float) -> None:
+        """Take tokens from the bucket; call after ``wait_time`` returned 0"""
+        self.tokens -= min(cost, self.capacity)
+    
+    def drain(self, now: float) -> None:
+        """Empty the bucket, e.g. after the server reported rate limiting"""
+        self._refill(now)
+        self.tokens = min(self.tokens, 0.0)
+
+
+class RateLimiter:
+    """Thread-safe request scheduler shared by every client of a process"""
+    
+    def __init__(self, requests_per_minute: float = DUNE_RATE_LIMIT_RPM,
+                 burst: int = DUNE_RATE_LIMIT_BURST,
+                 credits_per_minute: float = DUNE_CREDITS_PER_MINUTE):
+        """
+        Initialize the rate limiter
+        
+        Args:
+            requests_per_minute: Sustained request rate (0 disables the limit)
+            burst: Requests that may be sent back to back after an idle period
+            credits_per_minute: Sustained credit spend (0 disables the limit)
+        """
+        self.requests_per_minute = requests_per_minute
+        self.credits_per_minute = credits_per_minute
+        self._buckets: List[Tuple[str, TokenBucket]] = []
+        if requests_per_minute > 0:
+            self._buckets.append(("requests", TokenBucket(requests_per_minute / 60, max(1, burst))))
+        if credits_per_minute > 0:
+            rate = credits_per_minute / 60
+            self._buckets.append(("credits", TokenBucket(rate, max(1.0, rate * CREDIT_BURST_SECONDS))))
+        
+        self._cond = threading.Condition()
+        self._waiting = [0, 0]
+        self._paused_until = 0.0
+        self._history: deque = deque()
+        self.total_requests = 0
+        self.total_credits = 0.0
+    
+    def _delay(self, credits: float, now: float) -> float:
+        """Seconds until a request costing ``credits`` may be sent"""
+        costs = {"requests": 1, "credits": credits}
+        delays = [bucket.wait_time(costs[name], now) for name, bucket in self._buckets]
+        return max([self._paused_until - now] + delays)
+    
+    def acquire(self, priority: int = PRIORITY_INTERACTIVE, credits: float = 1) -> float:
+        """
+        Block until a request may be sent, then charge it to the budget
+        
+        A background request never overtakes a waiting interactive one.
+        
+        Args:
+            priority: ``PRIORITY_INTERACTIVE`` or ``PRIORITY_BACKGROUND``
+            credits: Credits the request is expected to cost (default: 1)
+            
+        Returns:
+            Seconds spent waiting
+        """
+        started = time.monotonic()
+        with self._cond:
+            self._waiting[priority] += 1
+            try:
+                while True:
+                    now = time.monotonic()
+                    if any(self._waiting[:priority]):
+                        # Higher-priority waiters notify when they are done
+                        self._cond.wait()
+                        continue
+                    delay = self._delay(credits, now)
+                    if delay <= 0:
+                        break
+                    self._cond.wait(timeout=delay)
+                
+                self._charge(now, credits)
+            finally:
+                self._waiting[priority] -= 1
+                self._cond.notify_all()
+        return time.monotonic() - started
+    
+    async def acquire_async(self, priority: int = PRIORITY_INTERACTIVE, credits: float = 1) -> float:
+        """
+        Wait until a request may be sent without blocking the event loop, then charge it
+        
+        Same scheduling as ``acquire``, but waiting happens in ``asyncio.sleep``
+        instead of a thread, and the lock is only held to check and charge.
+        
+        Args:
+            priority: ``PRIORITY_INTERACTIVE`` or ``PRIORITY_BACKGROUND``
+            credits: Credits the request is expected to cost (default: 1)
+            
+        Returns:
+            Seconds spent waiting
+        """
+        started = time.monotonic()
+        with self._cond:
+            self._waiting[priority] += 1
+        try:
+            while True:
+                with self._cond:
+                    now = time.monotonic()
+                    if any(self._waiting[:priority]):
+                        delay = ASYNC_RECHECK_SECONDS
+                    else:
+                        delay = self._delay(credits, now)
+                        if delay <= 0:
+                            self._charge(now, credits)
+                            break
+                await asyncio.sleep(delay)
+        finally:
+            with self._cond:
+                self._waiting[priority] -= 1
+                self._cond.notify_all()
+        return time.monotonic() - started
+    
+    def _charge(self, now: float, credits: float) -> None:
+        """Take a request and its credits from the buckets; call with the lock held"""
+        costs = {"requests": 1, "credits": credits}
+        for name, bucket in self._buckets:
+            bucket.consume(costs[name])
+        self._record(now, credits)
+    
+    def penalize(self, delay: float) -> None:
+        """
+        Pause every request after the server answered 429
+        
+        Args:
+            delay: Seconds to pause, e.g. from the Retry-After header
+        """
+        with self._cond:
+            now = time.monotonic()
+            self._paused_until = max(self._paused_until, now + delay)
+            for _, bucket in self._buckets:
+                bucket.drain(now)
+            self._cond.notify_all()
+    
+    def _record(self, now: float, credits: float) -> None:
+        """Add a request to the budget counter, dropping entries outside the window"""
+        self._history.append((now, credits))
+        self.total_requests += 1
+        self.total_credits += credits
+        while self._history and now - self._history[0][0] > BUDGET_WINDOW_SECONDS:
+            self._history.popleft()
+    
+    def budget(self) -> Dict[str, Any]:
+        """
+        Get requests and credits spent over the last minute
+        
+        Returns:
+            Dictionary with:
+            - requests_last_minute / credits_last_minute: Spend in the current window
+            - requests_per_minute / credits_per_minute: Configured limits (0 = unlimited)
+            - total_requests / total_credits: Spend since the limiter was created
+        """
+        with self._cond:
+            now = time.monotonic()
+            recent = [credits for at, credits in self._history if now - at <= BUDGET_WINDOW_SECONDS]
+            return {
+                "requests_last_minute": len(recent),
+                "credits_last_minute": sum(recent),
+                "requests_per_minute": self.requests_per_minute,
+                "credits_per_minute": self.credits_per_minute,
+                "total_requests": self.total_requests,
+                "total_credits": self.total_credits
+            }
+
+
+# Shared across clients, so the dashboard, cache refreshes and the ingestion worker of one
+# process draw from the same budget
+default_rate_limiter = RateLimiter()
@@ -0,0 +1,235 @@
+"""
+Response Cache for Dune API
+Size-bounded LRU of GET bodies, decoded results and validators (ETag/Last-Modified) with an optional disk tier
+"""
+import hashlib
+import json
+import os
+import sys
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+from src.config import DUNE_HTTP_CACHE_MAX_BYTES, DUNE_HTTP_CACHE_DIR
+
+
+@dataclass
+class CachedResponse:
+    """A cached response body with the validators needed to revalidate it"""
+    body: bytes
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    # Decoded body and the decoder that produced it, kept in memory only so a 304 skips parsing too
+    parsed: Any = field(default=None, repr=False, compare=False)
+    decoder: Any = field(default=None, repr=False, compare=False)
+    # Bytes held by ``parsed``, counted against the cache budget with the body
+    parsed_size: int = field(default=0, repr=False, compare=False)
+    
+    @property
+    def size(self) -> int:
+        """Bytes this entry holds in memory"""
+        return len(self.body) + self.parsed_size
+    
+    def conditional_headers(self) -> Dict[str, str]:
+        """
+        Build the headers that turn a GET into a conditional request
+        
+        Returns:
+            ``If-None-Match`` and/or ``If-Modified-Since`` headers
+        """
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+def parsed_size(value: Any) -> Optional[int]:
+    """
+    Measure the memory held by a decoded body
+    
+    Frames (e.g. holder pages) are measured with ``memory_usage(deep=True)``;
+    dictionaries may mix frames and scalars. Other values, such as arbitrary
+    JSON, cannot be measured cheaply and are not kept.
+    
+    Args:
+        value: Result of a decoder
+        
+    Returns:
+        Size in bytes, or None if it cannot be measured
+    """
+    if hasattr(value, "memory_usage"):
+        return int(value.memory_usage(deep=True).sum())
+    if not isinstance(value, dict):
+        return None
+    total = sys.getsizeof(value)
+    for item in value.values():
+        if hasattr(item, "memory_usage"):
+            total += int(item.memory_usage(deep=True).sum())
+        elif item is None or isinstance(item, (str, int, float, bool)):
+            total += sys.getsizeof(item)
+        else:
+            return None
+    return total
+
+
+def response_cache_key(url: str, params: Dict[str, Any] = None, headers: Dict[str, str] = None) -> str:
+    """
+    Build a cache key from a request's URL, parameters and headers
+    
+    Headers are hashed with the rest, so responses for different API keys never mix.
+    
+    Args:
+        url: Request URL
+        params: Query string parameters (optional)
+        headers: Request headers (optional)
+        
+    Returns:
+        Hex digest identifying the request
+    """
+    payload = json.dumps([url, sorted((params or {}).items()), sorted((headers or {}).items())],
+                         default=str)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+class ResponseCache:
+    """Thread-safe two-tier cache of GET responses"""
+    
+    def __init__(self, max_bytes: int = DUNE_HTTP_CACHE_MAX_BYTES, directory: str = DUNE_HTTP_CACHE_DIR):
+        """
+        Initialize the response cache
+        
+        Args:
+            max_bytes: Memory budget for cached bodies and their decoded results; least
+                recently used entries are evicted
+            directory: Directory for the disk tier (optional, memory only when not set)
+        """
+        self.max_bytes = max_bytes
+        self.directory = Path(directory) if directory else None
+        if self.directory is not None:
+            self.directory.mkdir(parents=True, exist_ok=True)
+        self._entries: "OrderedDict[str, CachedResponse]" = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+    
+    def get(self, key: str) -> Optional[CachedResponse]:
+        """
+        Look up a response, promoting disk hits into memory
+        
+        Args:
+            key: Key from ``response_cache_key``
+            
+        Returns:
+            Cached response, or None on a miss
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                return entry
+        
+        entry = self._read_disk(key)
+        if entry is not None:
+            self._remember(key, entry)
+        return entry
+    
+    def put(self, key: str, entry: CachedResponse) -> None:
+        """
+        Store a response in memory and, when enabled, on disk
+        
+        Args:
+            key: Key from ``response_cache_key``
+            entry: Response to cache
+        """
+        self._remember(key, entry)
+        self._write_disk(key, entry)
+    
+    def decode(self, key: str, entry: CachedResponse, decoder: Callable[[bytes], Any]) -> Any:
+        """
+        Decode a cached body, reusing the result kept from an earlier decode
+        
+        The result is shared with every caller that revalidates the same
+        response and must not be modified in place. A new result is attached
+        to the entry under the cache lock and counted against the budget.
+        
+        Args:
+            key: Key from ``response_cache_key``
+            entry: Entry returned by ``get`` for that key
+            decoder: Turns the raw body into the result
+            
+        Returns:
+            Decoded body
+        """
+        with self._lock:
+            if entry.parsed is not None and entry.decoder is decoder:
+                return entry.parsed
+        parsed = decoder(entry.body)
+        size = parsed_size(parsed)
+        if size is None or len(entry.body) + size > self.max_bytes:
+            return parsed
+        with self._lock:
+            # Entries evicted meanwhile are no longer counted, so they keep no result
+            if self._entries.get(key) is entry:
+                self._size -= entry.size
+                entry.parsed, entry.decoder, entry.parsed_size = parsed, decoder, size
+                self._size += entry.size
+                self._evict()
+        return parsed
+    
+    def _remember(self, key: str, entry: CachedResponse) -> None:
+        """Insert an entry into the memory tier and evict down to the byte budget"""
+        if entry.parsed is not None:
+            size = parsed_size(entry.parsed)
+            if size is None or len(entry.body) + size > self.max_bytes:
+                entry.parsed, entry.decoder, size = None, None, 0
+            entry.parsed_size = size
+        if entry.size > self.max_bytes:
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._size -= previous.size
+            self._entries[key] = entry
+            self._size += entry.size
+            self._evict()
+    
+    def _evict(self) -> None:
+        """Drop least recently used entries until the budget is met; call with the lock held"""
+        while self._size > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self._size -= evicted.size
+    
+    def _read_disk(self, key: str) -> Optional[CachedResponse]:
+        """Load an entry from the disk tier"""
+        if self.directory is None:
+            return None
+        try:
+            meta = json.loads((self.directory / f"{key}.json").read_text())
+            body = (self.directory / f"{key}.body").read_bytes()
+        except (FileNotFoundError, ValueError):
+            return None
+        return CachedResponse(body=body, etag=meta.get("etag"), last_modified=meta.get("last_modified"))
+    
+    def _write_disk(self, key: str, entry: CachedResponse) -> None:
+        """Write an entry to the disk tier, body first so metadata never points at a missing body"""
+        if self.directory is None:
+            return
+        for suffix, data in ((".body", entry.body),
+                             (".json", json.dumps({"etag": entry.etag,
+                                                   "last_modified": entry.last_modified}).encode())):
+            path = self.directory / f"{key}{suffix}"
+            tmp_path = path.with_name(f"{path.name}.{threading.get_ident()}.tmp")
+            tmp_path.write_bytes(data)
+            os.replace(tmp_path, path)
+    
+    def clear(self) -> None:
+        """Drop every memory entry (the disk tier is left in place)"""
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+
+# Shared across clients, so Streamlit reruns revalidate instead of downloading again
+default_response_cache = ResponseCache()
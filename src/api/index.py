@@ -2,9 +2,21 @@
 API Module
 Exports all API clients and wrappers
 """
-from .dune import DuneAPI, DuneHttpClient
+from src.utility.lazy import lazy_exports
 
-__all__ = [
-    'DuneAPI',
-    'DuneHttpClient'
-]
+# Exported name -> module defining it
+_EXPORTS = {
+    'DuneAPI': '.dune',
+    'DuneHttpClient': '.dune',
+    'AsyncDuneAPI': '.dune',
+    'AsyncDuneHttpClient': '.dune',
+    'query_params_key': '.dune',
+    'RateLimiter': '.dune',
+    'PRIORITY_INTERACTIVE': '.dune',
+    'PRIORITY_BACKGROUND': '.dune',
+    'ResponseCache': '.dune'
+}
+
+__getattr__, __dir__ = lazy_exports(__package__, _EXPORTS)
+
+__all__ = list(_EXPORTS)
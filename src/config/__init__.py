@@ -1,22 +1,2 @@
 """Config package"""
-from .index import (
-    DUNE_API_KEY,
-    DUNE_SIM_BASE_URL,
-    DUNE_BASE_URL,
-    DUNE_CHAIN_ID_ETH,
-    DUNE_CHAIN_ID_POLYGON,
-    DUNE_COPM_TOKEN_ADDRESS,
-    DUNE_COPW_TOKEN_ADDRESS,
-    validate_config
-)
-
-__all__ = [
-    'DUNE_API_KEY',
-    'DUNE_SIM_BASE_URL',
-    'DUNE_BASE_URL',
-    'DUNE_CHAIN_ID_ETH',
-    'DUNE_CHAIN_ID_POLYGON',
-    'DUNE_COPM_TOKEN_ADDRESS',
-    'DUNE_COPW_TOKEN_ADDRESS',
-    'validate_config'
-]
\ No newline at end of file
+from .index import __all__, __getattr__, __dir__
@@ -1,22 +1,47 @@
 """Dune config package"""
-from .index import (
-    DUNE_API_KEY,
-    DUNE_SIM_BASE_URL,
-    DUNE_BASE_URL,
-    DUNE_CHAIN_ID_ETH,
-    DUNE_CHAIN_ID_POLYGON,
-    DUNE_COPM_TOKEN_ADDRESS,
-    DUNE_COPW_TOKEN_ADDRESS,
-    validate_config
-)
+from src.utility.lazy import lazy_exports
 
-__all__ = [
-    'DUNE_API_KEY',
-    'DUNE_SIM_BASE_URL',
-    'DUNE_BASE_URL',
-    'DUNE_CHAIN_ID_ETH',
-    'DUNE_CHAIN_ID_POLYGON',
-    'DUNE_COPM_TOKEN_ADDRESS',
-    'DUNE_COPW_TOKEN_ADDRESS',
-    'validate_config'
-]
\ No newline at end of file
+# Exported name -> module defining it
+_EXPORTS = {
+    'DUNE_API_KEY': '.index',
+    'DUNE_SIM_BASE_URL': '.index',
+    'DUNE_BASE_URL': '.index',
+    'DUNE_CHAIN_ID_ETH': '.index',
+    'DUNE_CHAIN_ID_POLYGON': '.index',
+    'DUNE_COPM_TOKEN_ADDRESS': '.index',
+    'DUNE_COPW_TOKEN_ADDRESS': '.index',
+    'DUNE_HTTP_POOL_SIZE': '.index',
+    'DUNE_HTTP_CONNECT_TIMEOUT': '.index',
+    'DUNE_HTTP_READ_TIMEOUT': '.index',
+    'DUNE_HTTP_MAX_RETRIES': '.index',
+    'DUNE_HTTP_BACKOFF_BASE': '.index',
+    'DUNE_HTTP_BACKOFF_MAX': '.index',
+    'DUNE_FETCH_MAX_WORKERS': '.index',
+    'DUNE_ASYNC_MAX_CONCURRENCY': '.index',
+    'DUNE_HOLDERS_CACHE_TTL': '.index',
+    'DUNE_SNAPSHOT_DIR': '.index',
+    'TOKEN_REGISTRY': '.index',
+    'load_token_registry': '.index',
+    'DUNE_INGEST_INTERVAL': '.index',
+    'DUNE_DATA_SOURCE': '.index',
+    'DUNE_METRICS_DB': '.index',
+    'DUNE_VOLUME_QUERY_ID': '.index',
+    'DUNE_QUERY_TIMEOUT': '.index',
+    'DUNE_QUERY_CACHE_TTL': '.index',
+    'DUNE_RATE_LIMIT_RPM': '.index',
+    'DUNE_RATE_LIMIT_BURST': '.index',
+    'DUNE_CREDITS_PER_MINUTE': '.index',
+    'DUNE_HTTP_CACHE_MAX_BYTES': '.index',
+    'DUNE_HTTP_CACHE_DIR': '.index',
+    'DUNE_INSTRUMENTATION': '.index',
+    'DUNE_TRANSFERS_QUERY_ID': '.index',
+    'DUNE_EVENTS_DIR': '.index',
+    'DUNE_TRANSFERS_START': '.index',
+    'validate_config': '.index',
+    'DuneConfig': '.index',
+    'get_config': '.index'
+}
+
+__getattr__, __dir__ = lazy_exports(__package__, _EXPORTS)
+
+__all__ = list(_EXPORTS)
@@ -1,41 +1,223 @@
 """
 Dune Configuration Module
-Loads and exports all Dune-related environment variables
+Loads all Dune-related environment variables once, on first use
 """
 import os
+import json
+import threading
+from datetime import datetime, timezone
 from dotenv import load_dotenv
+from typing import Any, Callable, Dict, List, Mapping, Optional, Tuple
+from src.models import Token
 
-# Load environment variables
-load_dotenv()
 
-# Dune API Configuration
-DUNE_API_KEY = os.getenv("DUNE_API_KEY")
+def parse_flag(raw: str) -> bool:
+    """Parse an on/off setting: "1", "true", "yes" and "on" enable it"""
+    return raw.strip().lower() in ("1", "true", "yes", "on")
 
-# API URLs
-DUNE_SIM_BASE_URL = os.getenv("DUNE_SIM", "https://api.sim.dune.com/v1")
-DUNE_BASE_URL = os.getenv("DUNE_DUNE", "https://api.dune.com/api/v1")
 
-# Chain IDs
-DUNE_CHAIN_ID_ETH = int(os.getenv("DUNE_CHAIN_ID_ETH", "1"))
-DUNE_CHAIN_ID_POLYGON = int(os.getenv("DUNE_CHAIN_ID_POLYGON", "137"))
+def parse_datetime(raw: str) -> datetime:
+    """Parse an ISO 8601 date or datetime setting, as UTC when it has no offset"""
+    value = datetime.fromisoformat(raw.strip())
+    return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+
+
+# Setting name -> (environment variable, parser, default)
+SETTINGS: Dict[str, Tuple[str, Callable[[str], Any], Optional[str]]] = {
+    # Dune API Configuration
+    "DUNE_API_KEY": ("DUNE_API_KEY", str, None),
+    
+    # API URLs
+    "DUNE_SIM_BASE_URL": ("DUNE_SIM", str, "https://api.sim.dune.com/v1"),
+    "DUNE_BASE_URL": ("DUNE_DUNE", str, "https://api.dune.com/api/v1"),
+    
+    # Chain IDs
+    "DUNE_CHAIN_ID_ETH": ("DUNE_CHAIN_ID_ETH", int, "1"),
+    "DUNE_CHAIN_ID_POLYGON": ("DUNE_CHAIN_ID_POLYGON", int, "137"),
+    
+    # Token Addresses
+    "DUNE_COPM_TOKEN_ADDRESS": ("DUNE_COPM_TOKEN_ADDRESS", str, None),
+    "DUNE_COPW_TOKEN_ADDRESS": ("DUNE_COPW_TOKEN_ADDRESS", str, None),
+    
+    # HTTP client tuning
+    "DUNE_HTTP_POOL_SIZE": ("DUNE_HTTP_POOL_SIZE", int, "10"),
+    "DUNE_HTTP_CONNECT_TIMEOUT": ("DUNE_HTTP_CONNECT_TIMEOUT", float, "5"),
+    "DUNE_HTTP_READ_TIMEOUT": ("DUNE_HTTP_READ_TIMEOUT", float, "30"),
+    "DUNE_HTTP_MAX_RETRIES": ("DUNE_HTTP_MAX_RETRIES", int, "4"),
+    "DUNE_HTTP_BACKOFF_BASE": ("DUNE_HTTP_BACKOFF_BASE", float, "0.5"),
+    "DUNE_HTTP_BACKOFF_MAX": ("DUNE_HTTP_BACKOFF_MAX", float, "30"),
+    
+    # Client-side rate limiting, per process: requests and query execution credits per minute
+    # (0 disables a limit) and how many requests may be sent back to back after an idle period
+    "DUNE_RATE_LIMIT_RPM": ("DUNE_RATE_LIMIT_RPM", float, "300"),
+    "DUNE_RATE_LIMIT_BURST": ("DUNE_RATE_LIMIT_BURST", int, "10"),
+    "DUNE_CREDITS_PER_MINUTE": ("DUNE_CREDITS_PER_MINUTE", float, "0"),
+    
+    # Conditional GET cache: memory budget in bytes and optional directory for a disk tier
+    "DUNE_HTTP_CACHE_MAX_BYTES": ("DUNE_HTTP_CACHE_MAX_BYTES", int, str(64 * 1024 * 1024)),
+    "DUNE_HTTP_CACHE_DIR": ("DUNE_HTTP_CACHE_DIR", str, None),
+    
+    # Maximum number of tokens fetched concurrently
+    "DUNE_FETCH_MAX_WORKERS": ("DUNE_FETCH_MAX_WORKERS", int, "8"),
+    
+    # Maximum number of in-flight requests for the asyncio client
+    "DUNE_ASYNC_MAX_CONCURRENCY": ("DUNE_ASYNC_MAX_CONCURRENCY", int, "32"),
+    
+    # Seconds a cached holder snapshot is served before being refreshed in the background
+    "DUNE_HOLDERS_CACHE_TTL": ("DUNE_HOLDERS_CACHE_TTL", float, "300"),
+    
+    # Local directory for persisted holder snapshots
+    "DUNE_SNAPSHOT_DIR": ("DUNE_SNAPSHOT_DIR", str, "data/snapshots"),
+    
+    # Seconds between polls of the background ingestion worker (python -m src.ingest)
+    "DUNE_INGEST_INTERVAL": ("DUNE_INGEST_INTERVAL", float, "300"),
+    
+    # Where the dashboard reads holders from: "store" (snapshots only), "live" (Dune on
+    # every cache refresh) or "auto" (snapshots while the worker keeps them fresh)
+    "DUNE_DATA_SOURCE": ("DUNE_DATA_SOURCE", str, "auto"),
+    
+    # SQLite file holding the per-refresh metrics time series and its rollups
+    "DUNE_METRICS_DB": ("DUNE_METRICS_DB", str, "data/metrics.sqlite3"),
+    
+    # Saved Dune query returning daily transfer volume (columns: day, total_volume) for a
+    # token, parameterized by ``chain_id`` and ``token_address``; the chart is hidden if unset
+    "DUNE_VOLUME_QUERY_ID": ("DUNE_VOLUME_QUERY_ID", str, None),
+    
+    # Query execution: seconds to wait for an execution and to reuse its results
+    "DUNE_QUERY_TIMEOUT": ("DUNE_QUERY_TIMEOUT", float, "300"),
+    "DUNE_QUERY_CACHE_TTL": ("DUNE_QUERY_CACHE_TTL", float, "3600"),
+    
+    # Saved Dune query returning a token's transfers (block_time, block_number, tx_hash,
+    # from_address, to_address, amount) between the ``start_time`` and ``end_time``
+    # parameters, besides ``chain_id`` and ``token_address``; activity is not ingested if unset
+    "DUNE_TRANSFERS_QUERY_ID": ("DUNE_TRANSFERS_QUERY_ID", str, None),
+    
+    # Day-partitioned transfer event store and the time its backfill starts from
+    # (default: 90 days before the first ingestion)
+    "DUNE_EVENTS_DIR": ("DUNE_EVENTS_DIR", str, "data/events"),
+    "DUNE_TRANSFERS_START": ("DUNE_TRANSFERS_START", parse_datetime, None),
+    
+    # Record timings, bytes, row counts and cache hits of the hot paths (off by default)
+    "DUNE_INSTRUMENTATION": ("DUNE_INSTRUMENTATION", parse_flag, "0")
+}
+
+
+class DuneConfig:
+    """Dune settings read from the environment, exposed as attributes (``config.DUNE_API_KEY``)"""
+    
+    def __init__(self, values: Mapping[str, Any]):
+        """
+        Initialize the configuration
+        
+        Args:
+            values: Setting name to parsed value, including ``TOKEN_REGISTRY``
+        """
+        self._values = dict(values)
+    
+    def __getattr__(self, name: str) -> Any:
+        try:
+            return self.__dict__['_values'][name]
+        except KeyError:
+            raise AttributeError(f"Unknown setting {name!r}") from None
+    
+    def __getitem__(self, name: str) -> Any:
+        return self._values[name]
+    
+    @classmethod
+    def from_env(cls) -> "DuneConfig":
+        """
+        Read every setting from the environment, after loading ``.env``
+        
+        Returns:
+            Parsed configuration
+            
+        Raises:
+            ValueError: If a numeric setting or ``DUNE_TOKENS`` cannot be parsed
+        """
+        load_dotenv()
+        values = {}
+        for name, (variable, parse, default) in SETTINGS.items():
+            raw = os.getenv(variable, default)
+            values[name] = None if raw is None else parse(raw)
+        values["TOKEN_REGISTRY"] = load_token_registry(values)
+        return cls(values)
+
+
+_config: Optional[DuneConfig] = None
+_config_lock = threading.Lock()
+
+
+def get_config() -> DuneConfig:
+    """
+    Get the process-wide configuration, loading it on the first call
+    
+    Returns:
+        Configuration shared by every module
+    """
+    global _config
+    if _config is None:
+        with _config_lock:
+            if _config is None:
+                _config = DuneConfig.from_env()
+    return _config
+
+
+def load_token_registry(settings: Mapping[str, Any] = None) -> List[Token]:
+    """
+    Load the registry of monitored tokens
+    
+    Tokens come from ``DUNE_TOKENS``, a JSON list of objects with ``symbol``,
+    ``chain_id``, ``address`` and optional ``decimals``. When it is not set,
+    the registry falls back to the COPM/COPW address variables.
+    
+    Args:
+        settings: Parsed settings providing the COPM/COPW fallback (default: ``get_config()``)
+        
+    Returns:
+        List of configured tokens
+        
+    Raises:
+        ValueError: If ``DUNE_TOKENS`` is not a valid JSON list of tokens
+    """
+    raw = os.getenv("DUNE_TOKENS")
+    if raw:
+        try:
+            return [Token.from_dict(entry) for entry in json.loads(raw)]
+        except (TypeError, KeyError, ValueError) as error:
+            raise ValueError(f"Invalid DUNE_TOKENS configuration: {error}") from error
+    
+    if settings is None:
+        settings = get_config()
+    defaults = [
+        ("COPM", settings["DUNE_CHAIN_ID_POLYGON"], settings["DUNE_COPM_TOKEN_ADDRESS"]),
+        ("COPW", settings["DUNE_CHAIN_ID_ETH"], settings["DUNE_COPW_TOKEN_ADDRESS"])
+    ]
+    return [Token(symbol, chain_id, address) for symbol, chain_id, address in defaults if address]
+
+
+def __getattr__(name: str) -> Any:
+    """Resolve ``DUNE_*`` settings and ``TOKEN_REGISTRY`` from the loaded configuration"""
+    if name in SETTINGS or name == "TOKEN_REGISTRY":
+        return getattr(get_config(), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
-# Token Addresses
-DUNE_COPM_TOKEN_ADDRESS = os.getenv("DUNE_COPM_TOKEN_ADDRESS")
-DUNE_COPW_TOKEN_ADDRESS = os.getenv("DUNE_COPW_TOKEN_ADDRESS")
 
 # Validation
 def validate_config():
     """Validate that all required environment variables are set"""
+    config = get_config()
     required_vars = {
-        "DUNE_API_KEY": DUNE_API_KEY,
-        "DUNE_COPM_TOKEN_ADDRESS": DUNE_COPM_TOKEN_ADDRESS,
-        "DUNE_COPW_TOKEN_ADDRESS": DUNE_COPW_TOKEN_ADDRESS,
+        "DUNE_API_KEY": config.DUNE_API_KEY,
     }
     
     missing_vars = [name for name, value in required_vars.items() if value is None]
     
     if missing_vars:
         raise ValueError(f"Missing required environment variables: {', '.join(missing_vars)}")
+    
+    if not config.TOKEN_REGISTRY:
+        raise ValueError("No tokens configured: set DUNE_TOKENS or "
+                         "DUNE_COPM_TOKEN_ADDRESS/DUNE_COPW_TOKEN_ADDRESS")
 
 # Export all configuration
 __all__ = [
@@ -46,5 +228,34 @@ __all__ = [
     'DUNE_CHAIN_ID_POLYGON',
     'DUNE_COPM_TOKEN_ADDRESS',
     'DUNE_COPW_TOKEN_ADDRESS',
-    'validate_config'
+    'DUNE_HTTP_POOL_SIZE',
+    'DUNE_HTTP_CONNECT_TIMEOUT',
+    'DUNE_HTTP_READ_TIMEOUT',
+    'DUNE_HTTP_MAX_RETRIES',
+    'DUNE_HTTP_BACKOFF_BASE',
+    'DUNE_HTTP_BACKOFF_MAX',
+    'DUNE_FETCH_MAX_WORKERS',
+    'DUNE_ASYNC_MAX_CONCURRENCY',
+    'DUNE_HOLDERS_CACHE_TTL',
+    'DUNE_SNAPSHOT_DIR',
+    'TOKEN_REGISTRY',
+    'load_token_registry',
+    'DUNE_INGEST_INTERVAL',
+    'DUNE_DATA_SOURCE',
+    'DUNE_METRICS_DB',
+    'DUNE_VOLUME_QUERY_ID',
+    'DUNE_QUERY_TIMEOUT',
+    'DUNE_QUERY_CACHE_TTL',
+    'DUNE_RATE_LIMIT_RPM',
+    'DUNE_RATE_LIMIT_BURST',
+    'DUNE_CREDITS_PER_MINUTE',
+    'DUNE_HTTP_CACHE_MAX_BYTES',
+    'DUNE_HTTP_CACHE_DIR',
+    'DUNE_INSTRUMENTATION',
+    'DUNE_TRANSFERS_QUERY_ID',
+    'DUNE_EVENTS_DIR',
+    'DUNE_TRANSFERS_START',
+    'validate_config',
+    'DuneConfig',
+    'get_config'
 ]
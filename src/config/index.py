@@ -2,24 +2,49 @@
 Configuration Module
 Exports all configuration modules
 """
-from .dune.index import (
-    DUNE_API_KEY,
-    DUNE_SIM_BASE_URL,
-    DUNE_BASE_URL,
-    DUNE_CHAIN_ID_ETH,
-    DUNE_CHAIN_ID_POLYGON,
-    DUNE_COPM_TOKEN_ADDRESS,
-    DUNE_COPW_TOKEN_ADDRESS,
-    validate_config
-)
+from src.utility.lazy import lazy_exports
 
-__all__ = [
-    'DUNE_API_KEY',
-    'DUNE_SIM_BASE_URL',
-    'DUNE_BASE_URL',
-    'DUNE_CHAIN_ID_ETH',
-    'DUNE_CHAIN_ID_POLYGON',
-    'DUNE_COPM_TOKEN_ADDRESS',
-    'DUNE_COPW_TOKEN_ADDRESS',
-    'validate_config'
-]
+# Exported name -> module defining it
+_EXPORTS = {
+    'DUNE_API_KEY': '.dune',
+    'DUNE_SIM_BASE_URL': '.dune',
+    'DUNE_BASE_URL': '.dune',
+    'DUNE_CHAIN_ID_ETH': '.dune',
+    'DUNE_CHAIN_ID_POLYGON': '.dune',
+    'DUNE_COPM_TOKEN_ADDRESS': '.dune',
+    'DUNE_COPW_TOKEN_ADDRESS': '.dune',
+    'DUNE_HTTP_POOL_SIZE': '.dune',
+    'DUNE_HTTP_CONNECT_TIMEOUT': '.dune',
+    'DUNE_HTTP_READ_TIMEOUT': '.dune',
+    'DUNE_HTTP_MAX_RETRIES': '.dune',
+    'DUNE_HTTP_BACKOFF_BASE': '.dune',
+    'DUNE_HTTP_BACKOFF_MAX': '.dune',
+    'DUNE_FETCH_MAX_WORKERS': '.dune',
+    'DUNE_ASYNC_MAX_CONCURRENCY': '.dune',
+    'DUNE_HOLDERS_CACHE_TTL': '.dune',
+    'DUNE_SNAPSHOT_DIR': '.dune',
+    'TOKEN_REGISTRY': '.dune',
+    'load_token_registry': '.dune',
+    'DUNE_INGEST_INTERVAL': '.dune',
+    'DUNE_DATA_SOURCE': '.dune',
+    'DUNE_METRICS_DB': '.dune',
+    'DUNE_VOLUME_QUERY_ID': '.dune',
+    'DUNE_QUERY_TIMEOUT': '.dune',
+    'DUNE_QUERY_CACHE_TTL': '.dune',
+    'DUNE_RATE_LIMIT_RPM': '.dune',
+    'DUNE_RATE_LIMIT_BURST': '.dune',
+    'DUNE_CREDITS_PER_MINUTE': '.dune',
+    'DUNE_HTTP_CACHE_MAX_BYTES': '.dune',
+    'DUNE_HTTP_CACHE_DIR': '.dune',
+    'DUNE_INSTRUMENTATION': '.dune',
+    'DUNE_TRANSFERS_QUERY_ID': '.dune',
+    'DUNE_EVENTS_DIR': '.dune',
+    'DUNE_TRANSFERS_START': '.dune',
+    'validate_config': '.dune',
+    'DuneConfig': '.dune',
+    'get_config': '.dune'
+}
+
+__getattr__, __dir__ = lazy_exports(__package__, _EXPORTS)
+
+__all__ = list(_EXPORTS)
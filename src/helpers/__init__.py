@@ -1,16 +1,2 @@
 """Helpers package"""
-from .index import (
-    normalize_token_balance,
-    filter_by_token_address,
-    calculate_holder_metrics,
-    create_comparison_dataframe,
-    prepare_holder_display_columns
-)
-
-__all__ = [
-    'normalize_token_balance',
-    'filter_by_token_address',
-    'calculate_holder_metrics',
-    'create_comparison_dataframe',
-    'prepare_holder_display_columns'
-]
\ No newline at end of file
+from .index import __all__, __getattr__, __dir__
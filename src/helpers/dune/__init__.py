@@ -1,16 +1,29 @@
 """Dune helpers package"""
-from .dune import (
-    normalize_token_balance,
-    filter_by_token_address,
-    calculate_holder_metrics,
-    create_comparison_dataframe,
-    prepare_holder_display_columns
-)
+from src.utility.lazy import lazy_exports
 
-__all__ = [
-    'normalize_token_balance',
-    'filter_by_token_address',
-    'calculate_holder_metrics',
-    'create_comparison_dataframe',
-    'prepare_holder_display_columns'
-]
\ No newline at end of file
+# Exported name -> module defining it
+_EXPORTS = {
+    'normalize_token_balance': '.dune',
+    'filter_by_token_address': '.dune',
+    'calculate_holder_metrics': '.dune',
+    'create_comparison_dataframe': '.dune',
+    'prepare_holder_display_columns': '.dune',
+    'diff_holders': '.diff',
+    'diff_holder_pages': '.diff',
+    'is_empty_diff': '.diff',
+    'apply_holder_diff': '.diff',
+    'update_holder_metrics': '.diff',
+    'holder_balances': '.distribution',
+    'calculate_concentration_metrics': '.distribution',
+    'AddressIndex': '.overlap',
+    'address_keys': '.overlap',
+    'key_addresses': '.overlap',
+    'active_wallets': '.activity',
+    'retention_cohorts': '.activity',
+    'wallet_activity': '.activity',
+    'wallet_days': '.activity'
+}
+
+__getattr__, __dir__ = lazy_exports(__package__, _EXPORTS)
+
+__all__ = list(_EXPORTS)
@@ -0,0 +1,219 @@
+"""
+Wallet Activity Functions
+Vectorized active-wallet counts, retention cohorts and per-wallet activity from transfer events
+"""
+import numpy as np
+import pandas as pd
+from typing import Dict, Tuple
+from src.utility.instrumentation import instrumented
+
+# Mints and burns move tokens from/to the zero address, which is not a wallet
+ZERO_ADDRESS = "0x0000000000000000000000000000000000000000"
+
+# Trailing window, in days, of each active-wallet count
+ACTIVITY_WINDOWS = {'dau': 1, 'wau': 7, 'mau': 30}
+
+# Cohort period lengths; weeks start on Monday and 1970-01-01 was a Thursday
+COHORT_GRANULARITIES = ('daily', 'weekly', 'monthly')
+_WEEK_OFFSET_DAYS = 3
+
+
+def _day_numbers(times: pd.Series) -> np.ndarray:
+    """Convert UTC timestamps to days since 1970-01-01"""
+    if isinstance(times.dtype, pd.DatetimeTZDtype):
+        times = times.dt.tz_convert(None)
+    return times.to_numpy(dtype='datetime64[ns]').astype('datetime64[D]').view(np.int64)
+
+
+def wallet_days(transfers: pd.DataFrame, senders_only: bool = True) -> Tuple[np.ndarray, np.ndarray, pd.Index]:
+    """
+    Reduce transfers to the distinct (wallet, day) pairs with activity
+    
+    Args:
+        transfers: Transfers DataFrame with ``block_time``, ``from_address`` and ``to_address``
+        senders_only: Only count the sender as active, like ``has_initiated_transfer``
+            (default: True); otherwise receivers are active too
+            
+    Returns:
+        Tuple of (wallet codes, days since epoch, wallet addresses by code),
+        sorted by wallet then day
+    """
+    if transfers.empty:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64), pd.Index([])
+    
+    days = _day_numbers(transfers['block_time'])
+    wallets = transfers['from_address']
+    if not senders_only:
+        wallets = pd.concat([wallets, transfers['to_address']], ignore_index=True)
+        days = np.concatenate([days, days])
+    codes, addresses = pd.factorize(wallets)
+    addresses = pd.Index(addresses)
+    
+    keep = codes >= 0
+    if ZERO_ADDRESS in addresses:
+        keep &= codes != addresses.get_loc(ZERO_ADDRESS)
+    codes, days = codes[keep].astype(np.int64), days[keep]
+    if len(days) == 0:
+        return codes, days, addresses
+    
+    # One sortable integer per pair: unique() dedupes and orders by wallet, then day
+    first_day = days.min()
+    span = days.max() - first_day + 1
+    pairs = np.unique(codes * span + (days - first_day))
+    return pairs // span, pairs % span + first_day, addresses
+
+
+@instrumented("helpers.active_wallets")
+def active_wallets(transfers: pd.DataFrame, windows: Dict[str, int] = None,
+                   senders_only: bool = True) -> pd.DataFrame:
+    """
+    Count distinct active wallets per day over trailing windows (DAU/WAU/MAU)
+    
+    Each (wallet, day) pair covers the days until the window ends or the
+    wallet's next active day, whichever comes first. Covered spans of a
+    wallet never overlap, so every window is a single difference array
+    instead of a rolling distinct count.
+    
+    Args:
+        transfers: Transfers DataFrame with ``block_time``, ``from_address`` and ``to_address``
+        windows: Column name to trailing window in days (default: ``ACTIVITY_WINDOWS``)
+        senders_only: Only count senders as active (default: True)
+        
+    Returns:
+        DataFrame with a UTC ``day`` column (every day from the first to the
+        last transfer) and one count column per window
+    """
+    windows = windows or ACTIVITY_WINDOWS
+    codes, days, _ = wallet_days(transfers, senders_only=senders_only)
+    if len(days) == 0:
+        return pd.DataFrame(columns=['day', *windows])
+    
+    first_day = days.min()
+    n = int(days.max() - first_day) + 1
+    offsets = days - first_day
+    same_wallet = np.r_[codes[1:] == codes[:-1], False]
+    next_active = np.where(same_wallet, np.r_[offsets[1:], 0], n)
+    
+    result = {'day': pd.to_datetime(first_day + np.arange(n), unit='D', utc=True)}
+    for name, width in windows.items():
+        ends = np.minimum(np.minimum(offsets + width, next_active), n)
+        coverage = np.bincount(offsets, minlength=n + 1) - np.bincount(ends, minlength=n + 1)
+        result[name] = np.cumsum(coverage)[:n]
+    return pd.DataFrame(result)
+
+
+def _period_numbers(days: np.ndarray, granularity: str) -> np.ndarray:
+    """Convert days since epoch to daily, Monday-aligned weekly or monthly period numbers"""
+    if granularity == 'daily':
+        return days
+    if granularity == 'weekly':
+        return (days + _WEEK_OFFSET_DAYS) // 7
+    if granularity == 'monthly':
+        return days.astype('datetime64[D]').astype('datetime64[M]').view(np.int64)
+    raise ValueError(f"Unknown granularity {granularity!r}, expected one of {COHORT_GRANULARITIES}")
+
+
+def _period_starts(periods: np.ndarray, granularity: str) -> pd.DatetimeIndex:
+    """Convert period numbers back to the UTC start of each period"""
+    if granularity == 'weekly':
+        periods = periods * 7 - _WEEK_OFFSET_DAYS
+    elif granularity == 'monthly':
+        periods = periods.astype('datetime64[M]').astype('datetime64[D]').view(np.int64)
+    return pd.to_datetime(periods, unit='D', utc=True)
+
+
+@instrumented("helpers.retention_cohorts")
+def retention_cohorts(transfers: pd.DataFrame, granularity: str = 'weekly', periods: int = 8,
+                      senders_only: bool = True) -> pd.DataFrame:
+    """
+    Group wallets by the period of their first activity and measure how many stay active
+    
+    Args:
+        transfers: Transfers DataFrame with ``block_time``, ``from_address`` and ``to_address``
+        granularity: Cohort period, 'daily', 'weekly' or 'monthly' (default: 'weekly')
+        periods: Number of periods followed after the first one (default: 8)
+        senders_only: Only count senders as active (default: True)
+        
+    Returns:
+        DataFrame with one row per cohort: ``cohort`` (period start), ``wallets``
+        (cohort size) and columns ``0`` to ``periods - 1`` with the share of the
+        cohort active that many periods later; periods not reached yet are NaN
+        
+    Raises:
+        ValueError: If the granularity is unknown
+    """
+    codes, days, _ = wallet_days(transfers, senders_only=senders_only)
+    offset_columns = [str(k) for k in range(periods)]
+    period = _period_numbers(days, granularity)
+    if len(period) == 0:
+        return pd.DataFrame(columns=['cohort', 'wallets', *offset_columns])
+    
+    # Pairs are sorted by wallet then day, so each wallet's first row is its cohort
+    firsts = np.flatnonzero(np.r_[True, codes[1:] != codes[:-1]])
+    cohort = np.repeat(period[firsts], np.diff(np.r_[firsts, len(codes)]))
+    distinct = np.r_[True, (codes[1:] != codes[:-1]) | (period[1:] != period[:-1])]
+    cohort, offset = cohort[distinct], (period - cohort)[distinct]
+    
+    first_cohort, last_period = cohort.min(), period.max()
+    n_cohorts = int(last_period - first_cohort) + 1
+    tracked = offset < periods
+    counts = np.bincount((cohort[tracked] - first_cohort) * periods + offset[tracked],
+                         minlength=n_cohorts * periods).reshape(n_cohorts, periods)
+    
+    sizes = counts[:, 0]
+    with np.errstate(invalid='ignore', divide='ignore'):
+        shares = counts / sizes[:, None]
+    cohorts = first_cohort + np.arange(n_cohorts)
+    shares[cohorts[:, None] + np.arange(periods) > last_period] = np.nan
+    
+    present = sizes > 0
+    result = pd.DataFrame(shares[present], columns=offset_columns)
+    result.insert(0, 'wallets', sizes[present])
+    result.insert(0, 'cohort', _period_starts(cohorts[present], granularity))
+    return result
+
+
+@instrumented("helpers.wallet_activity")
+def wallet_activity(transfers: pd.DataFrame) -> pd.DataFrame:
+    """
+    Summarize each wallet's transfers
+    
+    Args:
+        transfers: Transfers DataFrame with ``block_time``, ``from_address`` and ``to_address``
+        
+    Returns:
+        DataFrame with ``wallet_address``, ``transfers_sent``, ``transfers_received``,
+        ``first_active`` and ``last_active``, most transfers first
+    """
+    columns = ['wallet_address', 'transfers_sent', 'transfers_received', 'first_active', 'last_active']
+    if transfers.empty:
+        return pd.DataFrame(columns=columns)
+    
+    n = len(transfers)
+    wallets = pd.concat([transfers['from_address'], transfers['to_address']], ignore_index=True)
+    codes, addresses = pd.factorize(wallets)
+    times = transfers['block_time'].dt.tz_convert(None).to_numpy(dtype='datetime64[ns]')
+    times = np.concatenate([times, times])
+    
+    k = len(addresses)
+    sent = np.bincount(codes[:n][codes[:n] >= 0], minlength=k)
+    received = np.bincount(codes[n:][codes[n:] >= 0], minlength=k)
+    
+    # First and last occurrence of each wallet along the time order
+    order = np.argsort(times, kind='stable')
+    ordered = codes[order]
+    valid = ordered >= 0
+    _, first = np.unique(ordered[valid], return_index=True)
+    _, last = np.unique(ordered[valid][::-1], return_index=True)
+    positions = order[valid]
+    
+    result = pd.DataFrame({
+        'wallet_address': pd.Series(addresses, dtype=transfers['from_address'].dtype),
+        'transfers_sent': sent,
+        'transfers_received': received,
+        'first_active': pd.Series(times[positions[first]]).dt.tz_localize('UTC'),
+        'last_active': pd.Series(times[positions[len(positions) - 1 - last]]).dt.tz_localize('UTC')
+    })
+    result = result[result['wallet_address'] != ZERO_ADDRESS]
+    total = result['transfers_sent'] + result['transfers_received']
+    return result.iloc[np.argsort(-total.to_numpy(), kind='stable')].reset_index(drop=True)
@@ -0,0 +1,186 @@
+"""
+Holder Diff Functions
+Incremental comparison of holder snapshots keyed by wallet address
+"""
+import numpy as np
+import pandas as pd
+from typing import Dict, Any, Iterable, List
+from src.utility.numbers import wei_sum, wei_total_to_token, wei_sort_order
+from src.utility.instrumentation import instrumented
+
+# Columns compared to decide whether a known wallet changed
+DIFF_COLUMNS = ['balance_hi', 'balance_lo', 'has_initiated_transfer']
+
+
+def _drop_duplicate_holders(df: pd.DataFrame, key: str) -> pd.DataFrame:
+    """Keep the first row of each holder; offset pagination can return a holder twice"""
+    duplicated = df[key].duplicated()
+    return df[~duplicated.to_numpy()] if duplicated.any() else df
+
+
+@instrumented("helpers.diff_holder_pages")
+def diff_holder_pages(previous: pd.DataFrame, pages: Iterable[pd.DataFrame],
+                      key: str = 'wallet_address') -> Dict[str, pd.DataFrame]:
+    """
+    Compare a stream of holder pages against the previous snapshot
+    
+    Pages are consumed one at a time and only rows that differ are kept,
+    so memory grows with churn rather than with the total holder count.
+    A holder listed twice (in the snapshot or in the pages) counts once.
+    
+    Args:
+        previous: Previous holders snapshot with limb-encoded balances
+        pages: Iterable of holder pages (e.g. ``DuneAPI.iter_token_holder_pages``)
+        key: Column identifying a holder (default: 'wallet_address')
+        
+    Returns:
+        Dictionary with:
+        - added: Holders not present in the previous snapshot
+        - removed: Previous holders missing from the new pages
+        - changed: Holders whose balance or transfer flag changed, with the
+          previous values in ``prev_``-prefixed columns
+    """
+    if previous.empty or key not in previous.columns:
+        pages = [page for page in pages if not page.empty]
+        current = pd.concat(pages, ignore_index=True) if pages else pd.DataFrame()
+        if key in current.columns:
+            current = _drop_duplicate_holders(current, key)
+        return {'added': current, 'removed': current.iloc[0:0], 'changed': current.iloc[0:0]}
+    
+    previous = _drop_duplicate_holders(previous, key)
+    compare_cols = [col for col in DIFF_COLUMNS if col in previous.columns]
+    indexed = previous.set_index(key)[compare_cols]
+    seen = np.zeros(len(indexed), dtype=bool)
+    added: List[pd.DataFrame] = []
+    changed: List[pd.DataFrame] = []
+    
+    for page in pages:
+        positions = indexed.index.get_indexer(page[key])
+        known = positions >= 0
+        seen[positions[known]] = True
+        
+        if (~known).any():
+            added.append(page[~known])
+        
+        matched = page[known]
+        old = indexed.iloc[positions[known]]
+        mask = np.zeros(len(matched), dtype=bool)
+        for col in compare_cols:
+            mask |= matched[col].to_numpy() != old[col].to_numpy()
+        if mask.any():
+            rows = matched[mask].copy()
+            for col in compare_cols:
+                rows[f'prev_{col}'] = old[col].to_numpy()[mask]
+            changed.append(rows)
+    
+    empty = previous.iloc[0:0]
+    return {
+        'added': _drop_duplicate_holders(pd.concat(added, ignore_index=True), key) if added else empty,
+        'removed': previous[~seen].reset_index(drop=True),
+        'changed': _drop_duplicate_holders(pd.concat(changed, ignore_index=True), key) if changed else empty
+    }
+
+
+@instrumented("helpers.diff_holders")
+def diff_holders(previous: pd.DataFrame, current: pd.DataFrame,
+                 key: str = 'wallet_address') -> Dict[str, pd.DataFrame]:
+    """
+    Compare two holder snapshots
+    
+    Args:
+        previous: Previous holders snapshot
+        current: New holders snapshot
+        key: Column identifying a holder (default: 'wallet_address')
+        
+    Returns:
+        Dictionary with added, removed and changed holders (see ``diff_holder_pages``)
+    """
+    if current.empty:
+        return {'added': previous.iloc[0:0], 'removed': previous, 'changed': previous.iloc[0:0]}
+    return diff_holder_pages(previous, [current], key=key)
+
+
+def is_empty_diff(diff: Dict[str, pd.DataFrame]) -> bool:
+    """
+    Check whether a diff contains no changes
+    
+    Args:
+        diff: Diff as returned by ``diff_holders``
+        
+    Returns:
+        True if nothing was added, removed or changed
+    """
+    return all(frame.empty for frame in diff.values())
+
+
+@instrumented("helpers.apply_holder_diff")
+def apply_holder_diff(previous: pd.DataFrame, diff: Dict[str, pd.DataFrame],
+                      key: str = 'wallet_address') -> pd.DataFrame:
+    """
+    Build the new holders snapshot from the previous one and a diff
+    
+    Args:
+        previous: Previous holders snapshot
+        diff: Diff as returned by ``diff_holders``
+        key: Column identifying a holder (default: 'wallet_address')
+        
+    Returns:
+        Updated holders DataFrame sorted by balance (descending); always a new
+        frame, so its ``attrs`` can be set without touching ``previous``
+    """
+    previous = _drop_duplicate_holders(previous, key)
+    if is_empty_diff(diff):
+        # Shares the data, but previous may be a cached snapshot handed to other readers
+        return previous.copy(deep=False)
+    
+    dropped = pd.concat([diff['removed'][key], diff['changed'][key]], ignore_index=True)
+    kept = previous[~previous[key].isin(dropped)]
+    changed = diff['changed'][[col for col in previous.columns if col in diff['changed'].columns]]
+    df = pd.concat([kept, changed, diff['added']], ignore_index=True)
+    
+    order = wei_sort_order(df['balance_hi'].to_numpy(), df['balance_lo'].to_numpy())
+    return df.iloc[order].reset_index(drop=True)
+
+
+@instrumented("helpers.update_holder_metrics")
+def update_holder_metrics(metrics: Dict[str, Any], diff: Dict[str, pd.DataFrame],
+                          decimals: int = 18) -> Dict[str, Any]:
+    """
+    Update metrics from ``calculate_holder_metrics`` with a diff, without rescanning holders
+    
+    Concentration metrics are carried over unchanged; they depend on the full
+    distribution and must be recomputed with ``calculate_concentration_metrics``.
+    
+    Args:
+        metrics: Metrics of the previous snapshot (must include ``total_balance_wei``)
+        diff: Diff between the previous and new snapshots
+        decimals: Number of decimals for the token (default: 18)
+        
+    Returns:
+        New metrics dictionary
+    """
+    added, removed, changed = diff['added'], diff['removed'], diff['changed']
+    
+    def active(frame: pd.DataFrame, col: str = 'has_initiated_transfer') -> int:
+        return int(frame[col].sum()) if col in frame.columns else 0
+    
+    def total(frame: pd.DataFrame, prefix: str = '') -> int:
+        if frame.empty:
+            return 0
+        return wei_sum(frame[f'{prefix}balance_hi'].to_numpy(), frame[f'{prefix}balance_lo'].to_numpy())
+    
+    total_holders = metrics['total_holders'] + len(added) - len(removed)
+    active_holders = (metrics['active_holders'] + active(added) - active(removed)
+                      + active(changed) - active(changed, 'prev_has_initiated_transfer'))
+    total_wei = (metrics['total_balance_wei'] + total(added) - total(removed)
+                 + total(changed) - total(changed, 'prev_'))
+    
+    updated = dict(metrics)
+    updated.update({
+        'total_holders': total_holders,
+        'active_holders': active_holders,
+        'total_balance_wei': total_wei,
+        'total_balance': wei_total_to_token(total_wei, decimals),
+        'average_balance': wei_total_to_token(total_wei, decimals, count=total_holders)
+    })
+    return updated
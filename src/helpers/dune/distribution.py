@@ -0,0 +1,123 @@
+"""
+Holder Distribution Functions
+Concentration metrics computed in one pass over the sorted balance column
+"""
+import numpy as np
+import pandas as pd
+from typing import Dict, Any
+from src.utility.numbers import wei_to_token
+from src.utility.instrumentation import instrumented
+
+# Holder counts used for top-k concentration shares
+TOP_K_SHARES = (1, 10, 100)
+
+# Percentiles reported for the balance distribution
+BALANCE_PERCENTILES = (10, 25, 50, 75, 90, 99)
+
+
+@instrumented("helpers.holder_balances")
+def holder_balances(df: pd.DataFrame, decimals: int = 18) -> np.ndarray:
+    """
+    Extract token balances as a float64 array sorted largest first
+    
+    Holder frames are already sorted by balance, so the sort is skipped when
+    the column is monotonic; it only runs for unsorted input.
+    
+    Args:
+        df: Holders DataFrame with limb-encoded or normalized balances
+        decimals: Number of decimals for the token (default: 18)
+        
+    Returns:
+        Balances in token units, descending
+    """
+    if 'balance_hi' in df.columns and 'balance_lo' in df.columns:
+        balances = wei_to_token(df['balance_hi'].to_numpy(), df['balance_lo'].to_numpy(), decimals)
+    elif 'balance_token' in df.columns:
+        balances = df['balance_token'].to_numpy(dtype=np.float64, na_value=0.0)
+    else:
+        return np.empty(0, dtype=np.float64)
+    
+    if len(balances) > 1 and np.any(balances[1:] > balances[:-1]):
+        balances = np.sort(balances)[::-1]
+    return balances
+
+
+def _log_histogram(ascending: np.ndarray) -> Dict[str, list]:
+    """Bucket sorted balances into powers of ten using binary search on the sorted array"""
+    positive_start = int(np.searchsorted(ascending, 0.0, side='right'))
+    zero_count = positive_start
+    positive = ascending[positive_start:]
+    if len(positive) == 0:
+        return {'edges': [], 'holders': [], 'zero_balance_holders': zero_count}
+    
+    low = int(np.floor(np.log10(positive[0])))
+    high = int(np.floor(np.log10(positive[-1]))) + 1
+    edges = np.power(10.0, np.arange(low, high + 1))
+    positions = np.searchsorted(positive, edges, side='left')
+    counts = np.diff(positions)
+    counts[-1] += len(positive) - positions[-1]
+    return {
+        'edges': edges.tolist(),
+        'holders': counts.tolist(),
+        'zero_balance_holders': zero_count
+    }
+
+
+def _percentiles(ascending: np.ndarray) -> Dict[str, float]:
+    """Linear-interpolated percentiles read directly from the sorted array"""
+    n = len(ascending)
+    result = {}
+    for p in BALANCE_PERCENTILES:
+        position = p / 100 * (n - 1)
+        lower = int(np.floor(position))
+        upper = min(lower + 1, n - 1)
+        fraction = position - lower
+        result[f'p{p}'] = float(ascending[lower] + (ascending[upper] - ascending[lower]) * fraction)
+    return result
+
+
+@instrumented("helpers.calculate_concentration_metrics")
+def calculate_concentration_metrics(balances: np.ndarray) -> Dict[str, Any]:
+    """
+    Calculate holder concentration metrics
+    
+    Everything derives from a single cumulative sum over the descending
+    balances; percentiles and histogram buckets are read from the same
+    sorted array (reversed as a view), so nothing is sorted again.
+    
+    Args:
+        balances: Balances sorted largest first (see ``holder_balances``)
+        
+    Returns:
+        Dictionary with:
+        - gini: Gini coefficient (0 = equal, 1 = one holder owns everything)
+        - hhi: Herfindahl-Hirschman index as a fraction (0-1)
+        - top_1_share / top_10_share / top_100_share: Supply share of the largest holders
+        - nakamoto_coefficient: Smallest number of holders owning more than 50%
+        - balance_percentiles: Balance percentiles (p10 ... p99)
+        - balance_histogram: Holder counts per power-of-ten balance bucket
+    """
+    n = len(balances)
+    total = float(balances.sum()) if n else 0.0
+    if n == 0 or total <= 0:
+        metrics = {'gini': 0.0, 'hhi': 0.0, 'nakamoto_coefficient': 0,
+                   'balance_percentiles': {}, 'balance_histogram': {}}
+        metrics.update({f'top_{k}_share': 0.0 for k in TOP_K_SHARES})
+        return metrics
+    
+    cumulative = np.cumsum(balances)
+    shares = balances / total
+    
+    metrics = {
+        # With balances sorted descending, sum(rank * x) = (n + 1) * total - sum(cumulative)
+        'gini': float((2 * cumulative.sum() / total - (n + 1)) / n),
+        'hhi': float(np.dot(shares, shares)),
+        'nakamoto_coefficient': int(np.searchsorted(cumulative, total / 2, side='right') + 1)
+    }
+    for k in TOP_K_SHARES:
+        metrics[f'top_{k}_share'] = float(cumulative[min(k, n) - 1] / total)
+    
+    ascending = balances[::-1]
+    metrics['balance_percentiles'] = _percentiles(ascending)
+    metrics['balance_histogram'] = _log_histogram(ascending)
+    return metrics
@@ -2,15 +2,23 @@
 Dune Utility Functions
 Helper functions for processing and transforming Dune data
 """
+import numpy as np
 import pandas as pd
 from typing import List, Dict, Any
+from src.utility.numbers import wei_sum, wei_to_token, wei_total_to_token
+from src.utility.instrumentation import instrumented
+from .distribution import holder_balances, calculate_concentration_metrics
 
 
+@instrumented("helpers.normalize_token_balance")
 def normalize_token_balance(df: pd.DataFrame, decimals: int = 18, balance_col: str = 'balance', 
                             output_col: str = 'balance_token') -> pd.DataFrame:
     """
     Normalize token balances from wei to token units
     
+    When the exact limb columns (``{balance_col}_hi``/``{balance_col}_lo``) are
+    present they are used; otherwise ``balance_col`` is divided as a float.
+    
     Args:
         df: DataFrame with balance column
         decimals: Number of decimals for the token (default: 18)
@@ -20,11 +28,17 @@ def normalize_token_balance(df: pd.DataFrame, decimals: int = 18, balance_col: s
     Returns:
         DataFrame with normalized balance column added
     """
-    if not df.empty and balance_col in df.columns:
+    hi_col, lo_col = f"{balance_col}_hi", f"{balance_col}_lo"
+    if df.empty:
+        return df
+    if hi_col in df.columns and lo_col in df.columns:
+        df[output_col] = wei_to_token(df[hi_col].to_numpy(), df[lo_col].to_numpy(), decimals)
+    elif balance_col in df.columns:
         df[output_col] = df[balance_col] / (10**decimals)
     return df
 
 
+@instrumented("helpers.filter_by_token_address")
 def filter_by_token_address(df: pd.DataFrame, token_address: str, 
                             token_col: str = 'token') -> pd.DataFrame:
     """
@@ -43,72 +57,109 @@ def filter_by_token_address(df: pd.DataFrame, token_address: str,
     return df[df[token_col] == token_address]
 
 
-def calculate_holder_metrics(df: pd.DataFrame) -> Dict[str, Any]:
+@instrumented("helpers.calculate_holder_metrics")
+def calculate_holder_metrics(df: pd.DataFrame, decimals: int = 18) -> Dict[str, Any]:
     """
     Calculate metrics for token holders
     
     Args:
         df: DataFrame with holder data
+        decimals: Number of decimals for the token, used with exact limb balances (default: 18)
         
     Returns:
         Dictionary with metrics:
         - total_holders: Total number of holders
         - active_holders: Number of holders who initiated transfers
-        - average_balance: Average token balance (if balance_token column exists)
+        - total_balance_wei: Exact sum of balances in wei (if limb columns exist)
+        - total_balance: Sum of token balances
+        - average_balance: Average token balance
+        - Concentration metrics from ``calculate_concentration_metrics``
+          (gini, hhi, top-k shares, nakamoto_coefficient, percentiles, histogram)
     """
     if df.empty:
-        return {
+        metrics = {
             'total_holders': 0,
             'active_holders': 0,
+            'total_balance': 0.0,
             'average_balance': 0.0
         }
+        metrics.update(calculate_concentration_metrics(np.empty(0)))
+        return metrics
     
     metrics = {
         'total_holders': len(df),
         'active_holders': df['has_initiated_transfer'].sum() if 'has_initiated_transfer' in df.columns else 0
     }
     
-    if 'balance_token' in df.columns:
+    if 'balance_hi' in df.columns and 'balance_lo' in df.columns:
+        total_wei = wei_sum(df['balance_hi'].to_numpy(), df['balance_lo'].to_numpy())
+        metrics['total_balance_wei'] = total_wei
+        metrics['total_balance'] = wei_total_to_token(total_wei, decimals)
+        metrics['average_balance'] = wei_total_to_token(total_wei, decimals, count=len(df))
+    elif 'balance_token' in df.columns:
+        metrics['total_balance'] = df['balance_token'].sum()
         metrics['average_balance'] = df['balance_token'].mean()
     
+    metrics.update(calculate_concentration_metrics(holder_balances(df, decimals)))
     return metrics
 
 
-def create_comparison_dataframe(copm_df: pd.DataFrame, copw_df: pd.DataFrame) -> pd.DataFrame:
+@instrumented("helpers.create_comparison_dataframe")
+def create_comparison_dataframe(holders: Dict[str, pd.DataFrame]) -> pd.DataFrame:
     """
-    Create a comparison DataFrame for COPM vs COPW tokens
+    Create a comparison DataFrame across tokens
+    
+    The per-token frames are stacked into one long-format frame keyed by token
+    and aggregated with a single groupby.
     
     Args:
-        copm_df: DataFrame with COPM holder data
-        copw_df: DataFrame with COPW holder data
+        holders: Dictionary mapping token symbol to its holders DataFrame
         
     Returns:
-        DataFrame with comparison metrics
+        DataFrame with one row per token and comparison metrics
     """
-    copm_metrics = calculate_holder_metrics(copm_df)
-    copw_metrics = calculate_holder_metrics(copw_df)
+    symbols = list(holders)
+    frames = {
+        symbol: df[['has_initiated_transfer']]
+        for symbol, df in holders.items()
+        if not df.empty and 'has_initiated_transfer' in df.columns
+    }
     
+    if frames:
+        long_df = pd.concat(frames, names=['Token', None])
+        grouped = long_df.groupby(level='Token', sort=False)['has_initiated_transfer'].agg(['size', 'sum'])
+    else:
+        grouped = pd.DataFrame(columns=['size', 'sum'])
+    
+    grouped = grouped.reindex(symbols, fill_value=0)
     return pd.DataFrame({
-        "Token": ["COPM", "COPW"],
-        "Total Holders": [copm_metrics['total_holders'], copw_metrics['total_holders']],
-        "Active Holders": [copm_metrics['active_holders'], copw_metrics['active_holders']]
+        "Token": symbols,
+        "Total Holders": grouped['size'].astype(int).to_numpy(),
+        "Active Holders": grouped['sum'].astype(int).to_numpy()
     })
 
 
+@instrumented("helpers.prepare_holder_display_columns")
 def prepare_holder_display_columns(df: pd.DataFrame, 
                                    columns: List[str] = None,
-                                   decimals: int = 6) -> pd.DataFrame:
+                                   decimals: int = 6,
+                                   limit: int = None) -> pd.DataFrame:
     """
     Prepare DataFrame for display with specific columns
     
+    The balance stays numeric; the UI formats it through a column config
+    instead of a per-row string column.
+    
     Args:
         df: DataFrame with holder data
         columns: List of columns to include (default: wallet_address, balance_token, 
                 has_initiated_transfer, first_acquired)
         decimals: Number of decimals for the token (default: 6)
-        
+        limit: Only prepare the first ``limit`` rows, e.g. the top holders or
+               the current page (default: all rows)
+               
     Returns:
-        DataFrame with selected columns and formatted balance
+        DataFrame with selected columns and the balance renamed to ``balance``
     """
     if columns is None:
         # Use balance_token (already normalized) instead of balance (raw)
@@ -117,17 +168,17 @@ def prepare_holder_display_columns(df: pd.DataFrame,
     if df.empty:
         return df
     
-    available_columns = [col for col in columns if col in df.columns]
-    display_df = df[available_columns].copy() if available_columns else df.copy()
+    if limit is not None:
+        df = df.head(limit)
     
-    # Format balance_token column with commas and 2 decimals
-    if 'balance_token' in display_df.columns:
-        display_df['balance_token'] = display_df['balance_token'].apply(
-            lambda x: f"{x:,.2f}" if pd.notna(x) else "0.00"
-        )
+    available_columns = [col for col in columns if col in df.columns] or list(df.columns)
+    data = {col: df[col] for col in available_columns}
+    
+    # Single frame construction from the selected columns, no intermediate copy
+    display_df = pd.DataFrame(data, copy=False)
     
     # Rename for better display
     if 'balance_token' in display_df.columns:
-        display_df.rename(columns={'balance_token': 'balance'}, inplace=True)
+        display_df = display_df.rename(columns={'balance_token': 'balance'})
     
     return display_df
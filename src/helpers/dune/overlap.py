@@ -0,0 +1,381 @@
+"""
+Holder Overlap Functions
+Wallet set operations across tokens on sorted fixed-width address keys
+
+Addresses are decoded once from hex into 20-byte ``S20`` keys and kept sorted
+per token, so intersections, differences and unions are binary searches over
+contiguous arrays instead of pandas merges on string columns.
+"""
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+from typing import Dict, List
+from src.utility.numbers import wei_to_token
+from src.utility.instrumentation import instrumented
+
+ADDRESS_BYTES = 20
+ADDRESS_KEY_DTYPE = np.dtype(f'S{ADDRESS_BYTES}')
+
+_HEX_DIGITS = b'0123456789abcdef'
+
+
+def _hex_pair_table() -> np.ndarray:
+    """Map every little-endian uint16 holding two ASCII hex digits to their byte value (-1 if invalid)"""
+    digits = np.full(256, -1, dtype=np.int16)
+    for value, char in enumerate(_HEX_DIGITS):
+        digits[char] = value
+    for value, char in enumerate(b'ABCDEF', start=10):
+        digits[char] = value
+    high, low = digits[:, None], digits[None, :]
+    pairs = np.where((high >= 0) & (low >= 0), high * 16 + low, -1).astype(np.int16)
+    # The first character is the low byte of the uint16, so index as [second][first]
+    return np.ascontiguousarray(pairs.T).ravel()
+
+
+_HEX_PAIR_TABLE = _hex_pair_table()
+_BYTE_TO_HEX = np.frombuffer(b''.join(b'%02x' % value for value in range(256)), dtype='<u2')
+
+
+@instrumented("helpers.address_keys")
+def address_keys(addresses: pd.Series) -> np.ndarray:
+    """
+    Decode ``0x``-prefixed hex addresses into 20-byte keys
+    
+    Decoding works on the Arrow string buffer two characters at a time
+    through a lookup table, so no Python object is created per address.
+    Keys are case-insensitive, matching how EVM addresses compare.
+    
+    Args:
+        addresses: Series of hex addresses without nulls
+        
+    Returns:
+        ``S20`` array with one key per address, in input order
+        
+    Raises:
+        ValueError: If an address is null or not 20 bytes of hex
+    """
+    strings = pa.array(addresses, type=pa.string(), from_pandas=True)
+    if isinstance(strings, pa.ChunkedArray):
+        strings = strings.combine_chunks()
+    if len(strings) == 0:
+        return np.empty(0, dtype=ADDRESS_KEY_DTYPE)
+    if strings.null_count:
+        raise ValueError("Wallet addresses must not be null")
+    width = 2 + 2 * ADDRESS_BYTES
+    if pc.any(pc.not_equal(pc.binary_length(strings), width)).as_py():
+        raise ValueError(f"Wallet addresses must be {width}-character 0x-prefixed hex strings")
+    
+    offsets = np.frombuffer(strings.buffers()[1], dtype=np.int32)[strings.offset:strings.offset + len(strings) + 1]
+    data = np.frombuffer(strings.buffers()[2], dtype=np.uint8)[offsets[0]:offsets[-1]]
+    chars = data.reshape(-1, width)
+    if not (np.all(chars[:, 0] == ord('0')) and np.all(chars[:, 1] | 0x20 == ord('x'))):
+        raise ValueError("Wallet addresses must start with 0x")
+    
+    decoded = _HEX_PAIR_TABLE[np.ascontiguousarray(chars[:, 2:]).view('<u2')]
+    if decoded.min() < 0:
+        raise ValueError("Wallet addresses must be hexadecimal")
+    return decoded.astype(np.uint8).view(ADDRESS_KEY_DTYPE).ravel()
+
+
+@instrumented("helpers.key_addresses")
+def key_addresses(keys: np.ndarray) -> pd.Series:
+    """
+    Encode 20-byte keys back into lowercase ``0x`` hex addresses
+    
+    Args:
+        keys: ``S20`` address keys
+        
+    Returns:
+        Series of addresses with the compact ``string[pyarrow]`` dtype
+    """
+    n = len(keys)
+    width = 2 + 2 * ADDRESS_BYTES
+    chars = np.empty((n, width), dtype=np.uint8)
+    chars[:, 0], chars[:, 1] = ord('0'), ord('x')
+    raw = np.ascontiguousarray(keys, dtype=ADDRESS_KEY_DTYPE).view(np.uint8).reshape(n, ADDRESS_BYTES)
+    chars[:, 2:] = _BYTE_TO_HEX[raw].view(np.uint8).reshape(n, 2 * ADDRESS_BYTES)
+    offsets = np.arange(0, (n + 1) * width, width, dtype=np.int32)
+    strings = pa.StringArray.from_buffers(n, pa.py_buffer(offsets), pa.py_buffer(chars))
+    return pd.Series(pd.arrays.ArrowStringArray(strings), name='wallet_address')
+
+
+def argsort_keys(keys: np.ndarray) -> np.ndarray:
+    """
+    Argsort address keys
+    
+    Keys are ordered by their first 8 bytes as a big-endian integer, which is
+    several times faster than comparing 20-byte strings; a full string sort
+    only runs when two keys share that prefix.
+    
+    Args:
+        keys: ``S20`` address keys
+        
+    Returns:
+        Indices that sort ``keys`` bytewise
+    """
+    prefix = np.ascontiguousarray(keys).view(np.uint8).reshape(-1, ADDRESS_BYTES)[:, :8].copy().view('>u8').ravel()
+    order = np.argsort(prefix)
+    sorted_prefix = prefix[order]
+    if np.any(sorted_prefix[1:] == sorted_prefix[:-1]):
+        return np.argsort(keys, kind='stable')
+    return order
+
+
+def sorted_contains(sorted_keys: np.ndarray, keys: np.ndarray) -> np.ndarray:
+    """
+    Test which keys are present in a sorted key array
+    
+    Args:
+        sorted_keys: Sorted, unique keys to search
+        keys: Keys to look up
+        
+    Returns:
+        Boolean mask aligned with ``keys``
+    """
+    if len(sorted_keys) == 0 or len(keys) == 0:
+        return np.zeros(len(keys), dtype=bool)
+    positions = np.searchsorted(sorted_keys, keys)
+    np.minimum(positions, len(sorted_keys) - 1, out=positions)
+    return sorted_keys[positions] == keys
+
+
+class AddressIndex:
+    """Sorted wallet keys and balances of each token's holders"""
+    
+    def __init__(self):
+        """Initialize an empty index"""
+        self._keys: Dict[str, np.ndarray] = {}
+        self._balances: Dict[str, np.ndarray] = {}
+    
+    @classmethod
+    @instrumented("helpers.AddressIndex.from_holders")
+    def from_holders(cls, holders: Dict[str, pd.DataFrame],
+                     decimals: Dict[str, int] = None) -> "AddressIndex":
+        """
+        Build an index from holder frames
+        
+        Args:
+            holders: Dictionary mapping token symbol to its holders DataFrame
+            decimals: Decimals per token symbol, used with limb balances (default: 18)
+            
+        Returns:
+            Index with one entry per token
+        """
+        index = cls()
+        for symbol, df in holders.items():
+            index.add(symbol, df, decimals=(decimals or {}).get(symbol, 18))
+        return index
+    
+    @instrumented("helpers.AddressIndex.add")
+    def add(self, symbol: str, df: pd.DataFrame, decimals: int = 18) -> None:
+        """
+        Index a token's holders, replacing any previous entry for the symbol
+        
+        Rows repeating a wallet are merged and their balances added up.
+        
+        Args:
+            symbol: Token symbol
+            df: Holders DataFrame with ``wallet_address`` and limb or normalized balances
+            decimals: Number of decimals for the token (default: 18)
+        """
+        if df.empty or 'wallet_address' not in df.columns:
+            self._keys[symbol] = np.empty(0, dtype=ADDRESS_KEY_DTYPE)
+            self._balances[symbol] = np.empty(0, dtype=np.float64)
+            return
+        
+        keys = address_keys(df['wallet_address'])
+        if 'balance_hi' in df.columns and 'balance_lo' in df.columns:
+            balances = wei_to_token(df['balance_hi'].to_numpy(), df['balance_lo'].to_numpy(), decimals)
+        elif 'balance_token' in df.columns:
+            balances = df['balance_token'].to_numpy(dtype=np.float64, na_value=0.0)
+        else:
+            balances = np.zeros(len(keys), dtype=np.float64)
+        
+        order = argsort_keys(keys)
+        keys, balances = keys[order], balances[order]
+        starts = np.flatnonzero(np.concatenate(([True], keys[1:] != keys[:-1])))
+        if len(starts) < len(keys):
+            keys, balances = keys[starts], np.add.reduceat(balances, starts)
+        self._keys[symbol] = keys
+        self._balances[symbol] = balances
+    
+    @property
+    def symbols(self) -> List[str]:
+        """Indexed token symbols, in insertion order"""
+        return list(self._keys)
+    
+    def keys(self, symbol: str) -> np.ndarray:
+        """
+        Get the sorted wallet keys of a token
+        
+        Args:
+            symbol: Token symbol
+            
+        Returns:
+            Sorted, unique ``S20`` keys
+            
+        Raises:
+            KeyError: If the token is not indexed
+        """
+        return self._keys[symbol]
+    
+    def balances(self, symbol: str, keys: np.ndarray) -> np.ndarray:
+        """
+        Look up a token's balances for a set of wallets
+        
+        Args:
+            symbol: Token symbol
+            keys: Wallet keys
+            
+        Returns:
+            Token balances aligned with ``keys`` (0 for wallets not holding the token)
+        """
+        own = self._keys[symbol]
+        result = np.zeros(len(keys), dtype=np.float64)
+        if len(own) == 0 or len(keys) == 0:
+            return result
+        positions = np.minimum(np.searchsorted(own, keys), len(own) - 1)
+        found = own[positions] == keys
+        result[found] = self._balances[symbol][positions[found]]
+        return result
+    
+    @instrumented("helpers.AddressIndex.intersection")
+    def intersection(self, *symbols: str) -> np.ndarray:
+        """
+        Wallets holding every given token
+        
+        Args:
+            symbols: Token symbols (default: every indexed token)
+            
+        Returns:
+            Sorted wallet keys
+        """
+        sets = sorted((self._keys[s] for s in symbols or self.symbols), key=len)
+        if not sets:
+            return np.empty(0, dtype=ADDRESS_KEY_DTYPE)
+        result = sets[0]
+        for other in sets[1:]:
+            result = result[sorted_contains(other, result)]
+        return result
+    
+    @instrumented("helpers.AddressIndex.union")
+    def union(self, *symbols: str) -> np.ndarray:
+        """
+        Wallets holding at least one of the given tokens
+        
+        Args:
+            symbols: Token symbols (default: every indexed token)
+            
+        Returns:
+            Sorted wallet keys
+        """
+        sets = [self._keys[s] for s in symbols or self.symbols]
+        if not sets:
+            return np.empty(0, dtype=ADDRESS_KEY_DTYPE)
+        result = sets[0]
+        for other in sets[1:]:
+            extra = other[~sorted_contains(result, other)]
+            # Two sorted runs: the stable (merge) sort only has to merge them
+            result = np.sort(np.concatenate((result, extra)), kind='stable')
+        return result
+    
+    @instrumented("helpers.AddressIndex.difference")
+    def difference(self, symbol: str, *others: str) -> np.ndarray:
+        """
+        Wallets holding a token but none of the others
+        
+        Args:
+            symbol: Token symbol
+            others: Tokens to exclude (default: every other indexed token)
+            
+        Returns:
+            Sorted wallet keys
+        """
+        result = self._keys[symbol]
+        for other in others or [s for s in self.symbols if s != symbol]:
+            result = result[~sorted_contains(self._keys[other], result)]
+        return result
+    
+    @instrumented("helpers.AddressIndex.migrations")
+    def migrations(self, previous: "AddressIndex", source: str, target: str) -> np.ndarray:
+        """
+        Wallets that left one token and joined another since an earlier index
+        
+        Args:
+            previous: Index built from earlier snapshots of the same tokens
+            source: Token the wallets stopped holding
+            target: Token the wallets started holding
+            
+        Returns:
+            Sorted keys of wallets that held ``source`` but not ``target`` before,
+            and now hold ``target`` but not ``source``
+        """
+        left = previous._keys[source][~sorted_contains(self._keys[source], previous._keys[source])]
+        left = left[~sorted_contains(previous._keys[target], left)]
+        return left[sorted_contains(self._keys[target], left)]
+    
+    @instrumented("helpers.AddressIndex.overlap_matrix")
+    def overlap_matrix(self) -> pd.DataFrame:
+        """
+        Count the wallets shared by every pair of tokens
+        
+        Returns:
+            Square DataFrame indexed by token symbol; the diagonal holds each token's holder count
+        """
+        symbols = self.symbols
+        counts = np.zeros((len(symbols), len(symbols)), dtype=np.int64)
+        for i, first in enumerate(symbols):
+            counts[i, i] = len(self._keys[first])
+            for j in range(i + 1, len(symbols)):
+                counts[i, j] = counts[j, i] = len(self.intersection(first, symbols[j]))
+        return pd.DataFrame(counts, index=pd.Index(symbols, name='Token'), columns=symbols)
+    
+    @instrumented("helpers.AddressIndex.balance_overlap")
+    def balance_overlap(self, *symbols: str) -> pd.DataFrame:
+        """
+        Measure how much of each token's supply sits in wallets holding all the given tokens
+        
+        Args:
+            symbols: Token symbols (default: every indexed token)
+            
+        Returns:
+            DataFrame with one row per token and columns Token, Shared Holders,
+            Shared Balance and Supply Share (fraction of the token's held supply)
+        """
+        symbols = list(symbols or self.symbols)
+        shared = self.intersection(*symbols)
+        rows = []
+        for symbol in symbols:
+            shared_balance = float(self.balances(symbol, shared).sum())
+            total = float(self._balances[symbol].sum())
+            rows.append({
+                "Token": symbol,
+                "Shared Holders": len(shared),
+                "Shared Balance": shared_balance,
+                "Supply Share": shared_balance / total if total > 0 else 0.0
+            })
+        return pd.DataFrame(rows, columns=["Token", "Shared Holders", "Shared Balance", "Supply Share"])
+    
+    @instrumented("helpers.AddressIndex.shared_holders")
+    def shared_holders(self, *symbols: str, limit: int = None) -> pd.DataFrame:
+        """
+        List the wallets holding every given token with their balance in each
+        
+        Args:
+            symbols: Token symbols (default: every indexed token)
+            limit: Only return the ``limit`` wallets with the largest combined balance (optional)
+            
+        Returns:
+            DataFrame with ``wallet_address`` and one balance column per token,
+            sorted by combined balance, largest first
+        """
+        symbols = list(symbols or self.symbols)
+        shared = self.intersection(*symbols)
+        balances = {symbol: self.balances(symbol, shared) for symbol in symbols}
+        combined = np.sum(list(balances.values()), axis=0) if balances else np.zeros(len(shared))
+        order = np.argsort(-combined, kind='stable')[:limit]
+        
+        df = pd.DataFrame({symbol: values[order] for symbol, values in balances.items()})
+        df.insert(0, 'wallet_address', key_addresses(shared[order]))
+        return df
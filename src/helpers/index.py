@@ -2,18 +2,31 @@
 Dune Utilities Module
 Exports utility functions for working with Dune data
 """
-from .dune import (
-    normalize_token_balance,
-    filter_by_token_address,
-    calculate_holder_metrics,
-    create_comparison_dataframe,
-    prepare_holder_display_columns
-)
+from src.utility.lazy import lazy_exports
 
-__all__ = [
-    'normalize_token_balance',
-    'filter_by_token_address',
-    'calculate_holder_metrics',
-    'create_comparison_dataframe',
-    'prepare_holder_display_columns'
-]
+# Exported name -> module defining it
+_EXPORTS = {
+    'normalize_token_balance': '.dune',
+    'filter_by_token_address': '.dune',
+    'calculate_holder_metrics': '.dune',
+    'create_comparison_dataframe': '.dune',
+    'prepare_holder_display_columns': '.dune',
+    'diff_holders': '.dune',
+    'diff_holder_pages': '.dune',
+    'is_empty_diff': '.dune',
+    'apply_holder_diff': '.dune',
+    'update_holder_metrics': '.dune',
+    'holder_balances': '.dune',
+    'calculate_concentration_metrics': '.dune',
+    'AddressIndex': '.dune',
+    'address_keys': '.dune',
+    'key_addresses': '.dune',
+    'active_wallets': '.dune',
+    'retention_cohorts': '.dune',
+    'wallet_activity': '.dune',
+    'wallet_days': '.dune'
+}
+
+__getattr__, __dir__ = lazy_exports(__package__, _EXPORTS)
+
+__all__ = list(_EXPORTS)
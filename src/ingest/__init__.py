@@ -0,0 +1,2 @@
+"""Ingestion package"""
+from .index import __all__, __getattr__, __dir__
@@ -0,0 +1,30 @@
+"""
+Ingestion entry point
+
+Usage:
+    python -m src.ingest            # poll every DUNE_INGEST_INTERVAL seconds
+    python -m src.ingest --once     # ingest every token once and exit
+"""
+import argparse
+import logging
+from src.config import DUNE_INGEST_INTERVAL, validate_config
+from .worker import IngestionWorker
+
+
+def main() -> None:
+    """Parse arguments and run the ingestion worker"""
+    parser = argparse.ArgumentParser(description="Snapshot Dune token holders and transfers into the local stores")
+    parser.add_argument("--once", action="store_true", help="Ingest every token once and exit")
+    parser.add_argument("--interval", type=float, default=DUNE_INGEST_INTERVAL,
+                        help="Seconds between polls (default: DUNE_INGEST_INTERVAL)")
+    args = parser.parse_args()
+    
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+    validate_config()
+    
+    worker = IngestionWorker(interval=args.interval)
+    worker.run_forever(iterations=1 if args.once else None)
+
+
+if __name__ == "__main__":
+    main()
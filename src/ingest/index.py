@@ -0,0 +1,16 @@
+"""
+Ingestion Module
+Exports the background ingestion worker
+"""
+from src.utility.lazy import lazy_exports
+
+# Exported name -> module defining it
+_EXPORTS = {
+    'IngestionWorker': '.worker',
+    'refresh_token_holders': '.worker',
+    'ingest_token_transfers': '.worker'
+}
+
+__getattr__, __dir__ = lazy_exports(__package__, _EXPORTS)
+
+__all__ = list(_EXPORTS)
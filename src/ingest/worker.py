@@ -0,0 +1,250 @@
+"""
+Ingestion Worker
+Polls the token registry and keeps the local holder snapshot and transfer event stores up to date
+"""
+import logging
+import time
+import pandas as pd
+from datetime import datetime, timedelta, timezone
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, List, Optional
+from src.api import DuneAPI, DuneHttpClient, PRIORITY_BACKGROUND
+from src.config import (
+    DUNE_FETCH_MAX_WORKERS,
+    DUNE_INGEST_INTERVAL,
+    DUNE_TRANSFERS_QUERY_ID,
+    DUNE_TRANSFERS_START,
+    TOKEN_REGISTRY
+)
+from src.helpers.dune import (
+    calculate_holder_metrics,
+    diff_holder_pages,
+    apply_holder_diff,
+    is_empty_diff,
+    update_holder_metrics,
+    holder_balances,
+    calculate_concentration_metrics
+)
+from src.models import Token
+from src.store import HolderSnapshotStore, MetricsStore, TransferEventStore
+
+logger = logging.getLogger(__name__)
+
+# Transfers are backfilled from this long before the first ingestion when
+# DUNE_TRANSFERS_START is not set
+DEFAULT_TRANSFERS_BACKFILL = timedelta(days=90)
+
+# Time span requested per transfers query execution
+TRANSFERS_WINDOW = timedelta(days=7)
+
+# Recent transfers are left for the next poll, so a window is never read
+# while Dune may still be indexing its last blocks
+TRANSFERS_SETTLE_DELAY = timedelta(minutes=30)
+
+
+def refresh_token_holders(api: DuneAPI, store: HolderSnapshotStore, token: Token,
+                          previous: Optional[pd.DataFrame] = None,
+                          metrics_store: Optional[MetricsStore] = None,
+                          ingest_interval: Optional[float] = None) -> pd.DataFrame:
+    """
+    Refresh a token's holders from Dune and persist them as a snapshot
+    
+    When a previous snapshot is available, the new pages are diffed against
+    it and only added, removed or changed holders are applied; holder metrics
+    are updated from the diff and stored in ``df.attrs['holder_metrics']``.
+    Unchanged holder sets are not written again, only marked as checked.
+    
+    Args:
+        api: Dune API wrapper
+        store: Snapshot store to write to
+        token: Token to refresh
+        previous: Previous holders snapshot (defaults to the latest stored one)
+        metrics_store: Time-series store the refreshed metrics are appended to (optional)
+        ingest_interval: Polling interval recorded in the snapshot pointer when
+            called from a worker (optional)
+            
+    Returns:
+        Holders DataFrame
+    """
+    if previous is None:
+        previous = store.load_latest(token.chain_id, token.address)
+    
+    diff = None
+    if 'balance_hi' in previous.columns:
+        pages = api.iter_token_holder_pages(token.chain_id, token.address)
+        diff = diff_holder_pages(previous, pages)
+        df = apply_holder_diff(previous, diff)
+    else:
+        df = api.get_token_holders(token.chain_id, token.address)
+    
+    if diff is not None:
+        previous_metrics = previous.attrs.get('holder_metrics')
+        if previous_metrics is None or previous_metrics['total_holders'] != len(previous):
+            previous_metrics = calculate_holder_metrics(previous, decimals=token.decimals)
+        metrics = update_holder_metrics(previous_metrics, diff, decimals=token.decimals)
+        if not is_empty_diff(diff):
+            # Concentration depends on the whole distribution, so it is recomputed in one pass
+            metrics.update(calculate_concentration_metrics(holder_balances(df, token.decimals)))
+    else:
+        metrics = calculate_holder_metrics(df, decimals=token.decimals)
+    
+    metadata = {'symbol': token.symbol, 'metrics': metrics}
+    if diff is not None and is_empty_diff(diff):
+        store.touch(token.chain_id, token.address, metadata=metadata, ingest_interval=ingest_interval)
+        path = store.latest_path(token.chain_id, token.address)
+    elif not df.empty:
+        path = store.save(df, token.chain_id, token.address, metadata=metadata, ingest_interval=ingest_interval)
+    else:
+        path = None
+    # Identifies the holder set, e.g. for the dashboard's cached address indexes
+    df.attrs['snapshot_path'] = str(path) if path is not None else None
+    
+    if metrics_store is not None:
+        metrics_store.record(token, metrics)
+    
+    df.attrs['holder_metrics'] = metrics
+    return df
+
+
+def ingest_token_transfers(api: DuneAPI, events_store: TransferEventStore, token: Token,
+                           query_id: str = DUNE_TRANSFERS_QUERY_ID, start: datetime = None,
+                           until: datetime = None, window: timedelta = TRANSFERS_WINDOW) -> int:
+    """
+    Append a token's new transfers to the event store, resuming from its cursor
+    
+    Transfers are fetched in windows of ``window``; the cursor advances after
+    every window, so an interrupted backfill restarts from the last stored
+    window instead of from the beginning. The start is written to the cursor
+    before the first window, so every rerun agrees on it.
+    
+    Args:
+        api: Dune API wrapper
+        events_store: Event store to append to
+        token: Token to ingest
+        query_id: Saved transfers query (default: ``DUNE_TRANSFERS_QUERY_ID``)
+        start: Backfill start when nothing is stored yet (default: ``DUNE_TRANSFERS_START``,
+            else UTC midnight ``DEFAULT_TRANSFERS_BACKFILL`` ago)
+        until: Ingest up to this time (default: now minus ``TRANSFERS_SETTLE_DELAY``)
+        window: Time span per query execution (default: ``TRANSFERS_WINDOW``)
+        
+    Returns:
+        Number of transfers appended
+    """
+    now = datetime.now(timezone.utc)
+    since = events_store.ingested_until(token.chain_id, token.address)
+    if since is None:
+        # Saved before the first window, so a rerun resumes from the same start
+        default = (now - DEFAULT_TRANSFERS_BACKFILL).replace(hour=0, minute=0, second=0, microsecond=0)
+        since = events_store.start_cursor(token.chain_id, token.address,
+                                          start or DUNE_TRANSFERS_START or default)
+    until = until or now - TRANSFERS_SETTLE_DELAY
+    
+    appended = 0
+    while since < until:
+        end = min(since + window, until)
+        df = api.get_token_transfers(query_id, token.chain_id, token.address, since, end)
+        appended += events_store.append(df, token.chain_id, token.address, since, end)
+        since = end
+    return appended
+
+
+class IngestionWorker:
+    """Background worker that snapshots every registered token on a schedule"""
+    
+    def __init__(self, tokens: List[Token] = None, api: DuneAPI = None,
+                 store: HolderSnapshotStore = None, interval: float = DUNE_INGEST_INTERVAL,
+                 max_workers: int = DUNE_FETCH_MAX_WORKERS, metrics_store: MetricsStore = None,
+                 events_store: TransferEventStore = None,
+                 transfers_query_id: Optional[str] = DUNE_TRANSFERS_QUERY_ID):
+        """
+        Initialize the ingestion worker
+        
+        Args:
+            tokens: Tokens to ingest (defaults to the configured registry)
+            api: Dune API wrapper (defaults to a wrapper whose requests yield to the dashboard)
+            store: Snapshot store to write to (defaults to the configured directory)
+            interval: Seconds between polls
+            max_workers: Maximum number of tokens fetched concurrently
+            metrics_store: Metrics time-series store (defaults to the configured database)
+            events_store: Transfer event store (defaults to the configured directory)
+            transfers_query_id: Saved transfers query; transfers are not ingested when None
+        """
+        self.tokens: List[Token] = list(TOKEN_REGISTRY if tokens is None else tokens)
+        self.api = api or DuneAPI(DuneHttpClient(priority=PRIORITY_BACKGROUND))
+        self.store = store or HolderSnapshotStore()
+        self.metrics_store = metrics_store or MetricsStore()
+        self.events_store = events_store or TransferEventStore()
+        self.transfers_query_id = transfers_query_id
+        self.interval = interval
+        self.max_workers = max_workers
+        # Last ingested holders per token, reused as the diff base of the next poll
+        self._previous: Dict[Token, pd.DataFrame] = {}
+    
+    def ingest_token(self, token: Token) -> Dict[str, Any]:
+        """
+        Refresh and persist a single token, then append its new transfers
+        
+        A failure while ingesting transfers is logged without discarding the
+        refreshed holders; the next poll resumes from the stored cursor.
+        
+        Args:
+            token: Token to ingest
+            
+        Returns:
+            Metrics of the stored snapshot
+        """
+        df = refresh_token_holders(self.api, self.store, token, previous=self._previous.get(token),
+                                   metrics_store=self.metrics_store, ingest_interval=self.interval)
+        self._previous[token] = df
+        
+        if self.transfers_query_id:
+            try:
+                appended = ingest_token_transfers(self.api, self.events_store, token,
+                                                  query_id=self.transfers_query_id)
+                logger.info("Appended %s transfers of %s", appended, token.symbol)
+            except Exception:
+                logger.exception("Failed to ingest transfers of %s", token.symbol)
+        return df.attrs['holder_metrics']
+    
+    def run_once(self) -> Dict[str, Any]:
+        """
+        Ingest every token once, concurrently
+        
+        A failing token is logged and reported without stopping the others.
+        
+        Returns:
+            Dictionary mapping token symbol to its metrics or the raised exception
+        """
+        if not self.tokens:
+            return {}
+        
+        workers = max(1, min(self.max_workers, len(self.tokens)))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = {token: executor.submit(self.ingest_token, token) for token in self.tokens}
+        
+        results = {}
+        for token, future in futures.items():
+            try:
+                results[token.symbol] = future.result()
+                logger.info("Ingested %s: %s holders", token.symbol,
+                            results[token.symbol]['total_holders'])
+            except Exception as error:
+                results[token.symbol] = error
+                logger.exception("Failed to ingest %s", token.symbol)
+        return results
+    
+    def run_forever(self, iterations: int = None) -> None:
+        """
+        Poll the registry every ``interval`` seconds
+        
+        Args:
+            iterations: Stop after this many polls (default: run until interrupted)
+        """
+        completed = 0
+        while iterations is None or completed < iterations:
+            started = time.monotonic()
+            self.run_once()
+            completed += 1
+            if iterations is not None and completed >= iterations:
+                break
+            time.sleep(max(0.0, self.interval - (time.monotonic() - started)))
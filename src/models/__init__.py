@@ -1 +1,2 @@
-# models package
\ No newline at end of file
+"""Models package"""
+from .index import __all__, __getattr__, __dir__
@@ -0,0 +1,46 @@
+"""
+Holder Schema
+Compact column types enforced on holder DataFrames
+"""
+import pandas as pd
+
+# Column dtypes of a holders DataFrame. Addresses live in one contiguous Arrow
+# buffer instead of one Python object per row; timestamps and flags are native.
+# The trade-off is join cost: hashing or merging string[pyarrow] goes through
+# Arrow string compares, slower than fixed-width keys. Addresses are kept as
+# strings so the frame stays readable and round-trips through Parquet, and hot
+# joins (wallet overlap) run on 20-byte S20 keys that ``address_keys`` decodes
+# once per snapshot and ``AddressIndex`` caches.
+HOLDER_DTYPES = {
+    'wallet_address': pd.StringDtype('pyarrow'),
+    'first_acquired': pd.DatetimeTZDtype('us', 'UTC'),
+    'has_initiated_transfer': 'bool',
+    'balance_hi': 'int64',
+    'balance_lo': 'int64'
+}
+
+
+def apply_holder_schema(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Cast holder columns to ``HOLDER_DTYPES``
+    
+    Columns that already have the right dtype are left untouched, so applying
+    the schema to an already typed frame costs nothing. Columns are replaced
+    in place on the given frame.
+    
+    Args:
+        df: Holders DataFrame
+        
+    Returns:
+        The same DataFrame with compact column types
+    """
+    for col, dtype in HOLDER_DTYPES.items():
+        if col not in df.columns or df[col].dtype == dtype:
+            continue
+        values = df[col]
+        if col == 'first_acquired' and not isinstance(values.dtype, pd.DatetimeTZDtype):
+            values = pd.to_datetime(values, utc=True, format='ISO8601')
+        elif col == 'has_initiated_transfer':
+            values = values.fillna(False)
+        df[col] = values.astype(dtype)
+    return df
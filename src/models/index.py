@@ -0,0 +1,18 @@
+"""
+Models Module
+Exports all domain models
+"""
+from src.utility.lazy import lazy_exports
+
+# Exported name -> module defining it
+_EXPORTS = {
+    'Token': '.token',
+    'HOLDER_DTYPES': '.holders',
+    'apply_holder_schema': '.holders',
+    'TRANSFER_DTYPES': '.transfers',
+    'apply_transfer_schema': '.transfers'
+}
+
+__getattr__, __dir__ = lazy_exports(__package__, _EXPORTS)
+
+__all__ = list(_EXPORTS)
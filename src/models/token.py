@@ -0,0 +1,39 @@
+"""
+Token Model
+Describes a token monitored by the dashboard
+"""
+from dataclasses import dataclass
+from typing import Any, Dict
+
+
+@dataclass(frozen=True)
+class Token:
+    """A token contract on a specific chain"""
+    
+    symbol: str
+    chain_id: int
+    address: str
+    decimals: int = 18
+    
+    @property
+    def key(self) -> tuple:
+        """(chain_id, lowercase address) pair identifying the token"""
+        return (self.chain_id, self.address.lower())
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Token":
+        """
+        Build a token from a configuration entry
+        
+        Args:
+            data: Dictionary with symbol, chain_id, address and optional decimals
+            
+        Returns:
+            Token instance
+        """
+        return cls(
+            symbol=str(data["symbol"]),
+            chain_id=int(data["chain_id"]),
+            address=str(data["address"]),
+            decimals=int(data.get("decimals", 18))
+        )
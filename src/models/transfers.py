@@ -0,0 +1,45 @@
+"""
+Transfer Schema
+Compact column types enforced on token transfer event DataFrames
+"""
+import pandas as pd
+
+# Column dtypes of a transfers DataFrame, one row per transfer event
+TRANSFER_DTYPES = {
+    'block_time': pd.DatetimeTZDtype('us', 'UTC'),
+    'block_number': 'int64',
+    'tx_hash': pd.StringDtype('pyarrow'),
+    'from_address': pd.StringDtype('pyarrow'),
+    'to_address': pd.StringDtype('pyarrow'),
+    'amount': 'float64'
+}
+
+
+def apply_transfer_schema(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Cast transfer columns to ``TRANSFER_DTYPES``
+    
+    Missing columns are added empty, so every frame has the same layout;
+    addresses are lowercased so they compare equal to holder addresses.
+    
+    Args:
+        df: Transfers DataFrame, e.g. the rows of a Dune query
+        
+    Returns:
+        The same DataFrame with compact column types, in ``TRANSFER_DTYPES`` order
+    """
+    for col, dtype in TRANSFER_DTYPES.items():
+        if col not in df.columns:
+            df[col] = pd.Series(index=df.index, dtype=dtype)
+            continue
+        if df[col].dtype == dtype:
+            continue
+        values = df[col]
+        if col == 'block_time' and not isinstance(values.dtype, pd.DatetimeTZDtype):
+            values = pd.to_datetime(values, utc=True, format='ISO8601')
+        elif col in ('from_address', 'to_address'):
+            values = values.astype(dtype).str.lower()
+        elif col == 'amount':
+            values = pd.to_numeric(values, errors='coerce')
+        df[col] = values.astype(dtype)
+    return df[list(TRANSFER_DTYPES)]
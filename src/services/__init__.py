@@ -1,4 +1,2 @@
 """Services package"""
-from .index import DashboardService
-
-__all__ = ['DashboardService']
\ No newline at end of file
+from .index import __all__, __getattr__, __dir__
@@ -0,0 +1,185 @@
+"""
+Snapshot Cache
+Process-wide TTL cache with stale-while-revalidate and single-flight loading
+"""
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+from src.config import DUNE_HOLDERS_CACHE_TTL, DUNE_INGEST_INTERVAL, DUNE_QUERY_CACHE_TTL
+from src.utility.instrumentation import metrics_registry
+
+
+class SnapshotCache:
+    """TTL cache that serves stale values while refreshing them in the background"""
+    
+    def __init__(self, ttl: float = DUNE_HOLDERS_CACHE_TTL, max_refresh_workers: int = 4,
+                 name: str = "snapshot", max_entries: int = None):
+        """
+        Initialize the cache
+        
+        Args:
+            ttl: Seconds an entry is considered fresh
+            max_refresh_workers: Maximum number of concurrent background refreshes
+            name: Label of the cache in the instrumentation metrics
+            max_entries: Keep at most this many entries, dropping the least
+                recently loaded ones (default: unbounded)
+        """
+        self.ttl = ttl
+        self.name = name
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries: Dict[Hashable, Tuple[Any, float]] = {}
+        self._inflight: Dict[Hashable, Future] = {}
+        # Last error of a non-blocking load nobody waited on, raised by the next get
+        self._failures: Dict[Hashable, Exception] = {}
+        self._executor = ThreadPoolExecutor(max_workers=max_refresh_workers,
+                                            thread_name_prefix="snapshot-cache")
+    
+    def get(self, key: Hashable, loader: Callable[[], Any], block: bool = True) -> Any:
+        """
+        Get a value, loading it at most once across concurrent callers
+        
+        - Fresh entry: returned immediately.
+        - Expired entry: the stale value is returned and a background refresh is
+          started, unless one is already running for this key.
+        - Missing entry: the first caller runs ``loader``; concurrent callers for
+          the same key wait on that single in-flight load. With ``block=False``
+          the load runs in the background instead and None is returned.
+          
+        Args:
+            key: Cache key
+            loader: Zero-argument callable producing the value
+            block: Wait for a missing value to load (default: True)
+            
+        Returns:
+            Cached or freshly loaded value, None if it is still loading and
+            ``block`` is False
+            
+        Raises:
+            Exception: Whatever ``loader`` raised, when there is no value to serve;
+                without ``block``, the error of the last background load (once)
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                value, loaded_at = entry
+                stale = time.monotonic() - loaded_at >= self.ttl
+                if stale and key not in self._inflight:
+                    future = Future()
+                    self._inflight[key] = future
+                    self._executor.submit(self._load, key, loader, future)
+                metrics_registry.cache_result(self.name, "stale" if stale else "hit")
+                return value
+            
+            future = self._inflight.get(key)
+            owner = future is None
+            if owner and not block and key in self._failures:
+                raise self._failures.pop(key)
+            if owner:
+                future = Future()
+                self._inflight[key] = future
+                if not block:
+                    self._executor.submit(self._load, key, loader, future, True)
+        
+        metrics_registry.cache_result(self.name, "miss" if owner else "coalesced")
+        if not block:
+            return None
+        if owner:
+            self._load(key, loader, future)
+        return future.result()
+    
+    def _load(self, key: Hashable, loader: Callable[[], Any], future: Future,
+              keep_error: bool = False) -> None:
+        """
+        Run a loader, store its result and resolve the in-flight future
+        
+        Failed background refreshes leave the previous (stale) entry in place.
+        
+        Args:
+            key: Cache key
+            loader: Zero-argument callable producing the value
+            future: Future shared with callers waiting on this key
+            keep_error: Keep a failure for the next ``get``, for loads no caller
+                waits on (default: False)
+        """
+        try:
+            value = loader()
+        except Exception as error:
+            with self._lock:
+                self._inflight.pop(key, None)
+                if keep_error:
+                    self._failures[key] = error
+            future.set_exception(error)
+            return
+        
+        with self._lock:
+            self._store(key, value, time.monotonic())
+            self._failures.pop(key, None)
+            self._inflight.pop(key, None)
+        future.set_result(value)
+    
+    def seed(self, key: Hashable, value: Any, age: float = 0.0) -> None:
+        """
+        Insert a value that was loaded elsewhere, such as a persisted snapshot
+        
+        Args:
+            key: Cache key
+            value: Value to cache
+            age: Seconds since the value was produced, counted against the TTL
+        """
+        with self._lock:
+            if key not in self._entries:
+                self._store(key, value, time.monotonic() - age)
+    
+    def _store(self, key: Hashable, value: Any, loaded_at: float) -> None:
+        """Insert an entry as the most recently loaded one; call with the lock held"""
+        self._entries.pop(key, None)
+        self._entries[key] = (value, loaded_at)
+        if self.max_entries is not None:
+            while len(self._entries) > self.max_entries:
+                del self._entries[next(iter(self._entries))]
+    
+    def peek(self, key: Hashable) -> Optional[Any]:
+        """
+        Return the cached value for a key without loading or refreshing it
+        
+        Args:
+            key: Cache key
+            
+        Returns:
+            Cached value, or None if the key is not cached
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+        return entry[0] if entry is not None else None
+    
+    def invalidate(self, key: Hashable = None) -> None:
+        """
+        Drop one entry, or every entry when no key is given
+        
+        Args:
+            key: Cache key to drop (optional)
+        """
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(key, None)
+
+
+# Shared across DashboardService instances, so Streamlit reruns and concurrent
+# viewers reuse the same snapshots and in-flight requests
+holders_cache = SnapshotCache(name="holders")
+
+# Query execution results keyed by (query_id, params), so an identical query is
+# executed at most once per DUNE_QUERY_CACHE_TTL across reruns and viewers
+query_cache = SnapshotCache(ttl=DUNE_QUERY_CACHE_TTL, name="query")
+
+# Transfer events loaded from the event store, keyed by token; the ingestion
+# worker appends to the store, so they are reloaded once per DUNE_INGEST_INTERVAL
+events_cache = SnapshotCache(ttl=DUNE_INGEST_INTERVAL, name="events")
+
+# Cross-token address indexes keyed by the snapshot versions they were built
+# from, so they only change when a token gets a new snapshot
+index_cache = SnapshotCache(ttl=float("inf"), name="address_index", max_entries=4)
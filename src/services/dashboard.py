@@ -3,78 +3,574 @@ Dashboard Service
 High-level service for dashboard data operations
 """
 import pandas as pd
-from typing import Tuple, Dict, Any
-from src.api import DuneAPI
-from src.config import DUNE_COPM_TOKEN_ADDRESS, DUNE_COPW_TOKEN_ADDRESS
+from datetime import datetime, timedelta, timezone
+from concurrent.futures import ThreadPoolExecutor
+from typing import Tuple, Dict, Any, List, Optional
+from src.api import DuneAPI, query_params_key
+from src.config import (
+    DUNE_FETCH_MAX_WORKERS,
+    DUNE_VOLUME_QUERY_ID,
+    DUNE_INGEST_INTERVAL,
+    DUNE_DATA_SOURCE,
+    TOKEN_REGISTRY
+)
+from src.ingest import refresh_token_holders
+from src.models import Token
+from src.store import HolderSnapshotStore, MetricsStore, TransferEventStore
+from src.utility.instrumentation import instrumented
+from .cache import SnapshotCache, holders_cache, query_cache, events_cache, index_cache
 from src.helpers.dune import (
     normalize_token_balance,
     filter_by_token_address,
     create_comparison_dataframe,
     prepare_holder_display_columns,
-    calculate_holder_metrics
+    calculate_holder_metrics,
+    AddressIndex,
+    active_wallets,
+    retention_cohorts,
+    wallet_activity
 )
 
+# A snapshot is served from the store while it was checked within this many polling intervals
+STORE_FRESHNESS_INTERVALS = 3
+
+# Wallet migrations are measured against the snapshots taken this long ago
+MIGRATION_LOOKBACK = timedelta(days=7)
+
+# Transfer columns needed by the activity aggregations
+ACTIVITY_COLUMNS = ['block_time', 'from_address', 'to_address']
+
 
 class DashboardService:
     """Service class for dashboard data operations"""
     
-    def __init__(self):
-        """Initialize the dashboard service with Dune API"""
-        self.api = DuneAPI()
-        self.decimals = 18  # Blockchain storage uses 18 decimals (wei format)
+    def __init__(self, tokens: List[Token] = None, max_workers: int = DUNE_FETCH_MAX_WORKERS,
+                 cache: SnapshotCache = None, store: HolderSnapshotStore = None,
+                 data_source: str = DUNE_DATA_SOURCE, metrics_store: MetricsStore = None,
+                 events_store: TransferEventStore = None, api: DuneAPI = None):
+        """
+        Initialize the dashboard service with Dune API
+        
+        Args:
+            tokens: Tokens to monitor (defaults to the configured registry)
+            max_workers: Maximum number of tokens fetched concurrently
+            cache: Holder snapshot cache (defaults to the process-wide cache)
+            store: On-disk snapshot store (defaults to the configured directory)
+            data_source: "store", "live" or "auto" (defaults to config)
+            metrics_store: Metrics time-series store (defaults to the configured database)
+            events_store: Transfer event store (defaults to the configured directory)
+            api: Dune API wrapper; pass a shared one so reruns reuse its pooled
+                connections (defaults to a new client)
+        """
+        self.api = api or DuneAPI()
+        self.cache = cache or holders_cache
+        self.store = store or HolderSnapshotStore()
+        self.metrics_store = metrics_store or MetricsStore()
+        self.events_store = events_store or TransferEventStore()
+        self.max_workers = max_workers
+        self.data_source = data_source
+        self.tokens: List[Token] = list(TOKEN_REGISTRY if tokens is None else tokens)
+        # Last fetch error per token symbol, if any
+        self.errors: Dict[str, Exception] = {}
+        # Last volume query error per token symbol, if any
+        self.volume_errors: Dict[str, Exception] = {}
+        # Symbols whose first volume query is still running in the background
+        self.volume_pending: List[str] = []
+    
+    def _store_is_fresh(self, token: Token) -> bool:
+        """
+        Check whether the ingestion worker has verified the token's snapshot recently
+        
+        The polling interval is the one the worker recorded in the pointer;
+        ``DUNE_INGEST_INTERVAL`` is only used for pointers written without one.
+        
+        Args:
+            token: Token to check
+            
+        Returns:
+            True if the latest snapshot was checked within a few polling intervals
+        """
+        pointer = self.store.read_pointer(token.chain_id, token.address)
+        if pointer is None:
+            return False
+        checked_at = datetime.fromisoformat(pointer["checked_at"])
+        age = (datetime.now(timezone.utc) - checked_at).total_seconds()
+        interval = pointer.get("ingest_interval") or DUNE_INGEST_INTERVAL
+        return age < STORE_FRESHNESS_INTERVALS * interval
+    
+    def _load_from_store(self, token: Token) -> pd.DataFrame:
+        """
+        Load the latest stored snapshot of a token with its precomputed metrics
+        
+        The cached frame is reused when the "latest" pointer has not moved.
+        
+        Args:
+            token: Token to load
+            
+        Returns:
+            Holders DataFrame, empty if the token has no snapshot
+        """
+        path = self.store.latest_path(token.chain_id, token.address)
+        if path is None:
+            return pd.DataFrame()
+        
+        cached = self.cache.peek(token.key)
+        if cached is not None and cached.attrs.get('snapshot_path') == str(path):
+            return cached
+        
+        df = self.store.load(path)
+        pointer = self.store.read_pointer(token.chain_id, token.address) or {}
+        metrics = pointer.get('metadata', {}).get('metrics')
+        if metrics is not None:
+            df.attrs['holder_metrics'] = metrics
+        df.attrs['snapshot_path'] = str(path)
+        return df
+    
+    @instrumented("service.load_token_holders")
+    def _load_token_holders(self, token: Token) -> pd.DataFrame:
+        """
+        Cache loader: read from the snapshot store or refresh from Dune
+        
+        - "store": only the snapshot store is read (kept fresh by ``python -m src.ingest``).
+        - "live": holders are refreshed from Dune and persisted.
+        - "auto": the store is read while the worker keeps it fresh, otherwise
+          holders are refreshed from Dune.
+          
+        Args:
+            token: Token to load
+            
+        Returns:
+            Holders DataFrame
+            
+        Raises:
+            LookupError: In "store" mode, if the token has no snapshot yet
+        """
+        live = self.data_source == 'live' or (self.data_source == 'auto' and not self._store_is_fresh(token))
+        if live:
+            try:
+                return refresh_token_holders(self.api, self.store, token, previous=self.cache.peek(token.key),
+                                             metrics_store=self.metrics_store)
+            except Exception:
+                df = self._load_from_store(token)
+                if df.empty:
+                    raise
+                return df
+        
+        df = self._load_from_store(token)
+        if df.empty:
+            raise LookupError(f"No snapshot stored for {token.symbol}; run python -m src.ingest")
+        return df
+    
+    @instrumented("service.get_token_holders")
+    def get_token_holders(self, token: Token) -> pd.DataFrame:
+        """
+        Get holders for a single token through the snapshot cache
+        
+        On a cold start the cache is seeded from the latest persisted snapshot,
+        so the first render does not wait on the network; the snapshot is then
+        refreshed in the background once it is older than the cache TTL.
+        
+        Args:
+            token: Token to fetch
+            
+        Returns:
+            Cached holders DataFrame (shared, must not be modified in place)
+        """
+        if self.cache.peek(token.key) is None:
+            path = self.store.latest_path(token.chain_id, token.address)
+            if path is not None:
+                age = (datetime.now(timezone.utc) - self.store.snapshot_time(path)).total_seconds()
+                self.cache.seed(token.key, self._load_from_store(token), age=age)
+        
+        return self.cache.get(token.key, lambda: self._load_token_holders(token))
+    
+    @instrumented("service.fetch_all_holders")
+    def fetch_all_holders(self) -> Dict[str, pd.DataFrame]:
+        """
+        Fetch holders for every configured token concurrently
+        
+        Each token is fetched in its own worker, so total latency is close to
+        the slowest single token. A token that fails gets an empty DataFrame and
+        its exception is recorded in ``self.errors`` without affecting the others.
+        
+        Returns:
+            Dictionary mapping token symbol to holders DataFrame with normalized balances
+        """
+        self.errors = {}
+        if not self.tokens:
+            return {}
+        
+        workers = max(1, min(self.max_workers, len(self.tokens)))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = {token: executor.submit(self.get_token_holders, token) for token in self.tokens}
+        
+        holders = {}
+        for token, future in futures.items():
+            try:
+                # Shallow copy so normalization does not add columns to the cached frame
+                df = future.result().copy(deep=False)
+            except Exception as error:
+                self.errors[token.symbol] = error
+                df = pd.DataFrame()
+            holders[token.symbol] = normalize_token_balance(df, decimals=token.decimals)
+        
+        return holders
+    
+    @instrumented("service.get_holders_data")
+    def get_holders_data(self) -> Dict[str, pd.DataFrame]:
+        """
+        Get and prepare holders data for every registered token
+        
+        Returns:
+            Dictionary mapping token symbol to holders DataFrame with normalized balances
+        """
+        return self.fetch_all_holders()
+    
+    @instrumented("service.get_token_volume")
+    def get_token_volume(self, token: Token, block: bool = True) -> Optional[pd.DataFrame]:
+        """
+        Get a token's daily transfer volume from the saved volume query
+        
+        Executions are shared through the process-wide query cache, so the
+        same token is queried at most once per cache TTL and stale results are
+        served while they refresh in the background.
+        
+        Args:
+            token: Token to query
+            block: Wait for the first execution when nothing is cached yet; otherwise
+                it is started in the background (default: True)
+                
+        Returns:
+            DataFrame with ``day`` and ``total_volume`` columns sorted by day,
+            empty if ``DUNE_VOLUME_QUERY_ID`` is not configured; None while the
+            first execution is still running and ``block`` is False
+        """
+        if not DUNE_VOLUME_QUERY_ID:
+            return pd.DataFrame(columns=['day', 'total_volume'])
+        
+        params = {'chain_id': token.chain_id, 'token_address': token.address}
+        key = (DUNE_VOLUME_QUERY_ID, query_params_key(params))
+        df = query_cache.get(key, lambda: self.api.run_query(DUNE_VOLUME_QUERY_ID, params=params), block=block)
+        if df is None:
+            return None
+        if df.empty:
+            return pd.DataFrame(columns=['day', 'total_volume'])
+        
+        return pd.DataFrame({
+            'day': pd.to_datetime(df['day'], utc=True),
+            'total_volume': pd.to_numeric(df['total_volume'], errors='coerce')
+        }).sort_values('day', ignore_index=True)
     
-    def get_holders_data(self) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    @instrumented("service.get_volume_data")
+    def get_volume_data(self, block: bool = True) -> Dict[str, pd.DataFrame]:
         """
-        Get and prepare holders data for both tokens
+        Get daily transfer volume for every registered token
         
+        A token whose query fails gets an empty DataFrame and its exception is
+        recorded in ``self.volume_errors``. Without ``block``, tokens that were
+        never queried get an empty DataFrame and are listed in
+        ``self.volume_pending`` while their first execution runs in the background.
+        
+        Args:
+            block: Wait for tokens that are not cached yet (default: True)
+            
         Returns:
-            Tuple of (copm_df, copw_df) with normalized balances
+            Dictionary mapping token symbol to its volume DataFrame
         """
-        df_copm = self.api.get_copm_holders()
-        df_copw = self.api.get_copw_holders()
+        self.volume_errors = {}
+        self.volume_pending = []
+        if not self.tokens:
+            return {}
         
-        df_copm = normalize_token_balance(df_copm, decimals=self.decimals)
-        df_copw = normalize_token_balance(df_copw, decimals=self.decimals)
+        workers = max(1, min(self.max_workers, len(self.tokens)))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = {token: executor.submit(self.get_token_volume, token, block) for token in self.tokens}
         
-        return df_copm, df_copw
+        volumes = {}
+        for token, future in futures.items():
+            try:
+                df = future.result()
+            except Exception as error:
+                self.volume_errors[token.symbol] = error
+                df = None
+            else:
+                if df is None:
+                    self.volume_pending.append(token.symbol)
+            volumes[token.symbol] = pd.DataFrame(columns=['day', 'total_volume']) if df is None else df
+        return volumes
     
-    def get_display_data(self, df: pd.DataFrame) -> pd.DataFrame:
+    @instrumented("service.get_display_data")
+    def get_display_data(self, df: pd.DataFrame, limit: int = None) -> pd.DataFrame:
         """
         Prepare DataFrame for display
         
+        The balance is kept numeric so it can be formatted by the UI column
+        config instead of building a string column.
+        
         Args:
             df: Raw holders DataFrame
+            limit: Only prepare the first ``limit`` rows (default: all rows)
             
         Returns:
-            DataFrame with display columns and formatted balance
+            DataFrame with display columns
         """
-        return prepare_holder_display_columns(df, decimals=self.decimals)
+        return prepare_holder_display_columns(df, limit=limit)
     
-    def get_metrics(self, df_copm: pd.DataFrame, df_copw: pd.DataFrame) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    def _get_token_metrics(self, df: pd.DataFrame, decimals: int = 18) -> Dict[str, Any]:
         """
-        Calculate metrics for both tokens
+        Get holder metrics, reusing the incrementally maintained ones when available
         
         Args:
-            df_copm: COPM holders DataFrame
-            df_copw: COPW holders DataFrame
+            df: Holders DataFrame
+            decimals: Number of decimals for the token (default: 18)
             
         Returns:
-            Tuple of (copm_metrics, copw_metrics)
+            Metrics dictionary
         """
-        copm_metrics = calculate_holder_metrics(df_copm)
-        copw_metrics = calculate_holder_metrics(df_copw)
-        return copm_metrics, copw_metrics
+        metrics = df.attrs.get('holder_metrics')
+        # attrs propagate to slices, so only trust them for the full holder set;
+        # snapshots stored before concentration metrics existed are recomputed
+        if metrics is not None and metrics['total_holders'] == len(df) and 'gini' in metrics:
+            return dict(metrics)
+        return calculate_holder_metrics(df, decimals=decimals)
     
-    def get_comparison_data(self, df_copm: pd.DataFrame, df_copw: pd.DataFrame) -> pd.DataFrame:
+    @instrumented("service.get_holders_page")
+    def get_holders_page(self, df: pd.DataFrame, page: int = 1, page_size: int = 50,
+                         sort_by: str = 'balance_token', ascending: bool = False,
+                         wallet_prefix: str = None) -> Tuple[pd.DataFrame, int]:
         """
-        Get comparison data for both tokens
+        Get a single page of holders for display, filtered and sorted server-side
+        
+        Only the requested window is prepared for display, so the payload sent to
+        the browser stays constant no matter how many holders a token has.
         
         Args:
-            df_copm: COPM holders DataFrame
-            df_copw: COPW holders DataFrame
+            df: Holders DataFrame with normalized balances (sorted by balance, descending)
+            page: 1-based page number (clamped to the available pages)
+            page_size: Number of holders per page (default: 50)
+            sort_by: Column to sort by (default: 'balance_token')
+            ascending: Sort direction (default: False)
+            wallet_prefix: Only include wallets whose address starts with this prefix (optional)
             
         Returns:
-            Comparison DataFrame
+            Tuple of (page_df, total_rows) where total_rows counts the filtered holders
         """
-        return create_comparison_dataframe(df_copm, df_copw)
-
+        if df.empty:
+            return df, 0
+        
+        if wallet_prefix:
+            df = df[df['wallet_address'].str.lower().str.startswith(wallet_prefix.strip().lower())]
+        
+        total_rows = len(df)
+        page_count = max(1, -(-total_rows // page_size))
+        page = min(max(1, page), page_count)
+        start, end = (page - 1) * page_size, page * page_size
+        
+        if sort_by == 'balance_token':
+            # Holders are already sorted by balance, largest first
+            window = df.iloc[start:end] if not ascending else df.iloc[::-1].iloc[start:end]
+        elif sort_by in df.columns and pd.api.types.is_numeric_dtype(df[sort_by]):
+            # Partial selection instead of a full sort for the first pages
+            top = df.nsmallest(end, sort_by) if ascending else df.nlargest(end, sort_by)
+            window = top.iloc[start:end]
+        elif sort_by in df.columns:
+            window = df.sort_values(by=sort_by, ascending=ascending).iloc[start:end]
+        else:
+            window = df.iloc[start:end]
+        
+        return self.get_display_data(window), total_rows
+    
+    @instrumented("service.get_metrics")
+    def get_metrics(self, holders: Dict[str, pd.DataFrame]) -> Dict[str, Dict[str, Any]]:
+        """
+        Calculate metrics for every token
+        
+        Args:
+            holders: Dictionary mapping token symbol to holders DataFrame
+            
+        Returns:
+            Dictionary mapping token symbol to its metrics
+        """
+        decimals = {token.symbol: token.decimals for token in self.tokens}
+        return {
+            symbol: self._get_token_metrics(df, decimals.get(symbol, 18))
+            for symbol, df in holders.items()
+        }
+    
+    @instrumented("service.get_comparison_data")
+    def get_comparison_data(self, holders: Dict[str, pd.DataFrame]) -> pd.DataFrame:
+        """
+        Get comparison data across tokens
+        
+        Args:
+            holders: Dictionary mapping token symbol to holders DataFrame
+            
+        Returns:
+            Comparison DataFrame with one row per token
+        """
+        return create_comparison_dataframe(holders)
+    
+    @instrumented("service.get_address_index")
+    def get_address_index(self, holders: Dict[str, pd.DataFrame]) -> AddressIndex:
+        """
+        Index the wallets of every token for overlap queries
+        
+        The index is cached by the snapshot each frame was loaded from, so
+        reruns reuse it until a token gets a new snapshot. Frames without a
+        known snapshot are indexed on every call.
+        
+        Args:
+            holders: Dictionary mapping token symbol to holders DataFrame
+            
+        Returns:
+            Address index with one entry per token (shared, must not be modified)
+        """
+        decimals = {token.symbol: token.decimals for token in self.tokens}
+        versions = tuple((symbol, df.attrs.get('snapshot_path'), len(df)) for symbol, df in holders.items())
+        if any(path is None and rows for _, path, rows in versions):
+            return AddressIndex.from_holders(holders, decimals=decimals)
+        return index_cache.get(('current', versions), lambda: AddressIndex.from_holders(holders, decimals=decimals))
+    
+    @instrumented("service.get_previous_address_index")
+    def get_previous_address_index(self, lookback: timedelta = MIGRATION_LOOKBACK) -> AddressIndex:
+        """
+        Index the wallets of every token as of an earlier stored snapshot
+        
+        Args:
+            lookback: How far back to look (default: ``MIGRATION_LOOKBACK``)
+            
+        Returns:
+            Address index built from the latest snapshots taken before ``now - lookback``;
+            tokens without such a snapshot are indexed as empty. It is cached by
+            those snapshot paths (shared, must not be modified).
+        """
+        before = datetime.now(timezone.utc) - lookback
+        paths = [self.store.latest_path(token.chain_id, token.address, before=before) for token in self.tokens]
+        
+        def build() -> AddressIndex:
+            index = AddressIndex()
+            for token, path in zip(self.tokens, paths):
+                df = self.store.load(path) if path is not None else pd.DataFrame()
+                index.add(token.symbol, df, decimals=token.decimals)
+            return index
+        
+        key = ('previous', tuple((token.symbol, str(path)) for token, path in zip(self.tokens, paths)))
+        return index_cache.get(key, build)
+    
+    @instrumented("service.get_wallet_migrations")
+    def get_wallet_migrations(self, index: AddressIndex,
+                              lookback: timedelta = MIGRATION_LOOKBACK) -> pd.DataFrame:
+        """
+        Count the wallets that moved from one token to another
+        
+        A wallet migrated from A to B if, compared with the snapshots taken
+        ``lookback`` ago, it stopped holding A and started holding B.
+        
+        Args:
+            index: Address index of the current holders (see ``get_address_index``)
+            lookback: How far back to compare (default: ``MIGRATION_LOOKBACK``)
+            
+        Returns:
+            DataFrame with From, To, Wallets and Balance (current balance in the
+            target token) per token pair, empty when there are no earlier snapshots
+        """
+        previous = self.get_previous_address_index(lookback)
+        rows = []
+        for source in index.symbols:
+            if source not in previous.symbols or len(previous.keys(source)) == 0:
+                continue
+            for target in index.symbols:
+                if target == source or target not in previous.symbols:
+                    continue
+                moved = index.migrations(previous, source, target)
+                rows.append({
+                    "From": source,
+                    "To": target,
+                    "Wallets": len(moved),
+                    "Balance": float(index.balances(target, moved).sum())
+                })
+        return pd.DataFrame(rows, columns=["From", "To", "Wallets", "Balance"])
+    
+    @instrumented("service.get_metric_trends")
+    def get_metric_trends(self, metric: str = 'total_holders', granularity: str = 'daily',
+                          aggregate: str = 'last') -> pd.DataFrame:
+        """
+        Get a metric's history for every token, one column per token symbol
+        
+        Args:
+            metric: Metric to read (see ``SERIES_METRICS``)
+            granularity: 'raw', 'hourly', 'daily' or 'weekly' (default: 'daily')
+            aggregate: Value per bucket: 'last', 'min', 'max' or 'avg' (default: 'last')
+            
+        Returns:
+            DataFrame with a ``timestamp`` column and one column per token
+        """
+        series = []
+        for token in self.tokens:
+            df = self.metrics_store.read_series(token, granularity=granularity,
+                                                aggregate=aggregate, metrics=[metric])
+            series.append(df.set_index('timestamp')[metric].rename(token.symbol))
+        
+        if not series:
+            return pd.DataFrame(columns=['timestamp'])
+        return pd.concat(series, axis=1).sort_index().rename_axis('timestamp').reset_index()
+    
+    @instrumented("service.get_token_transfers")
+    def get_token_transfers(self, token: Token) -> pd.DataFrame:
+        """
+        Get a token's stored transfers through the events cache
+        
+        Transfers are appended by the ingestion worker (``python -m src.ingest``
+        with ``DUNE_TRANSFERS_QUERY_ID`` set); only the columns used by the
+        activity aggregations are read.
+        
+        Args:
+            token: Token to load
+            
+        Returns:
+            Cached transfers DataFrame (shared, must not be modified in place)
+        """
+        return events_cache.get(token.key, lambda: self.events_store.load(
+            token.chain_id, token.address, columns=ACTIVITY_COLUMNS))
+    
+    @instrumented("service.get_active_wallets")
+    def get_active_wallets(self) -> Dict[str, pd.DataFrame]:
+        """
+        Get daily, weekly and monthly active wallets for every registered token
+        
+        Returns:
+            Dictionary mapping token symbol to a DataFrame with ``day``, ``dau``,
+            ``wau`` and ``mau`` columns, empty when no transfers are stored
+        """
+        return {token.symbol: active_wallets(self.get_token_transfers(token)) for token in self.tokens}
+    
+    @instrumented("service.get_retention_cohorts")
+    def get_retention_cohorts(self, token: Token, granularity: str = 'weekly',
+                              periods: int = 8) -> pd.DataFrame:
+        """
+        Get the retention cohorts of a token's wallets
+        
+        Args:
+            token: Token to analyze
+            granularity: Cohort period, 'daily', 'weekly' or 'monthly' (default: 'weekly')
+            periods: Number of periods followed per cohort (default: 8)
+            
+        Returns:
+            DataFrame with one row per cohort (see ``retention_cohorts``)
+        """
+        return retention_cohorts(self.get_token_transfers(token), granularity=granularity, periods=periods)
+    
+    @instrumented("service.get_wallet_activity")
+    def get_wallet_activity(self, token: Token, limit: int = None) -> pd.DataFrame:
+        """
+        Get per-wallet transfer counts and first/last activity of a token
+        
+        Args:
+            token: Token to analyze
+            limit: Only return the ``limit`` most active wallets (default: all)
+            
+        Returns:
+            DataFrame with one row per wallet, most transfers first (see ``wallet_activity``)
+        """
+        activity = wallet_activity(self.get_token_transfers(token))
+        return activity if limit is None else activity.head(limit)
@@ -2,6 +2,13 @@
 Services Module
 Exports all service classes
 """
-from .dashboard import DashboardService
+from src.utility.lazy import lazy_exports
 
-__all__ = ['DashboardService']
+# Exported name -> module defining it
+_EXPORTS = {
+    'DashboardService': '.dashboard'
+}
+
+__getattr__, __dir__ = lazy_exports(__package__, _EXPORTS)
+
+__all__ = list(_EXPORTS)
@@ -0,0 +1,2 @@
+"""Store package"""
+from .index import __all__, __getattr__, __dir__
@@ -0,0 +1,205 @@
+"""
+Transfer Event Store
+Append-only token transfer events as compressed Parquet files partitioned by chain, token and day
+"""
+import os
+import json
+import tempfile
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+from datetime import date, datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+from src.config import DUNE_EVENTS_DIR
+from src.models import TRANSFER_DTYPES, apply_transfer_schema
+
+# Part file names embed the UTC start of the ingestion window that wrote them
+PART_TIME_FORMAT = "%Y%m%dT%H%M%SZ"
+
+# Cursor file kept in each token directory, recording how far ingestion got
+CURSOR_FILE = "cursor.json"
+
+
+class TransferEventStore:
+    """On-disk columnar store for token transfer events"""
+    
+    def __init__(self, root: str = DUNE_EVENTS_DIR, compression: str = "zstd"):
+        """
+        Initialize the event store
+        
+        Layout: ``{root}/chain_id={chain}/token={address}/date={YYYY-MM-DD}/transfers-{window start}.parquet``
+        
+        Args:
+            root: Root directory for events (defaults to config)
+            compression: Parquet compression codec (default: 'zstd')
+        """
+        self.root = Path(root)
+        self.compression = compression
+    
+    def _token_dir(self, chain_id: int, token_address: str) -> Path:
+        """Return the partition directory of a token"""
+        return self.root / f"chain_id={chain_id}" / f"token={token_address.lower()}"
+    
+    def read_cursor(self, chain_id: int, token_address: str) -> Optional[Dict[str, Any]]:
+        """
+        Read the ingestion cursor of a token
+        
+        Args:
+            chain_id: Blockchain chain ID
+            token_address: Token contract address
+            
+        Returns:
+            Cursor dictionary (``until``, ``last_block``, ``rows``), or None before ingestion starts
+        """
+        cursor_path = self._token_dir(chain_id, token_address) / CURSOR_FILE
+        try:
+            return json.loads(cursor_path.read_text())
+        except (FileNotFoundError, ValueError):
+            return None
+    
+    def ingested_until(self, chain_id: int, token_address: str) -> Optional[datetime]:
+        """
+        Get the time up to which a token's transfers are stored
+        
+        Args:
+            chain_id: Blockchain chain ID
+            token_address: Token contract address
+            
+        Returns:
+            End of the last appended window (the ingestion start before the first
+            one), or None before ingestion starts
+        """
+        cursor = self.read_cursor(chain_id, token_address)
+        return datetime.fromisoformat(cursor["until"]) if cursor else None
+    
+    def _write_cursor(self, chain_id: int, token_address: str, cursor: Dict[str, Any]) -> None:
+        """Atomically replace the ingestion cursor of a token"""
+        cursor_path = self._token_dir(chain_id, token_address) / CURSOR_FILE
+        cursor_path.parent.mkdir(parents=True, exist_ok=True)
+        with tempfile.NamedTemporaryFile("w", dir=cursor_path.parent, prefix=f"{CURSOR_FILE}.",
+                                         suffix=".tmp", delete=False) as tmp_file:
+            json.dump(cursor, tmp_file)
+        os.replace(tmp_file.name, cursor_path)
+    
+    def start_cursor(self, chain_id: int, token_address: str, start: datetime) -> datetime:
+        """
+        Record where a token's ingestion starts, unless it already has a cursor
+        
+        Written before the first window is fetched, so a rerun after an
+        interrupted first window resumes from the same start and rewrites the
+        same part files instead of storing their events twice.
+        
+        Args:
+            chain_id: Blockchain chain ID
+            token_address: Token contract address
+            start: First time to ingest
+            
+        Returns:
+            Time up to which the token is stored: ``start`` for a new cursor
+        """
+        until = self.ingested_until(chain_id, token_address)
+        if until is not None:
+            return until
+        start = start.astimezone(timezone.utc)
+        self._write_cursor(chain_id, token_address, {"until": start.isoformat(), "last_block": None, "rows": 0})
+        return start
+    
+    def append(self, df: pd.DataFrame, chain_id: int, token_address: str,
+               start: datetime, end: datetime) -> int:
+        """
+        Store the transfers of an ingestion window and advance the token's cursor to its end
+        
+        Rows are split by UTC day into one part file per day partition. Part
+        names derive from the window start, so re-running a window that was
+        interrupted before its cursor was written overwrites its parts instead
+        of duplicating them. The cursor is written last.
+        
+        Args:
+            df: Transfers DataFrame covering ``[start, end)`` (see ``src.models.TRANSFER_DTYPES``)
+            chain_id: Blockchain chain ID
+            token_address: Token contract address
+            start: Window start, inclusive
+            end: Window end, exclusive
+            
+        Returns:
+            Number of rows written
+        """
+        start = start.astimezone(timezone.utc)
+        df = apply_transfer_schema(df)
+        token_dir = self._token_dir(chain_id, token_address)
+        name = f"transfers-{start.strftime(PART_TIME_FORMAT)}.parquet"
+        
+        if not df.empty:
+            days = df['block_time'].dt.tz_convert(None).to_numpy(dtype='datetime64[ns]').astype('datetime64[D]')
+            order = np.argsort(days, kind='stable')
+            days = days[order]
+            table = pa.Table.from_pandas(df, preserve_index=False).take(pa.array(order))
+            bounds = np.flatnonzero(np.r_[True, days[1:] != days[:-1], True])
+            for lo, hi in zip(bounds[:-1], bounds[1:]):
+                partition = token_dir / f"date={days[lo]}"
+                partition.mkdir(parents=True, exist_ok=True)
+                path = partition / name
+                tmp_path = path.with_suffix(".parquet.tmp")
+                pq.write_table(table.slice(lo, hi - lo), tmp_path, compression=self.compression)
+                os.replace(tmp_path, path)
+        
+        previous = self.read_cursor(chain_id, token_address) or {"last_block": None, "rows": 0}
+        last_block = previous["last_block"]
+        if not df.empty:
+            window_last = int(df['block_number'].max())
+            last_block = window_last if last_block is None else max(last_block, window_last)
+        self._write_cursor(chain_id, token_address, {
+            "until": end.astimezone(timezone.utc).isoformat(),
+            "last_block": last_block,
+            "rows": previous["rows"] + len(df)
+        })
+        return len(df)
+    
+    def list_partitions(self, chain_id: int, token_address: str) -> List[Path]:
+        """
+        List the day partitions of a token, oldest first
+        
+        Args:
+            chain_id: Blockchain chain ID
+            token_address: Token contract address
+            
+        Returns:
+            Sorted list of partition directories
+        """
+        token_dir = self._token_dir(chain_id, token_address)
+        if not token_dir.exists():
+            return []
+        return sorted(token_dir.glob("date=*"))
+    
+    def load(self, chain_id: int, token_address: str, columns: List[str] = None,
+             start: date = None, end: date = None) -> pd.DataFrame:
+        """
+        Load a token's transfers through memory maps, reading only the requested columns and days
+        
+        Args:
+            chain_id: Blockchain chain ID
+            token_address: Token contract address
+            columns: Columns to read (default: all)
+            start: First UTC day to read, inclusive (optional)
+            end: Last UTC day to read, inclusive (optional)
+            
+        Returns:
+            Transfers DataFrame typed with ``src.models.TRANSFER_DTYPES``, in day
+            order, empty if nothing is stored
+        """
+        tables = []
+        for partition in self.list_partitions(chain_id, token_address):
+            day = partition.name[len("date="):]
+            if (start is not None and day < start.isoformat()) or (end is not None and day > end.isoformat()):
+                continue
+            for path in sorted(partition.glob("transfers-*.parquet")):
+                tables.append(pq.read_table(path, columns=columns, memory_map=True))
+        
+        if not tables:
+            df = apply_transfer_schema(pd.DataFrame())
+            return df[columns] if columns else df
+        table = pa.concat_tables(tables)
+        df = table.to_pandas(types_mapper={pa.string(): pd.StringDtype('pyarrow')}.get)
+        return df.astype({col: TRANSFER_DTYPES[col] for col in df.columns if col in TRANSFER_DTYPES})
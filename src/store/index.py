@@ -0,0 +1,16 @@
+"""
+Store Module
+Exports local persistence for Dune data
+"""
+from src.utility.lazy import lazy_exports
+
+# Exported name -> module defining it
+_EXPORTS = {
+    'HolderSnapshotStore': '.snapshots',
+    'MetricsStore': '.metrics',
+    'TransferEventStore': '.events'
+}
+
+__getattr__, __dir__ = lazy_exports(__package__, _EXPORTS)
+
+__all__ = list(_EXPORTS)
@@ -0,0 +1,266 @@
+"""
+Metrics Time-Series Store
+Append-only per-refresh holder metrics with precomputed hourly, daily and weekly rollups
+"""
+import sqlite3
+import pandas as pd
+from contextlib import closing
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List
+from src.config import DUNE_METRICS_DB
+from src.models import Token
+
+# Metrics recorded on every refresh
+SERIES_METRICS = [
+    'total_holders',
+    'active_holders',
+    'total_balance',
+    'gini',
+    'hhi',
+    'top_10_share',
+    'nakamoto_coefficient'
+]
+
+# Rollup bucket widths in milliseconds; weekly buckets start on Monday 00:00 UTC
+ROLLUP_GRANULARITIES = {
+    'hourly': 3_600_000,
+    'daily': 86_400_000,
+    'weekly': 7 * 86_400_000
+}
+
+# 1970-01-01 was a Thursday, so Monday-aligned weeks are offset by four days
+_WEEK_OFFSET_MS = 4 * 86_400_000
+
+# Aggregates available when reading rollups
+ROLLUP_AGGREGATES = ('last', 'min', 'max', 'avg')
+
+# Per-metric columns of a rollup row; count is the number of non-NULL samples
+_ROLLUP_STATS = ('last', 'min', 'max', 'sum', 'count')
+
+
+def bucket_start(timestamp_ms: int, granularity: str) -> int:
+    """
+    Compute the start of the rollup bucket containing a timestamp
+    
+    Args:
+        timestamp_ms: UTC timestamp in milliseconds
+        granularity: One of ``ROLLUP_GRANULARITIES``
+        
+    Returns:
+        Bucket start in milliseconds
+    """
+    width = ROLLUP_GRANULARITIES[granularity]
+    offset = _WEEK_OFFSET_MS if granularity == 'weekly' else 0
+    return timestamp_ms - (timestamp_ms - offset) % width
+
+
+class MetricsStore:
+    """SQLite-backed time series of token holder metrics"""
+    
+    def __init__(self, path: str = DUNE_METRICS_DB):
+        """
+        Initialize the metrics store, creating its tables if needed
+        
+        Raw points are kept in ``metric_points``; ``metric_rollups`` holds one
+        row per token, granularity and bucket with the last, min, max, sum and
+        non-NULL count of every metric, updated in the same transaction as each
+        append.
+        
+        Args:
+            path: SQLite database file (defaults to config)
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._create_tables()
+    
+    def _connect(self) -> sqlite3.Connection:
+        """Open a connection; one per call keeps the store safe to share across threads"""
+        return sqlite3.connect(self.path, timeout=30)
+    
+    def _create_tables(self) -> None:
+        """Create the raw and rollup tables, rebuilding rollups written by an older schema"""
+        point_cols = ", ".join(f"{metric} REAL" for metric in SERIES_METRICS)
+        rollup_cols = ", ".join(
+            f"{metric}_{stat} {'INTEGER NOT NULL' if stat == 'count' else 'REAL'}"
+            for metric in SERIES_METRICS for stat in _ROLLUP_STATS
+        )
+        with closing(self._connect()) as conn, conn:
+            # WAL lets the dashboard read while the ingestion worker appends
+            conn.execute("PRAGMA journal_mode=WAL")
+            existing = {row[1] for row in conn.execute("PRAGMA table_info(metric_rollups)")}
+            outdated = bool(existing) and not set(self._rollup_columns()) <= existing
+            if outdated:
+                # Rollups are derived from metric_points, so they can be dropped and rebuilt
+                conn.execute("DROP TABLE metric_rollups")
+            conn.execute(
+                f"CREATE TABLE IF NOT EXISTS metric_points ("
+                f"chain_id INTEGER NOT NULL, token TEXT NOT NULL, ts INTEGER NOT NULL, {point_cols}, "
+                f"PRIMARY KEY (chain_id, token, ts)) WITHOUT ROWID"
+            )
+            conn.execute(
+                f"CREATE TABLE IF NOT EXISTS metric_rollups ("
+                f"chain_id INTEGER NOT NULL, token TEXT NOT NULL, granularity TEXT NOT NULL, "
+                f"bucket INTEGER NOT NULL, samples INTEGER NOT NULL, last_ts INTEGER NOT NULL, {rollup_cols}, "
+                f"PRIMARY KEY (chain_id, token, granularity, bucket)) WITHOUT ROWID"
+            )
+            if outdated:
+                points = conn.execute("SELECT DISTINCT chain_id, token, ts FROM metric_points").fetchall()
+                buckets = {(chain_id, address, granularity, bucket_start(ts, granularity))
+                           for chain_id, address, ts in points for granularity in ROLLUP_GRANULARITIES}
+                for bucket in buckets:
+                    self._rebuild_rollup(conn, *bucket)
+    
+    @staticmethod
+    def _rollup_columns() -> List[str]:
+        """Names of the per-metric rollup columns"""
+        return [f"{metric}_{stat}" for metric in SERIES_METRICS for stat in _ROLLUP_STATS]
+    
+    def record(self, token: Token, metrics: Dict[str, Any], recorded_at: datetime = None) -> None:
+        """
+        Append a metrics point and fold it into every rollup
+        
+        A new point is folded into the rollups incrementally. A point that
+        replaces one recorded at the same time cannot be (min and max are not
+        reversible), so its buckets are recomputed from ``metric_points``.
+        
+        Args:
+            token: Token the metrics belong to
+            metrics: Metrics as returned by ``calculate_holder_metrics``
+            recorded_at: Time of the refresh (defaults to now, UTC)
+        """
+        recorded_at = (recorded_at or datetime.now(timezone.utc)).astimezone(timezone.utc)
+        ts = int(recorded_at.timestamp() * 1000)
+        chain_id, address = token.key
+        values = [None if metrics.get(metric) is None else float(metrics[metric]) for metric in SERIES_METRICS]
+        
+        point_sql = (
+            f"INTO metric_points (chain_id, token, ts, {', '.join(SERIES_METRICS)}) "
+            f"VALUES ({', '.join('?' * (len(SERIES_METRICS) + 3))})"
+        )
+        
+        rollup_cols = self._rollup_columns()
+        updates = ["samples = samples + 1", "last_ts = max(last_ts, excluded.last_ts)"]
+        for metric in SERIES_METRICS:
+            updates += [
+                f"{metric}_last = CASE WHEN excluded.last_ts >= last_ts "
+                f"THEN excluded.{metric}_last ELSE {metric}_last END",
+                f"{metric}_min = min(ifnull({metric}_min, excluded.{metric}_min), "
+                f"ifnull(excluded.{metric}_min, {metric}_min))",
+                f"{metric}_max = max(ifnull({metric}_max, excluded.{metric}_max), "
+                f"ifnull(excluded.{metric}_max, {metric}_max))",
+                f"{metric}_sum = ifnull({metric}_sum, 0) + ifnull(excluded.{metric}_sum, 0)",
+                f"{metric}_count = {metric}_count + excluded.{metric}_count"
+            ]
+        rollup_sql = (
+            f"INSERT INTO metric_rollups (chain_id, token, granularity, bucket, samples, last_ts, "
+            f"{', '.join(rollup_cols)}) VALUES ({', '.join('?' * (len(rollup_cols) + 6))}) "
+            f"ON CONFLICT (chain_id, token, granularity, bucket) DO UPDATE SET {', '.join(updates)}"
+        )
+        stats = [stat for value in values for stat in (value, value, value, value, int(value is not None))]
+        
+        with closing(self._connect()) as conn, conn:
+            point = [chain_id, address, ts] + values
+            if conn.execute(f"INSERT OR IGNORE {point_sql}", point).rowcount == 0:
+                conn.execute(f"INSERT OR REPLACE {point_sql}", point)
+                for granularity in ROLLUP_GRANULARITIES:
+                    self._rebuild_rollup(conn, chain_id, address, granularity, bucket_start(ts, granularity))
+                return
+            conn.executemany(rollup_sql, [
+                [chain_id, address, granularity, bucket_start(ts, granularity), 1, ts] + stats
+                for granularity in ROLLUP_GRANULARITIES
+            ])
+    
+    def _rebuild_rollup(self, conn: sqlite3.Connection, chain_id: int, address: str,
+                        granularity: str, bucket: int) -> None:
+        """Recompute one rollup row from the raw points of its bucket"""
+        rollup_cols = self._rollup_columns()
+        aggregates = ", ".join(
+            f"min({metric}) AS {metric}_min, max({metric}) AS {metric}_max, sum({metric}) AS {metric}_sum, "
+            f"count({metric}) AS {metric}_count"
+            for metric in SERIES_METRICS
+        )
+        selected = ", ".join(
+            f"latest.{metric}, agg.{metric}_min, agg.{metric}_max, agg.{metric}_sum, agg.{metric}_count"
+            for metric in SERIES_METRICS
+        )
+        conn.execute(
+            f"INSERT OR REPLACE INTO metric_rollups (chain_id, token, granularity, bucket, samples, last_ts, "
+            f"{', '.join(rollup_cols)}) "
+            f"SELECT ?, ?, ?, ?, agg.samples, agg.last_ts, {selected} FROM ("
+            f"SELECT count(*) AS samples, max(ts) AS last_ts, {aggregates} FROM metric_points "
+            f"WHERE chain_id = ? AND token = ? AND ts >= ? AND ts < ?) agg "
+            f"JOIN metric_points latest ON latest.chain_id = ? AND latest.token = ? AND latest.ts = agg.last_ts",
+            [chain_id, address, granularity, bucket, chain_id, address, bucket,
+             bucket + ROLLUP_GRANULARITIES[granularity], chain_id, address]
+        )
+    
+    def read_series(self, token: Token, granularity: str = 'daily', aggregate: str = 'last',
+                    metrics: List[str] = None, start: datetime = None,
+                    end: datetime = None) -> pd.DataFrame:
+        """
+        Read a token's metrics time series
+        
+        Rollups are read directly, so the cost grows with the number of buckets
+        rather than with the number of refreshes. A rollup bucket is included
+        when it overlaps ``[start, end)``, so the bucket containing ``start`` is
+        kept. ``avg`` only counts the points where the metric was recorded.
+        
+        Args:
+            token: Token to read
+            granularity: 'raw' or one of ``ROLLUP_GRANULARITIES`` (default: 'daily')
+            aggregate: Rollup value per bucket, one of ``ROLLUP_AGGREGATES`` (ignored for 'raw')
+            metrics: Metrics to read (default: ``SERIES_METRICS``)
+            start: Only include points (or buckets ending) after this time (optional)
+            end: Only include points (or buckets starting) before this time (optional)
+            
+        Returns:
+            DataFrame with a UTC ``timestamp`` column followed by one column per metric
+            
+        Raises:
+            ValueError: If the granularity, aggregate or a metric is unknown
+        """
+        metrics = metrics or SERIES_METRICS
+        unknown = [metric for metric in metrics if metric not in SERIES_METRICS]
+        if unknown:
+            raise ValueError(f"Unknown metrics: {', '.join(unknown)}")
+        if aggregate not in ROLLUP_AGGREGATES:
+            raise ValueError(f"Unknown aggregate: {aggregate}")
+        
+        chain_id, address = token.key
+        params: List[Any] = [chain_id, address]
+        if granularity == 'raw':
+            time_col = 'ts'
+            columns = [f"{metric} AS {metric}" for metric in metrics]
+            where = "chain_id = ? AND token = ?"
+            table = "metric_points"
+        elif granularity in ROLLUP_GRANULARITIES:
+            time_col = 'bucket'
+            if aggregate == 'avg':
+                columns = [f"{metric}_sum / nullif({metric}_count, 0) AS {metric}" for metric in metrics]
+            else:
+                columns = [f"{metric}_{aggregate} AS {metric}" for metric in metrics]
+            where = "chain_id = ? AND token = ? AND granularity = ?"
+            table = "metric_rollups"
+            params.append(granularity)
+        else:
+            raise ValueError(f"Unknown granularity: {granularity}")
+        
+        if start is not None:
+            start_ms = int(start.timestamp() * 1000)
+            if granularity == 'raw':
+                where += " AND ts >= ?"
+                params.append(start_ms)
+            else:
+                # Keep the bucket containing start: its end is after start
+                where += " AND bucket > ?"
+                params.append(start_ms - ROLLUP_GRANULARITIES[granularity])
+        if end is not None:
+            where += f" AND {time_col} < ?"
+            params.append(int(end.timestamp() * 1000))
+        
+        query = f"SELECT {time_col} AS timestamp, {', '.join(columns)} FROM {table} WHERE {where} ORDER BY {time_col}"
+        with closing(self._connect()) as conn:
+            df = pd.read_sql_query(query, conn, params=params)
+        df['timestamp'] = pd.to_datetime(df['timestamp'], unit='ms', utc=True)
+        return df
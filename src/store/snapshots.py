@@ -0,0 +1,243 @@
+"""
+Holder Snapshot Store
+Persists holder DataFrames as compressed Parquet files partitioned by chain, token and date
+"""
+import os
+import json
+import tempfile
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+from src.config import DUNE_SNAPSHOT_DIR
+from src.models import apply_holder_schema
+
+# Snapshot file names embed their UTC timestamp, so lexical order is chronological
+SNAPSHOT_TIME_FORMAT = "%Y%m%dT%H%M%S%fZ"
+
+# Pointer file kept in each token directory, naming its most recent snapshot
+LATEST_POINTER = "latest.json"
+
+
+def _json_default(value: Any) -> Any:
+    """Serialize NumPy scalars found in metrics dictionaries"""
+    if hasattr(value, "item"):
+        return value.item()
+    return str(value)
+
+
+class HolderSnapshotStore:
+    """On-disk columnar store for token holder snapshots"""
+    
+    def __init__(self, root: str = DUNE_SNAPSHOT_DIR, compression: str = "zstd"):
+        """
+        Initialize the snapshot store
+        
+        Layout: ``{root}/chain_id={chain}/token={address}/date={YYYY-MM-DD}/holders-{timestamp}.parquet``
+        
+        Args:
+            root: Root directory for snapshots (defaults to config)
+            compression: Parquet compression codec (default: 'zstd')
+        """
+        self.root = Path(root)
+        self.compression = compression
+    
+    def _token_dir(self, chain_id: int, token_address: str) -> Path:
+        """Return the partition directory of a token"""
+        return self.root / f"chain_id={chain_id}" / f"token={token_address.lower()}"
+    
+    def save(self, df: pd.DataFrame, chain_id: int, token_address: str,
+             taken_at: datetime = None, metadata: Dict[str, Any] = None,
+             ingest_interval: float = None) -> Path:
+        """
+        Write a holder snapshot and point the token's "latest" pointer at it
+        
+        The file is written to a temporary name and renamed into place, so
+        readers never observe a partially written snapshot.
+        
+        Args:
+            df: Holders DataFrame as returned by ``DuneAPI.get_token_holders``
+            chain_id: Blockchain chain ID
+            token_address: Token contract address
+            taken_at: Snapshot time (defaults to now, UTC)
+            metadata: Extra JSON-serializable data stored in the pointer, e.g. metrics
+            ingest_interval: Polling interval in seconds of the worker writing the
+                snapshot, so readers can tell when it went stale (optional)
+                
+        Returns:
+            Path of the written snapshot
+        """
+        taken_at = (taken_at or datetime.now(timezone.utc)).astimezone(timezone.utc)
+        partition = self._token_dir(chain_id, token_address) / f"date={taken_at:%Y-%m-%d}"
+        partition.mkdir(parents=True, exist_ok=True)
+        
+        path = partition / f"holders-{taken_at.strftime(SNAPSHOT_TIME_FORMAT)}.parquet"
+        tmp_path = path.with_suffix(".parquet.tmp")
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        pq.write_table(table, tmp_path, compression=self.compression)
+        os.replace(tmp_path, path)
+        
+        self._write_pointer(chain_id, token_address, {
+            "path": str(path.relative_to(self._token_dir(chain_id, token_address))),
+            "taken_at": taken_at.isoformat(),
+            "checked_at": taken_at.isoformat(),
+            "ingest_interval": ingest_interval,
+            "metadata": metadata or {}
+        })
+        return path
+    
+    def _write_pointer(self, chain_id: int, token_address: str, pointer: Dict[str, Any]) -> None:
+        """Atomically replace the "latest" pointer of a token"""
+        pointer_path = self._token_dir(chain_id, token_address) / LATEST_POINTER
+        # Unique temporary name, so concurrent writers never rename each other's file
+        with tempfile.NamedTemporaryFile("w", dir=pointer_path.parent, prefix=f"{LATEST_POINTER}.",
+                                         suffix=".tmp", delete=False) as tmp_file:
+            json.dump(pointer, tmp_file, default=_json_default)
+        os.replace(tmp_file.name, pointer_path)
+    
+    def read_pointer(self, chain_id: int, token_address: str) -> Optional[Dict[str, Any]]:
+        """
+        Read the "latest" pointer of a token
+        
+        Args:
+            chain_id: Blockchain chain ID
+            token_address: Token contract address
+            
+        Returns:
+            Pointer dictionary (path, taken_at, checked_at, ingest_interval, metadata),
+            or None if missing
+        """
+        pointer_path = self._token_dir(chain_id, token_address) / LATEST_POINTER
+        try:
+            return json.loads(pointer_path.read_text())
+        except (FileNotFoundError, ValueError):
+            return None
+    
+    def touch(self, chain_id: int, token_address: str, checked_at: datetime = None,
+              metadata: Dict[str, Any] = None, ingest_interval: float = None) -> None:
+        """
+        Record that the latest snapshot was verified as current without rewriting it
+        
+        Args:
+            chain_id: Blockchain chain ID
+            token_address: Token contract address
+            checked_at: Verification time (defaults to now, UTC)
+            metadata: Replacement pointer metadata (optional)
+            ingest_interval: Polling interval in seconds of the verifying worker (optional)
+        """
+        pointer = self.read_pointer(chain_id, token_address)
+        if pointer is None:
+            return
+        pointer["checked_at"] = (checked_at or datetime.now(timezone.utc)).astimezone(timezone.utc).isoformat()
+        if metadata is not None:
+            pointer["metadata"] = metadata
+        if ingest_interval is not None:
+            pointer["ingest_interval"] = ingest_interval
+        self._write_pointer(chain_id, token_address, pointer)
+    
+    def list_snapshots(self, chain_id: int, token_address: str) -> List[Path]:
+        """
+        List every snapshot of a token, oldest first
+        
+        Args:
+            chain_id: Blockchain chain ID
+            token_address: Token contract address
+            
+        Returns:
+            Sorted list of snapshot paths
+        """
+        token_dir = self._token_dir(chain_id, token_address)
+        if not token_dir.exists():
+            return []
+        return sorted(token_dir.glob("date=*/holders-*.parquet"), key=lambda p: p.name)
+    
+    def latest_path(self, chain_id: int, token_address: str,
+                    before: datetime = None) -> Optional[Path]:
+        """
+        Find the most recent snapshot of a token
+        
+        Uses the "latest" pointer when available; otherwise only the newest
+        date partitions are scanned until a match is found.
+        
+        Args:
+            chain_id: Blockchain chain ID
+            token_address: Token contract address
+            before: Only consider snapshots taken at or before this time (optional)
+            
+        Returns:
+            Path of the snapshot, or None if there is none
+        """
+        token_dir = self._token_dir(chain_id, token_address)
+        if not token_dir.exists():
+            return None
+        
+        if before is None:
+            pointer = self.read_pointer(chain_id, token_address)
+            if pointer is not None and (token_dir / pointer["path"]).exists():
+                return token_dir / pointer["path"]
+        
+        cutoff = None
+        if before is not None:
+            before = before.astimezone(timezone.utc)
+            cutoff = f"holders-{before.strftime(SNAPSHOT_TIME_FORMAT)}.parquet"
+        
+        for partition in sorted(token_dir.glob("date=*"), reverse=True):
+            if before is not None and partition.name > f"date={before:%Y-%m-%d}":
+                continue
+            names = sorted((p.name for p in partition.glob("holders-*.parquet")), reverse=True)
+            for name in names:
+                if cutoff is None or name <= cutoff:
+                    return partition / name
+        return None
+    
+    @staticmethod
+    def snapshot_time(path: Path) -> datetime:
+        """
+        Parse the UTC timestamp embedded in a snapshot file name
+        
+        Args:
+            path: Snapshot path
+            
+        Returns:
+            Snapshot time as an aware UTC datetime
+        """
+        stamp = path.name[len("holders-"):-len(".parquet")]
+        return datetime.strptime(stamp, SNAPSHOT_TIME_FORMAT).replace(tzinfo=timezone.utc)
+    
+    @staticmethod
+    def load(path: Path, columns: List[str] = None) -> pd.DataFrame:
+        """
+        Load a snapshot through a memory map, reading only the requested columns
+        
+        Args:
+            path: Snapshot path
+            columns: Columns to read (default: all)
+            
+        Returns:
+            Holders DataFrame typed with ``src.models.HOLDER_DTYPES``
+        """
+        table = pq.read_table(path, columns=columns, memory_map=True)
+        df = table.to_pandas(types_mapper={pa.string(): pd.StringDtype('pyarrow')}.get)
+        # Also upgrades snapshots written before the schema was enforced
+        return apply_holder_schema(df)
+    
+    def load_latest(self, chain_id: int, token_address: str, columns: List[str] = None,
+                    before: datetime = None) -> pd.DataFrame:
+        """
+        Load the most recent snapshot of a token
+        
+        Args:
+            chain_id: Blockchain chain ID
+            token_address: Token contract address
+            columns: Columns to read (default: all)
+            before: Only consider snapshots taken at or before this time (optional)
+            
+        Returns:
+            Holders DataFrame, empty if the token has no snapshot
+        """
+        path = self.latest_path(chain_id, token_address, before=before)
+        if path is None:
+            return pd.DataFrame()
+        return self.load(path, columns=columns)
@@ -1,20 +1,2 @@
 """Utility package"""
-from .index import (
-    create_comparison_bar_chart,
-    create_line_chart,
-    create_token_volume_chart,
-    format_number_with_commas,
-    calculate_percentage_change,
-    safe_division,
-    aggregate_metrics
-)
-
-__all__ = [
-    'create_comparison_bar_chart',
-    'create_line_chart',
-    'create_token_volume_chart',
-    'format_number_with_commas',
-    'calculate_percentage_change',
-    'safe_division',
-    'aggregate_metrics'
-]
\ No newline at end of file
+from .index import __all__, __getattr__, __dir__
@@ -1,12 +1,2 @@
 """Graphs utility package"""
-from .graphs import (
-    create_comparison_bar_chart,
-    create_line_chart,
-    create_token_volume_chart
-)
-
-__all__ = [
-    'create_comparison_bar_chart',
-    'create_line_chart',
-    'create_token_volume_chart'
-]
\ No newline at end of file
+from .index import __all__, __getattr__, __dir__
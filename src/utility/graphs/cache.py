@@ -0,0 +1,182 @@
+"""
+Figure Cache
+Memoizes chart builders on the content of their input frame
+"""
+import functools
+import hashlib
+import inspect
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Hashable, List, Optional
+import pandas as pd
+from plotly.graph_objects import Figure
+from .downsample import downsample_frame
+
+# Number of figures kept per process
+FIGURE_CACHE_SIZE = 64
+
+
+def frame_fingerprint(df: pd.DataFrame) -> Optional[str]:
+    """
+    Hash a frame's content, column names and dtypes
+    
+    Args:
+        df: Input frame of a chart
+        
+    Returns:
+        Hex digest, or None when the frame holds unhashable values
+    """
+    try:
+        rows = pd.util.hash_pandas_object(df, index=True).to_numpy()
+    except TypeError:
+        return None
+    digest = hashlib.sha1(rows.tobytes())
+    digest.update(repr([(str(col), str(dtype)) for col, dtype in df.dtypes.items()]).encode())
+    return digest.hexdigest()
+
+
+@dataclass
+class CachedFigure:
+    """A built figure, the fingerprint of the data it shows and its serialized form"""
+    figure: Figure
+    fingerprint: str
+    _json: Optional[str] = field(default=None, repr=False)
+    
+    @property
+    def json(self) -> str:
+        """Figure JSON, serialized on first use"""
+        if self._json is None:
+            self._json = self.figure.to_json()
+        return self._json
+
+
+class FigureCache:
+    """Thread-safe LRU of figures keyed by builder and non-data arguments"""
+    
+    def __init__(self, max_entries: int = FIGURE_CACHE_SIZE):
+        """
+        Initialize the figure cache
+        
+        Args:
+            max_entries: Number of figures kept; least recently used ones are dropped
+        """
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Hashable, CachedFigure]" = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get(self, key: Hashable, fingerprint: Optional[str], build: Callable[[], Figure],
+            patch: Callable[[Figure], bool]) -> CachedFigure:
+        """
+        Return the figure for ``key``, reusing it when only its data changed
+        
+        - Same fingerprint: the cached figure is returned as is.
+        - New fingerprint: ``patch`` replaces the trace data of a copy of the
+          cached figure, keeping its layout; if it cannot (returns False), the
+          figure is rebuilt. Figures already handed out are never modified.
+          
+        Args:
+            key: Builder and non-data arguments
+            fingerprint: Content hash of the input frame (None disables caching)
+            build: Builds the figure from scratch
+            patch: Updates a figure's traces to the new data
+            
+        Returns:
+            Cached figure entry (shared, must not be modified)
+        """
+        if fingerprint is None:
+            return CachedFigure(figure=build(), fingerprint=None)
+        
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                if entry.fingerprint == fingerprint:
+                    return entry
+        
+        figure = None
+        if entry is not None:
+            figure = Figure(entry.figure)
+            with figure.batch_update():
+                if not patch(figure):
+                    figure = None
+        entry = CachedFigure(figure=figure or build(), fingerprint=fingerprint)
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return entry
+    
+    def clear(self) -> None:
+        """Drop every cached figure"""
+        with self._lock:
+            self._entries.clear()
+
+
+figure_cache = FigureCache()
+
+
+def _patch_traces(figure: Figure, df: pd.DataFrame, x: str, y: Optional[List[str]]) -> bool:
+    """Replace each trace's x/y with the matching frame columns; False if the traces do not line up"""
+    traces = figure.data
+    if y is None:
+        y = [trace.name for trace in traces]
+    if len(traces) != len(y) or x not in df.columns:
+        return False
+    for trace, col in zip(traces, y):
+        if col not in df.columns or (len(y) > 1 and trace.name != col):
+            return False
+    for trace, col in zip(traces, y):
+        trace.x = df[x].to_numpy()
+        trace.y = df[col].to_numpy()
+    return True
+
+
+def memoize_figure(x: str = "x", y: str = "y") -> Callable:
+    """
+    Memoize a ``builder(df, ...) -> Figure`` on its arguments and frame content
+    
+    The decorated builder returns a shared cached figure. When called again
+    with the same arguments but different data, a copy of the cached figure
+    gets the new traces instead of rebuilding it through plotly express.
+    ``builder.json(df, ...)`` returns the cached figure JSON.
+    Builders accepting ``max_points`` are downsampled the same way on patches.
+    
+    Args:
+        x: Name of the builder parameter holding the x column
+        y: Name of the builder parameter holding the y column(s)
+        
+    Returns:
+        Decorator
+    """
+    def decorator(builder: Callable[..., Figure]) -> Callable[..., Figure]:
+        signature = inspect.signature(builder)
+        
+        def cached(df: pd.DataFrame, *args, **kwargs) -> CachedFigure:
+            bound = signature.bind(df, *args, **kwargs)
+            bound.apply_defaults()
+            arguments: Dict[str, Any] = dict(bound.arguments)
+            del arguments[next(iter(signature.parameters))]
+            key = (builder.__module__, builder.__qualname__, repr(sorted(arguments.items())))
+            
+            x_col, y_cols = arguments[x], arguments[y]
+            y_cols = [y_cols] if isinstance(y_cols, str) else y_cols
+            
+            def patch(figure: Figure) -> bool:
+                data = df
+                if arguments.get("max_points"):
+                    data = downsample_frame(df, x_col, y_cols or [t.name for t in figure.data],
+                                            arguments["max_points"])
+                return _patch_traces(figure, data, x_col, y_cols)
+            
+            return figure_cache.get(key, frame_fingerprint(df),
+                                    lambda: builder(df, *args, **kwargs), patch)
+        
+        @functools.wraps(builder)
+        def wrapper(df: pd.DataFrame, *args, **kwargs) -> Figure:
+            return cached(df, *args, **kwargs).figure
+        
+        wrapper.json = lambda df, *args, **kwargs: cached(df, *args, **kwargs).json
+        return wrapper
+    return decorator
@@ -0,0 +1,84 @@
+"""
+Downsampling Functions
+Largest-Triangle-Three-Buckets reduction of long series before plotting
+"""
+import numpy as np
+import pandas as pd
+from typing import List, Union
+
+
+def lttb_indices(x: np.ndarray, y: np.ndarray, threshold: int) -> np.ndarray:
+    """
+    Select the points of a series to keep with Largest-Triangle-Three-Buckets
+    
+    The first and last points are always kept; every bucket in between keeps
+    the point forming the largest triangle with the previously kept point and
+    the average of the next bucket, which preserves peaks and troughs far
+    better than taking every n-th point.
+    
+    Args:
+        x: Sorted x values (numeric)
+        y: y values, without NaN
+        threshold: Maximum number of points to keep
+        
+    Returns:
+        Sorted indices of the kept points
+    """
+    n = len(x)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+    
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    # Bucket boundaries for the n - 2 inner points, plus the last point as its own bucket
+    edges = (np.arange(threshold - 1) * (n - 2) / (threshold - 2)).astype(np.int64) + 1
+    edges[-1] = n - 1
+    sizes = np.diff(np.append(edges, n))
+    next_x = np.add.reduceat(x, edges) / sizes
+    next_y = np.add.reduceat(y, edges) / sizes
+    
+    indices = np.empty(threshold, dtype=np.int64)
+    indices[0], indices[-1] = 0, n - 1
+    selected = 0
+    for bucket in range(threshold - 2):
+        start, end = edges[bucket], edges[bucket + 1]
+        ax, ay = x[selected], y[selected]
+        cx, cy = next_x[bucket + 1], next_y[bucket + 1]
+        area = np.abs((ax - cx) * (y[start:end] - ay) - (ax - x[start:end]) * (cy - ay))
+        selected = start + int(np.argmax(area))
+        indices[bucket + 1] = selected
+    return indices
+
+
+def downsample_frame(df: pd.DataFrame, x: str, y: Union[str, List[str]],
+                     max_points: int) -> pd.DataFrame:
+    """
+    Reduce a frame to at most ``max_points`` rows per plotted column
+    
+    Each ``y`` column is reduced with LTTB on its non-missing values and the
+    frame keeps the union of the selected rows, so every line stays faithful.
+    
+    Args:
+        df: DataFrame sorted by ``x``
+        x: Column name for the x-axis (numeric or datetime)
+        y: Column name, or list of column names, plotted against ``x``
+        max_points: Maximum number of points kept per column
+        
+    Returns:
+        The same frame when it is already small enough, otherwise the selected rows
+    """
+    if max_points is None or len(df) <= max_points:
+        return df
+    
+    values = df[x]
+    if pd.api.types.is_datetime64_any_dtype(values):
+        xs = values.to_numpy(dtype='datetime64[ns]').view(np.int64).astype(np.float64)
+    else:
+        xs = values.to_numpy(dtype=np.float64)
+    
+    keep = np.zeros(len(df), dtype=bool)
+    for col in [y] if isinstance(y, str) else y:
+        ys = df[col].to_numpy(dtype=np.float64, na_value=np.nan)
+        valid = np.flatnonzero(~np.isnan(ys))
+        keep[valid[lttb_indices(xs[valid], ys[valid], max_points)]] = True
+    return df.iloc[np.flatnonzero(keep)]
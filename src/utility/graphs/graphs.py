@@ -5,15 +5,20 @@ Reusable functions for creating charts and visualizations
 import pandas as pd
 import plotly.express as px
 from plotly.graph_objects import Figure
-from typing import Optional
+from typing import Optional, List, Union
+from .cache import memoize_figure
+from .downsample import downsample_frame
 
 
+@memoize_figure()
 def create_comparison_bar_chart(df: pd.DataFrame, x: str = "Token", 
                                 y: list = None, title: str = None,
                                 barmode: str = 'group') -> Figure:
     """
     Create a grouped bar chart for comparing metrics
     
+    Memoized on the frame content, see ``memoize_figure``.
+    
     Args:
         df: DataFrame with comparison data
         x: Column name for x-axis (default: "Token")
@@ -22,7 +27,7 @@ def create_comparison_bar_chart(df: pd.DataFrame, x: str = "Token",
         barmode: Bar mode - 'group' or 'stack' (default: 'group')
         
     Returns:
-        Plotly Figure object
+        Plotly Figure object (shared, must not be modified)
     """
     if y is None:
         y = ["Total Holders", "Active Holders"]
@@ -35,25 +40,33 @@ def create_comparison_bar_chart(df: pd.DataFrame, x: str = "Token",
     return fig
 
 
-def create_line_chart(df: pd.DataFrame, x: str, y: str, title: str = None,
+@memoize_figure()
+def create_line_chart(df: pd.DataFrame, x: str, y: Union[str, List[str]], title: str = None,
                      x_label: str = None, y_label: str = None, 
-                     markers: bool = True) -> Figure:
+                     markers: bool = True, webgl: bool = False,
+                     max_points: int = None) -> Figure:
     """
     Create a line chart for time series data
     
+    Memoized on the frame content, see ``memoize_figure``.
+    
     Args:
         df: DataFrame with time series data
         x: Column name for x-axis
-        y: Column name for y-axis
+        y: Column name for y-axis, or a list of columns to plot one line each
         title: Chart title (optional)
         x_label: Label for x-axis (optional)
         y_label: Label for y-axis (optional)
         markers: Whether to show markers (default: True)
+        webgl: Draw the lines with WebGL (Scattergl) instead of SVG (default: False)
+        max_points: Downsample each line to at most this many points with LTTB (optional)
         
     Returns:
-        Plotly Figure object
+        Plotly Figure object (shared, must not be modified)
     """
-    fig = px.line(df, x=x, y=y, markers=markers, title=title)
+    df = downsample_frame(df, x, y, max_points)
+    fig = px.line(df, x=x, y=y, markers=markers, title=title,
+                  render_mode='webgl' if webgl else 'auto')
     
     if x_label or y_label:
         fig.update_layout(
@@ -65,7 +78,8 @@ def create_line_chart(df: pd.DataFrame, x: str, y: str, title: str = None,
 
 
 def create_token_volume_chart(df: pd.DataFrame, token_name: str,
-                              x_col: str = 'day', y_col: str = 'total_volume') -> Figure:
+                              x_col: str = 'day', y_col: str = 'total_volume',
+                              webgl: bool = False, max_points: int = None) -> Figure:
     """
     Create a volume chart specifically for token transactions
     
@@ -74,9 +88,11 @@ def create_token_volume_chart(df: pd.DataFrame, token_name: str,
         token_name: Name of the token for the title
         x_col: Column name for date/time (default: 'day')
         y_col: Column name for volume (default: 'total_volume')
+        webgl: Draw the line with WebGL (default: False)
+        max_points: Downsample to at most this many points (optional)
         
     Returns:
-        Plotly Figure object
+        Plotly Figure object (shared, must not be modified)
     """
     return create_line_chart(
         df=df,
@@ -85,5 +101,7 @@ def create_token_volume_chart(df: pd.DataFrame, token_name: str,
         title=f"{token_name} - Volumen diario de transacciones",
         x_label="Día",
         y_label="Volumen (tokens)",
-        markers=True
+        markers=True,
+        webgl=webgl,
+        max_points=max_points
     )
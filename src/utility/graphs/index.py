@@ -2,14 +2,20 @@
 Graphs Utility Module
 Exports graph/chart utility functions
 """
-from .graphs import (
-    create_comparison_bar_chart,
-    create_line_chart,
-    create_token_volume_chart
-)
+from src.utility.lazy import lazy_exports
 
-__all__ = [
-    'create_comparison_bar_chart',
-    'create_line_chart',
-    'create_token_volume_chart'
-]
+# Exported name -> module defining it
+_EXPORTS = {
+    'create_comparison_bar_chart': '.graphs',
+    'create_line_chart': '.graphs',
+    'create_token_volume_chart': '.graphs',
+    'memoize_figure': '.cache',
+    'figure_cache': '.cache',
+    'frame_fingerprint': '.cache',
+    'lttb_indices': '.downsample',
+    'downsample_frame': '.downsample'
+}
+
+__getattr__, __dir__ = lazy_exports(__package__, _EXPORTS)
+
+__all__ = list(_EXPORTS)
@@ -1,27 +1,34 @@
 """
 Utility Module
-Exports all utility functions for graphs and numbers
+Exports all utility functions for graphs, numbers and instrumentation
 """
-from .graphs import (
-    create_comparison_bar_chart,
-    create_line_chart,
-    create_token_volume_chart
-)
-from .numbers import (
-    format_number_with_commas,
-    calculate_percentage_change,
-    safe_division,
-    aggregate_metrics
-)
+from src.utility.lazy import lazy_exports
 
-__all__ = [
-    # Graph utilities
-    'create_comparison_bar_chart',
-    'create_line_chart',
-    'create_token_volume_chart',
-    # Number utilities
-    'format_number_with_commas',
-    'calculate_percentage_change',
-    'safe_division',
-    'aggregate_metrics'
-]
+# Exported name -> module defining it
+_EXPORTS = {
+    'create_comparison_bar_chart': '.graphs',
+    'create_line_chart': '.graphs',
+    'create_token_volume_chart': '.graphs',
+    'memoize_figure': '.graphs',
+    'figure_cache': '.graphs',
+    'frame_fingerprint': '.graphs',
+    'lttb_indices': '.graphs',
+    'downsample_frame': '.graphs',
+    'format_number_with_commas': '.numbers',
+    'calculate_percentage_change': '.numbers',
+    'safe_division': '.numbers',
+    'aggregate_metrics': '.numbers',
+    'split_wei': '.numbers',
+    'wei_sum': '.numbers',
+    'wei_to_token': '.numbers',
+    'wei_total_to_token': '.numbers',
+    'wei_sort_order': '.numbers',
+    'MetricsRegistry': '.instrumentation',
+    'metrics_registry': '.instrumentation',
+    'instrumented': '.instrumentation',
+    'count_rows': '.instrumentation'
+}
+
+__getattr__, __dir__ = lazy_exports(__package__, _EXPORTS)
+
+__all__ = list(_EXPORTS)
@@ -0,0 +1,19 @@
+"""
+Instrumentation Utilities Module
+Exports the metrics registry and the instrumentation decorators
+"""
+from src.utility.lazy import lazy_exports
+
+# Exported name -> module defining it
+_EXPORTS = {
+    'MetricsRegistry': '.registry',
+    'Histogram': '.registry',
+    'Timer': '.registry',
+    'metrics_registry': '.registry',
+    'instrumented': '.instrument',
+    'count_rows': '.instrument'
+}
+
+__getattr__, __dir__ = lazy_exports(__package__, _EXPORTS)
+
+__all__ = list(_EXPORTS)
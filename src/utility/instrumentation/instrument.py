@@ -0,0 +1,106 @@
+"""
+Instrumentation Decorators
+Records wall time, row counts and errors of functions into the metrics registry
+"""
+import functools
+import inspect
+import time
+from typing import Any, Callable, Iterator, Optional
+from .registry import MetricsRegistry, metrics_registry
+
+
+def count_rows(result: Any) -> Optional[int]:
+    """
+    Count the rows of a function result
+    
+    Frames, series and arrays count their first dimension, lists their
+    length; tuples count their first element (e.g. ``(page_df, total)``) and
+    dictionaries the sum of their frame values (e.g. holders per symbol).
+    
+    Args:
+        result: Value returned or yielded by an instrumented function
+        
+    Returns:
+        Row count, or None when the result has no rows
+    """
+    shape = getattr(result, "shape", None)
+    if shape:
+        return shape[0]
+    if isinstance(result, list):
+        return len(result)
+    if isinstance(result, tuple) and result:
+        return count_rows(result[0])
+    if isinstance(result, dict):
+        counts = [value.shape[0] for value in result.values() if getattr(value, "shape", None)]
+        return sum(counts) if counts else None
+    return None
+
+
+def _timed_iter(registry: MetricsRegistry, operation: str, iterator: Iterator,
+                rows: Optional[Callable[[Any], Optional[int]]]) -> Iterator:
+    """Yield from ``iterator``, timing only the time spent producing items"""
+    elapsed, total, error = 0.0, None, False
+    try:
+        while True:
+            start = time.perf_counter()
+            try:
+                item = next(iterator)
+            except StopIteration:
+                return
+            except BaseException:
+                error = True
+                raise
+            finally:
+                elapsed += time.perf_counter() - start
+            count = rows(item) if rows else None
+            if count is not None:
+                total = (total or 0) + count
+            yield item
+    finally:
+        registry.record(operation, elapsed, rows=total, error=error)
+
+
+def instrumented(operation: str, rows: Optional[Callable[[Any], Optional[int]]] = count_rows,
+                 registry: MetricsRegistry = None) -> Callable:
+    """
+    Record every call of the decorated function under an ``operation`` label
+    
+    While the registry is disabled the wrapper only checks a flag before
+    calling through. Generator functions are timed while producing items
+    (not while the caller consumes them) and their rows are summed over the
+    yielded items.
+    
+    Args:
+        operation: Name of the operation, e.g. ``"api.get_token_holders"``
+        rows: Counts the rows of the result, None to skip (default: ``count_rows``)
+        registry: Registry receiving the observations (default: ``metrics_registry``)
+        
+    Returns:
+        Decorator
+    """
+    registry = registry or metrics_registry
+    
+    def decorator(func: Callable) -> Callable:
+        if inspect.isgeneratorfunction(func):
+            @functools.wraps(func)
+            def generator_wrapper(*args, **kwargs):
+                if not registry.enabled:
+                    return func(*args, **kwargs)
+                return _timed_iter(registry, operation, func(*args, **kwargs), rows)
+            return generator_wrapper
+        
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not registry.enabled:
+                return func(*args, **kwargs)
+            start = time.perf_counter()
+            try:
+                result = func(*args, **kwargs)
+            except BaseException:
+                registry.record(operation, time.perf_counter() - start, error=True)
+                raise
+            elapsed = time.perf_counter() - start
+            registry.record(operation, elapsed, rows=rows(result) if rows else None)
+            return result
+        return wrapper
+    return decorator
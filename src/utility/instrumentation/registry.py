@@ -0,0 +1,373 @@
+"""
+Metrics Registry
+In-process counters and histograms, exportable as Prometheus text or JSON
+"""
+import json
+import threading
+import time
+from bisect import bisect_left
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from src.config import DUNE_INSTRUMENTATION
+
+# Upper bounds of the histogram buckets of each metric
+HISTOGRAM_BUCKETS: Dict[str, Tuple[float, ...]] = {
+    "duration_seconds": (0.0001, 0.0005, 0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60),
+    "rows": (1, 10, 100, 1_000, 10_000, 100_000, 1_000_000),
+    "response_bytes": (1_000, 10_000, 100_000, 1_000_000, 10_000_000, 100_000_000)
+}
+
+# Prometheus HELP text of the recorded metrics
+METRIC_HELP = {
+    "duration_seconds": "Wall time of instrumented operations",
+    "rows": "Rows returned by instrumented operations",
+    "response_bytes": "Decompressed size of downloaded response bodies",
+    "errors_total": "Instrumented operations that raised",
+    "cache_requests_total": "Cache lookups by cache and result (hit, miss, stale, coalesced)"
+}
+
+# Sorted (label, value) pairs identifying a series
+Labels = Tuple[Tuple[str, str], ...]
+
+
+class Histogram:
+    """Fixed-bucket histogram of observed values"""
+    
+    __slots__ = ("bounds", "counts", "count", "sum")
+    
+    def __init__(self, bounds: Sequence[float]):
+        """
+        Initialize an empty histogram
+        
+        Args:
+            bounds: Sorted upper bounds of the buckets; larger values go to an overflow bucket
+        """
+        self.bounds = tuple(bounds)
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.count = 0
+        self.sum = 0.0
+    
+    def observe(self, value: float) -> None:
+        """Add a value to its bucket"""
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.sum += value
+    
+    def copy(self) -> "Histogram":
+        """Independent snapshot of the histogram"""
+        snapshot = Histogram.__new__(Histogram)
+        snapshot.bounds = self.bounds
+        snapshot.counts = self.counts.copy()
+        snapshot.count = self.count
+        snapshot.sum = self.sum
+        return snapshot
+    
+    def quantile(self, q: float) -> Optional[float]:
+        """
+        Estimate a quantile by interpolating inside its bucket, like Prometheus' ``histogram_quantile``
+        
+        Args:
+            q: Quantile between 0 and 1
+            
+        Returns:
+            Estimated value, None when nothing was observed; values in the
+            overflow bucket are reported as the largest bound
+        """
+        if self.count == 0:
+            return None
+        rank = q * self.count
+        seen = 0
+        for i, count in enumerate(self.counts):
+            if seen + count >= rank and count:
+                if i == len(self.bounds):
+                    return self.bounds[-1]
+                lower = self.bounds[i - 1] if i else 0.0
+                return lower + (self.bounds[i] - lower) * (rank - seen) / count
+            seen += count
+        return self.bounds[-1]
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Buckets (cumulative, keyed by upper bound), count and sum"""
+        buckets, cumulative = {}, 0
+        for bound, count in zip(self.bounds + (float("inf"),), self.counts):
+            cumulative += count
+            buckets["+Inf" if bound == float("inf") else f"{bound:g}"] = cumulative
+        return {"buckets": buckets, "count": self.count, "sum": self.sum}
+
+
+def _escape(value: str) -> str:
+    """Escape a Prometheus label value"""
+    return value.replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+
+def _format_labels(labels: Labels, extra: Tuple[str, str] = None) -> str:
+    """Render labels as ``{name="value",...}``, or nothing when there are none"""
+    pairs = labels + (extra,) if extra else labels
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in pairs) + "}"
+
+
+class Timer:
+    """Context manager recording the wall time of an operation, with optional rows and errors"""
+    
+    __slots__ = ("registry", "operation", "rows", "_start")
+    
+    def __init__(self, registry: "MetricsRegistry", operation: str):
+        """
+        Initialize the timer
+        
+        Args:
+            registry: Registry receiving the observations
+            operation: Value of the ``operation`` label
+        """
+        self.registry = registry
+        self.operation = operation
+        # Set inside the block to record a row count
+        self.rows: Optional[int] = None
+    
+    def __enter__(self) -> "Timer":
+        self._start = time.perf_counter()
+        return self
+    
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.registry.record(self.operation, time.perf_counter() - self._start,
+                             rows=self.rows, error=exc_type is not None)
+
+
+class _NullTimer:
+    """Timer returned while the registry is disabled; records nothing"""
+    
+    __slots__ = ()
+    
+    def __enter__(self) -> "_NullTimer":
+        return self
+    
+    def __exit__(self, exc_type, exc, tb) -> None:
+        pass
+    
+    def __setattr__(self, name: str, value: Any) -> None:
+        pass
+
+
+_NULL_TIMER = _NullTimer()
+
+
+class MetricsRegistry:
+    """Thread-safe store of counters and histograms keyed by metric name and labels"""
+    
+    def __init__(self, enabled: bool = False, namespace: str = "dashboard"):
+        """
+        Initialize the registry
+        
+        Every recording method returns immediately while ``enabled`` is False,
+        so instrumented code only pays an attribute check.
+        
+        Args:
+            enabled: Whether observations are recorded (process-wide)
+            namespace: Prefix of the exported Prometheus metric names
+        """
+        self.enabled = enabled
+        self.namespace = namespace
+        self._lock = threading.Lock()
+        self._histograms: Dict[Tuple[str, Labels], Histogram] = {}
+        self._counters: Dict[Tuple[str, Labels], float] = {}
+    
+    def observe(self, name: str, value: float, **labels: str) -> None:
+        """
+        Add a value to a histogram
+        
+        Args:
+            name: Metric name (its buckets come from ``HISTOGRAM_BUCKETS``)
+            value: Observed value
+            **labels: Labels of the series
+        """
+        if not self.enabled:
+            return
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = Histogram(HISTOGRAM_BUCKETS[name])
+            histogram.observe(value)
+    
+    def increment(self, name: str, amount: float = 1, **labels: str) -> None:
+        """
+        Add to a counter
+        
+        Args:
+            name: Metric name, ending in ``_total`` by convention
+            amount: Increment (default: 1)
+            **labels: Labels of the series
+        """
+        if not self.enabled:
+            return
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + amount
+    
+    def record(self, operation: str, seconds: float, rows: Optional[int] = None,
+               error: bool = False) -> None:
+        """
+        Record one run of an operation
+        
+        Args:
+            operation: Value of the ``operation`` label
+            seconds: Wall time of the run
+            rows: Rows it returned (optional)
+            error: Whether it raised
+        """
+        if not self.enabled:
+            return
+        self.observe("duration_seconds", seconds, operation=operation)
+        if rows is not None:
+            self.observe("rows", rows, operation=operation)
+        if error:
+            self.increment("errors_total", operation=operation)
+    
+    def cache_result(self, cache: str, result: str) -> None:
+        """
+        Count a cache lookup
+        
+        Args:
+            cache: Name of the cache
+            result: "hit", "miss", "stale" or "coalesced"
+        """
+        self.increment("cache_requests_total", cache=cache, result=result)
+    
+    def timer(self, operation: str) -> Timer:
+        """
+        Time a block: ``with registry.timer("op") as timer: ...; timer.rows = n``
+        
+        Args:
+            operation: Value of the ``operation`` label
+            
+        Returns:
+            Context manager, a no-op one while the registry is disabled
+        """
+        if not self.enabled:
+            return _NULL_TIMER
+        return Timer(self, operation)
+    
+    def reset(self) -> None:
+        """Drop every recorded series"""
+        with self._lock:
+            self._histograms.clear()
+            self._counters.clear()
+    
+    def _series(self) -> Tuple[Dict[Tuple[str, Labels], Histogram], Dict[Tuple[str, Labels], float]]:
+        """
+        Consistent copy of the histograms and counters
+        
+        Only the copy happens under the lock; summaries and exports are
+        computed from it afterwards, so they never block recording threads.
+        """
+        with self._lock:
+            histograms = {key: histogram.copy() for key, histogram in self._histograms.items()}
+            counters = dict(self._counters)
+        return histograms, counters
+    
+    def operations(self) -> List[Dict[str, Any]]:
+        """
+        Summarize each instrumented operation, slowest total first
+        
+        Returns:
+            One dictionary per operation with calls, errors, total and mean
+            seconds, estimated p50/p95 seconds, rows and bytes
+        """
+        histograms, counters = self._series()
+        durations = {dict(labels)["operation"]: histogram
+                     for (name, labels), histogram in histograms.items()
+                     if name == "duration_seconds"}
+        summary = []
+        for operation, histogram in durations.items():
+            labels = (("operation", operation),)
+            rows = histograms.get(("rows", labels))
+            size = histograms.get(("response_bytes", labels))
+            summary.append({
+                "operation": operation,
+                "calls": histogram.count,
+                "errors": int(counters.get(("errors_total", labels), 0)),
+                "total_seconds": histogram.sum,
+                "mean_seconds": histogram.sum / histogram.count,
+                "p50_seconds": histogram.quantile(0.5),
+                "p95_seconds": histogram.quantile(0.95),
+                "rows": int(rows.sum) if rows else None,
+                "bytes": int(size.sum) if size else None
+            })
+        return sorted(summary, key=lambda entry: -entry["total_seconds"])
+    
+    def caches(self) -> List[Dict[str, Any]]:
+        """
+        Summarize the cache lookups
+        
+        Returns:
+            One dictionary per cache with the count of each result and the hit ratio
+        """
+        _, counters = self._series()
+        results: Dict[str, Dict[str, int]] = {}
+        for (name, labels), value in counters.items():
+            if name == "cache_requests_total":
+                labels = dict(labels)
+                results.setdefault(labels["cache"], {})[labels["result"]] = int(value)
+        summary = []
+        for cache, counts in sorted(results.items()):
+            lookups = sum(counts.values())
+            served = lookups - counts.get("miss", 0)
+            summary.append({"cache": cache, **counts, "hit_ratio": served / lookups if lookups else None})
+        return summary
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Every series as plain data
+        
+        Returns:
+            Dictionary with ``histograms`` and ``counters`` lists, each entry
+            holding the metric name, its labels and its values
+        """
+        histograms, counters = self._series()
+        return {
+            "enabled": self.enabled,
+            "histograms": [{"name": name, "labels": dict(labels), **histogram.to_dict()}
+                           for (name, labels), histogram in sorted(histograms.items())],
+            "counters": [{"name": name, "labels": dict(labels), "value": value}
+                         for (name, labels), value in sorted(counters.items())]
+        }
+    
+    def to_json(self) -> str:
+        """Every series serialized as JSON (see ``to_dict``)"""
+        return json.dumps(self.to_dict())
+    
+    def to_prometheus(self) -> str:
+        """
+        Every series in the Prometheus text exposition format
+        
+        Returns:
+            Exposition text, metric names prefixed with the namespace
+        """
+        histograms, counters = self._series()
+        lines = []
+        described = set()
+        
+        def describe(name: str, kind: str) -> str:
+            metric = f"{self.namespace}_{name}"
+            if name not in described:
+                described.add(name)
+                lines.append(f"# HELP {metric} {METRIC_HELP.get(name, name)}")
+                lines.append(f"# TYPE {metric} {kind}")
+            return metric
+        
+        for (name, labels), histogram in sorted(histograms.items()):
+            values = histogram.to_dict()
+            metric = describe(name, "histogram")
+            for bound, count in values["buckets"].items():
+                lines.append(f"{metric}_bucket{_format_labels(labels, ('le', bound))} {count}")
+            lines.append(f"{metric}_sum{_format_labels(labels)} {float(values['sum'])!r}")
+            lines.append(f"{metric}_count{_format_labels(labels)} {values['count']}")
+        for (name, labels), value in sorted(counters.items()):
+            metric = describe(name, "counter")
+            lines.append(f"{metric}{_format_labels(labels)} {float(value)!r}")
+        return "\n".join(lines) + "\n"
+
+
+# Shared by every instrumented module; enabled with DUNE_INSTRUMENTATION
+metrics_registry = MetricsRegistry(enabled=DUNE_INSTRUMENTATION)
@@ -0,0 +1,36 @@
+"""
+Lazy Exports
+Module-level ``__getattr__`` that imports a package's exports on first access
+"""
+import importlib
+import sys
+from typing import Callable, Dict, List, Tuple
+
+
+def lazy_exports(package: str, exports: Dict[str, str]) -> Tuple[Callable[[str], object], Callable[[], List[str]]]:
+    """
+    Build the ``__getattr__`` and ``__dir__`` of a package with lazy exports
+    
+    Importing the package stays cheap: the module defining an export (and the
+    libraries it needs, e.g. pandas or plotly) is only imported when the name
+    is first accessed, then the value is cached on the package.
+    
+    Args:
+        package: Package the exports are relative to (``__package__``)
+        exports: Mapping of exported name to the module defining it, relative to the package
+        
+    Returns:
+        Tuple of (``__getattr__``, ``__dir__``) to assign at module level
+    """
+    def __getattr__(name: str) -> object:
+        module = exports.get(name)
+        if module is None:
+            raise AttributeError(f"module {package!r} has no attribute {name!r}")
+        value = getattr(importlib.import_module(module, package), name)
+        setattr(sys.modules[package], name, value)
+        return value
+    
+    def __dir__() -> List[str]:
+        return sorted(set(vars(sys.modules[package])) | set(exports))
+    
+    return __getattr__, __dir__
@@ -1,14 +1,2 @@
 """Numbers utility package"""
-from .numbers import (
-    format_number_with_commas,
-    calculate_percentage_change,
-    safe_division,
-    aggregate_metrics
-)
-
-__all__ = [
-    'format_number_with_commas',
-    'calculate_percentage_change',
-    'safe_division',
-    'aggregate_metrics'
-]
\ No newline at end of file
+from .index import __all__, __getattr__, __dir__
@@ -2,16 +2,21 @@
 Numbers Utility Module
 Exports number formatting and calculation utility functions
 """
-from .numbers import (
-    format_number_with_commas,
-    calculate_percentage_change,
-    safe_division,
-    aggregate_metrics
-)
+from src.utility.lazy import lazy_exports
 
-__all__ = [
-    'format_number_with_commas',
-    'calculate_percentage_change',
-    'safe_division',
-    'aggregate_metrics'
-]
+# Exported name -> module defining it
+_EXPORTS = {
+    'format_number_with_commas': '.numbers',
+    'calculate_percentage_change': '.numbers',
+    'safe_division': '.numbers',
+    'aggregate_metrics': '.numbers',
+    'split_wei': '.wei',
+    'wei_sum': '.wei',
+    'wei_to_token': '.wei',
+    'wei_total_to_token': '.wei',
+    'wei_sort_order': '.wei'
+}
+
+__getattr__, __dir__ = lazy_exports(__package__, _EXPORTS)
+
+__all__ = list(_EXPORTS)
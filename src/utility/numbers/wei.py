@@ -0,0 +1,120 @@
+"""
+Wei Utility Functions
+Exact fixed-point arithmetic on token balances stored as two int64 limbs
+
+A wei amount is represented as ``hi * 10**18 + lo`` with ``0 <= lo < 10**18``,
+which covers balances up to ~9.2e36 wei without floating point rounding while
+keeping every operation vectorized over NumPy arrays.
+"""
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+from typing import Tuple, Union
+
+WEI_LIMB_DIGITS = 18
+WEI_LIMB_BASE = 10 ** WEI_LIMB_DIGITS
+
+# Sub-limb used to keep int64 partial sums from overflowing
+_SUM_CHUNK = 10 ** 9
+
+
+def split_wei(values: Union[pd.Series, pa.Array]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Split decimal wei strings into (hi, lo) int64 limbs
+    
+    Parsing runs on Arrow string kernels, so no per-row Python integers are created.
+    Missing balances (null/NaN) are read as 0 wei: the holder keeps its row,
+    like a holder whose balance was reported as "0", instead of one bad row
+    failing the whole page.
+    
+    Args:
+        values: Series or Arrow string array of non-negative integer wei amounts as decimal strings
+        
+    Returns:
+        Tuple of (hi, lo) int64 arrays
+        
+    Raises:
+        pyarrow.ArrowInvalid: If a value is not an integer or does not fit in two limbs
+    """
+    if isinstance(values, (pa.Array, pa.ChunkedArray)):
+        strings = values
+    else:
+        strings = pa.array(values.astype(str), type=pa.string(), mask=values.isna().to_numpy())
+    strings = pc.fill_null(strings, "0")
+    padded = pc.utf8_lpad(strings, width=WEI_LIMB_DIGITS + 1, padding="0")
+    hi = pc.utf8_slice_codeunits(padded, 0, -WEI_LIMB_DIGITS).cast(pa.int64())
+    lo = pc.utf8_slice_codeunits(padded, -WEI_LIMB_DIGITS).cast(pa.int64())
+    return hi.to_numpy(zero_copy_only=False), lo.to_numpy(zero_copy_only=False)
+
+
+def _exact_int_sum(values: np.ndarray) -> int:
+    """Sum a non-negative int64 array exactly, without int64 overflow"""
+    return int((values // _SUM_CHUNK).sum()) * _SUM_CHUNK + int((values % _SUM_CHUNK).sum())
+
+
+def wei_sum(hi: np.ndarray, lo: np.ndarray) -> int:
+    """
+    Sum limb-encoded wei amounts exactly
+    
+    Args:
+        hi: High limbs (multiples of 10**18 wei)
+        lo: Low limbs (remainder wei)
+        
+    Returns:
+        Exact total in wei as a Python int
+    """
+    return _exact_int_sum(np.asarray(hi)) * WEI_LIMB_BASE + _exact_int_sum(np.asarray(lo))
+
+
+def wei_to_token(hi: np.ndarray, lo: np.ndarray, decimals: int = 18) -> np.ndarray:
+    """
+    Convert limb-encoded wei amounts to token units
+    
+    The result is float64 and meant for display and ratios; exact arithmetic
+    (totals, averages) should use ``wei_sum`` on the limbs instead.
+    
+    Args:
+        hi: High limbs (multiples of 10**18 wei)
+        lo: Low limbs (remainder wei)
+        decimals: Number of decimals for the token (default: 18)
+        
+    Returns:
+        float64 array of balances in token units
+    """
+    hi_scale = 10.0 ** (WEI_LIMB_DIGITS - decimals)
+    return np.asarray(hi, dtype=np.float64) * hi_scale + np.asarray(lo, dtype=np.float64) / (10.0 ** decimals)
+
+
+def wei_total_to_token(total: int, decimals: int = 18, count: int = 1) -> float:
+    """
+    Convert an exact wei total (optionally averaged) to token units
+    
+    Args:
+        total: Exact amount in wei
+        decimals: Number of decimals for the token (default: 18)
+        count: Divide by this many items, e.g. to get an average (default: 1)
+        
+    Returns:
+        Correctly rounded float in token units
+    """
+    if count == 0:
+        return 0.0
+    # int / int true division is correctly rounded, even for huge totals
+    return total / (count * 10 ** decimals)
+
+
+def wei_sort_order(hi: np.ndarray, lo: np.ndarray, descending: bool = True) -> np.ndarray:
+    """
+    Compute the permutation that sorts limb-encoded wei amounts
+    
+    Args:
+        hi: High limbs (multiples of 10**18 wei)
+        lo: Low limbs (remainder wei)
+        descending: Sort largest first (default: True)
+        
+    Returns:
+        Array of indices
+    """
+    order = np.lexsort((lo, hi))
+    return order[::-1] if descending else order
@@ -0,0 +1,206 @@
+"""
+Tests for AsyncDuneHttpClient against a local stub server
+"""
+import asyncio
+import socket
+import aiohttp
+import pytest
+from aiohttp import web
+from src.api.dune.asyncHttpClient import AsyncDuneHttpClient
+from src.api.dune.rateLimiter import RateLimiter
+
+
+class StubServer:
+    """Local aiohttp server counting requests and concurrency per path"""
+    
+    def __init__(self):
+        self.calls = {}
+        self.payloads = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.failures = {}
+        self.runner = None
+        self.url = None
+    
+    async def handle(self, request: web.Request) -> web.Response:
+        path = request.path
+        self.calls[path] = self.calls.get(path, 0) + 1
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            if request.method == "POST":
+                self.payloads.append(await request.json())
+            if path == "/slow":
+                await asyncio.sleep(0.05)
+            elif path == "/hang":
+                await asyncio.sleep(1)
+            elif self.failures.get(path):
+                status = self.failures[path].pop(0)
+                return web.json_response({"error": status}, status=status, headers={"Retry-After": "0"})
+            return web.json_response({"path": path, "key": request.headers.get("X-Dune-Api-Key"),
+                                      "query": dict(request.query)})
+        finally:
+            self.in_flight -= 1
+    
+    async def start(self) -> None:
+        app = web.Application()
+        app.router.add_route("*", "/{tail:.*}", self.handle)
+        self.runner = web.AppRunner(app)
+        await self.runner.setup()
+        site = web.TCPSite(self.runner, "127.0.0.1", 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        self.url = f"http://127.0.0.1:{port}"
+    
+    async def stop(self) -> None:
+        await self.runner.cleanup()
+
+
+def make_client(**kwargs) -> AsyncDuneHttpClient:
+    """Client without rate limiting and with near-instant backoff"""
+    options = dict(api_key="test", read_timeout=0.2, max_retries=2, backoff_base=0.001,
+                   backoff_max=0.001, rate_limiter=RateLimiter(requests_per_minute=0, credits_per_minute=0))
+    options.update(kwargs)
+    return AsyncDuneHttpClient(**options)
+
+
+def run_with_server(scenario):
+    """Run ``scenario(server, client)`` against a fresh stub server and client"""
+    async def main():
+        server = StubServer()
+        await server.start()
+        client = make_client()
+        try:
+            return await scenario(server, client)
+        finally:
+            await client.close()
+            await server.stop()
+    return asyncio.run(main())
+
+
+def test_get_decodes_json_and_sends_headers():
+    async def scenario(server, client):
+        data = await client.get(f"{server.url}/holders", params={"limit": 5})
+        assert data == {"path": "/holders", "key": "test", "query": {"limit": "5"}}
+    
+    run_with_server(scenario)
+
+
+def test_post_sends_json_payload():
+    async def scenario(server, client):
+        data = await client.post(f"{server.url}/execute", data={"query_parameters": {"a": 1}})
+        assert data["path"] == "/execute"
+        assert server.payloads == [{"query_parameters": {"a": 1}}]
+    
+    run_with_server(scenario)
+
+
+def test_concurrency_limit():
+    async def scenario(server, _):
+        client = make_client(max_concurrency=2)
+        try:
+            await asyncio.gather(*(client.get(f"{server.url}/slow") for _ in range(6)))
+        finally:
+            await client.close()
+        assert server.calls["/slow"] == 6
+        assert server.max_in_flight == 2
+    
+    run_with_server(scenario)
+
+
+def test_get_retries_transient_statuses():
+    async def scenario(server, client):
+        server.failures["/flaky"] = [503, 429]
+        data = await client.get(f"{server.url}/flaky")
+        assert data["path"] == "/flaky"
+        assert server.calls["/flaky"] == 3
+    
+    run_with_server(scenario)
+
+
+def test_get_gives_up_after_max_retries():
+    async def scenario(server, client):
+        server.failures["/down"] = [503, 503, 503]
+        with pytest.raises(aiohttp.ClientResponseError):
+            await client.get(f"{server.url}/down")
+        assert server.calls["/down"] == 3
+    
+    run_with_server(scenario)
+
+
+def test_get_retries_read_timeout():
+    async def scenario(server, client):
+        with pytest.raises(asyncio.TimeoutError):
+            await client.get(f"{server.url}/hang")
+        assert server.calls["/hang"] == 3
+    
+    run_with_server(scenario)
+
+
+def test_post_not_retried_after_read_timeout():
+    async def scenario(server, client):
+        with pytest.raises(asyncio.TimeoutError):
+            await client.post(f"{server.url}/hang", data={})
+        assert server.calls["/hang"] == 1
+    
+    run_with_server(scenario)
+
+
+def test_post_retries_rate_limit_only():
+    async def scenario(server, client):
+        server.failures["/execute"] = [429]
+        assert (await client.post(f"{server.url}/execute", data={}, credits=10))["path"] == "/execute"
+        assert server.calls["/execute"] == 2
+        # The retry waits for the limiter again but does not cost another execution
+        assert client.rate_limiter.total_requests == 2
+        assert client.rate_limiter.total_credits == 10
+        
+        server.failures["/execute"] = [503]
+        with pytest.raises(aiohttp.ClientResponseError):
+            await client.post(f"{server.url}/execute", data={})
+        assert server.calls["/execute"] == 3
+    
+    run_with_server(scenario)
+
+
+def test_post_retried_when_connection_refused():
+    async def main():
+        # Bind and release a port so nothing listens on it
+        with socket.socket() as sock:
+            sock.bind(("127.0.0.1", 0))
+            port = sock.getsockname()[1]
+        client = make_client()
+        try:
+            with pytest.raises(aiohttp.ClientConnectorError):
+                await client.post(f"http://127.0.0.1:{port}/execute", data={})
+        finally:
+            await client.close()
+        # Every attempt goes through the rate limiter first
+        assert client.rate_limiter.total_requests == 3
+    
+    asyncio.run(main())
+
+
+def test_client_reused_across_event_loops():
+    async def start():
+        server = StubServer()
+        await server.start()
+        return server
+    
+    # Each asyncio.run is a new loop, like a Streamlit rerun
+    client = make_client(max_concurrency=1)
+    for _ in range(2):
+        async def scenario():
+            server = await start()
+            try:
+                results = await asyncio.gather(*(client.get(f"{server.url}/slow") for _ in range(3)))
+                assert [data["path"] for data in results] == ["/slow"] * 3
+            finally:
+                await server.stop()
+        asyncio.run(scenario())
+    
+    async def close():
+        await client.close()
+        assert client._session is None and client._semaphore is None
+    
+    asyncio.run(close())
@@ -0,0 +1,86 @@
+"""
+Tests for the incremental holder diff engine
+"""
+import pandas as pd
+from src.helpers.dune.diff import apply_holder_diff, diff_holder_pages, diff_holders, is_empty_diff, update_holder_metrics
+from src.helpers.dune.dune import calculate_holder_metrics
+
+WEI = 10 ** 18
+
+
+def holders(rows: list) -> pd.DataFrame:
+    """Holders frame from (address, balance in wei, has_initiated_transfer) tuples, largest first"""
+    rows = sorted(rows, key=lambda row: -row[1])
+    return pd.DataFrame({
+        'wallet_address': [address for address, _, _ in rows],
+        'balance_hi': [balance // WEI for _, balance, _ in rows],
+        'balance_lo': [balance % WEI for _, balance, _ in rows],
+        'has_initiated_transfer': [active for _, _, active in rows]
+    })
+
+
+PREVIOUS = holders([('0xa', 5 * WEI, True), ('0xb', 3 * WEI + 1, False), ('0xc', 2 * WEI, False), ('0xd', 7, True)])
+CURRENT = holders([('0xa', 5 * WEI, True), ('0xb', 4 * WEI, False), ('0xd', 7, False), ('0xe', 9 * WEI, True)])
+
+
+def test_diff_holder_pages_over_several_pages():
+    pages = [CURRENT.iloc[:2], CURRENT.iloc[2:0], CURRENT.iloc[2:]]
+    diff = diff_holder_pages(PREVIOUS, pages)
+    
+    assert list(diff['added']['wallet_address']) == ['0xe']
+    assert list(diff['removed']['wallet_address']) == ['0xc']
+    changed = diff['changed'].set_index('wallet_address')
+    assert sorted(changed.index) == ['0xb', '0xd']
+    assert changed.loc['0xb', 'prev_balance_hi'] == 3 and changed.loc['0xb', 'prev_balance_lo'] == 1
+    assert changed.loc['0xb', 'balance_hi'] == 4 and changed.loc['0xb', 'balance_lo'] == 0
+    assert bool(changed.loc['0xd', 'prev_has_initiated_transfer']) and not changed.loc['0xd', 'has_initiated_transfer']
+
+
+def test_diff_without_previous_snapshot_adds_everything():
+    diff = diff_holder_pages(pd.DataFrame(), [CURRENT.iloc[:2], CURRENT.iloc[2:]])
+    assert len(diff['added']) == len(CURRENT)
+    assert diff['removed'].empty and diff['changed'].empty
+
+
+def test_apply_holder_diff_rebuilds_current_snapshot():
+    diff = diff_holders(PREVIOUS, CURRENT)
+    assert not is_empty_diff(diff)
+    pd.testing.assert_frame_equal(apply_holder_diff(PREVIOUS, diff), CURRENT)
+
+
+def test_identical_snapshots_give_an_empty_diff():
+    assert is_empty_diff(diff_holders(PREVIOUS, PREVIOUS.copy()))
+
+
+def test_update_holder_metrics_matches_a_full_recount():
+    diff = diff_holders(PREVIOUS, CURRENT)
+    updated = update_holder_metrics(calculate_holder_metrics(PREVIOUS), diff)
+    expected = calculate_holder_metrics(CURRENT)
+    for metric in ('total_holders', 'active_holders', 'total_balance_wei', 'total_balance', 'average_balance'):
+        assert updated[metric] == expected[metric], metric
+
+
+def test_empty_diff_returns_a_new_frame():
+    previous = PREVIOUS.copy()
+    previous.attrs['snapshot_path'] = "old.parquet"
+    df = apply_holder_diff(previous, diff_holders(previous, previous.copy()))
+    df.attrs['snapshot_path'] = "new.parquet"
+    
+    assert df is not previous
+    pd.testing.assert_frame_equal(df, previous)
+    assert previous.attrs['snapshot_path'] == "old.parquet"
+
+
+def test_repeated_wallets_count_once():
+    # Offset pagination can list a holder on two pages
+    previous = pd.concat([PREVIOUS, PREVIOUS.iloc[[1]]], ignore_index=True)
+    pages = [CURRENT.iloc[:3], CURRENT.iloc[[2, 3]], CURRENT.iloc[[3]]]
+    diff = diff_holder_pages(previous, pages)
+    
+    assert list(diff['added']['wallet_address']) == ['0xe']
+    assert list(diff['removed']['wallet_address']) == ['0xc']
+    assert sorted(diff['changed']['wallet_address']) == ['0xb', '0xd']
+    pd.testing.assert_frame_equal(apply_holder_diff(previous, diff), CURRENT)
+    
+    unchanged = apply_holder_diff(previous, diff_holders(previous, PREVIOUS))
+    pd.testing.assert_frame_equal(unchanged.reset_index(drop=True), PREVIOUS)
@@ -0,0 +1,57 @@
+"""
+Tests for the holder concentration metrics
+"""
+import numpy as np
+import pandas as pd
+import pytest
+from src.helpers.dune.distribution import calculate_concentration_metrics, holder_balances
+
+
+def brute_force_gini(balances: np.ndarray) -> float:
+    """Mean absolute difference over every pair, divided by twice the mean"""
+    return float(np.abs(balances[:, None] - balances[None, :]).mean() / (2 * balances.mean()))
+
+
+def test_equal_balances():
+    metrics = calculate_concentration_metrics(np.full(4, 25.0))
+    assert metrics['gini'] == pytest.approx(0.0)
+    assert metrics['hhi'] == pytest.approx(0.25)
+    assert metrics['top_1_share'] == pytest.approx(0.25)
+    assert metrics['top_10_share'] == pytest.approx(1.0)
+    assert metrics['nakamoto_coefficient'] == 3
+
+
+def test_single_whale():
+    balances = np.array([100.0] + [0.0] * 9)
+    metrics = calculate_concentration_metrics(balances)
+    assert metrics['gini'] == pytest.approx(0.9)
+    assert metrics['hhi'] == pytest.approx(1.0)
+    assert metrics['nakamoto_coefficient'] == 1
+    assert metrics['balance_histogram']['zero_balance_holders'] == 9
+
+
+def test_matches_brute_force():
+    rng = np.random.default_rng(1)
+    balances = np.sort(rng.lognormal(3, 2, 500))[::-1]
+    metrics = calculate_concentration_metrics(balances)
+    shares = balances / balances.sum()
+    
+    assert metrics['gini'] == pytest.approx(brute_force_gini(balances))
+    assert metrics['hhi'] == pytest.approx(float((shares ** 2).sum()))
+    assert metrics['top_100_share'] == pytest.approx(float(shares[:100].sum()))
+    assert metrics['nakamoto_coefficient'] == int(np.argmax(np.cumsum(shares) > 0.5)) + 1
+    for p, value in metrics['balance_percentiles'].items():
+        assert value == pytest.approx(np.percentile(balances, int(p[1:])))
+    assert sum(metrics['balance_histogram']['holders']) == len(balances)
+
+
+def test_empty_and_zero_supply():
+    for balances in (np.empty(0), np.zeros(3)):
+        metrics = calculate_concentration_metrics(balances)
+        assert metrics['gini'] == 0.0 and metrics['nakamoto_coefficient'] == 0
+
+
+def test_holder_balances_sorts_unsorted_input():
+    df = pd.DataFrame({'balance_hi': [1, 3, 2], 'balance_lo': [0, 0, 500_000_000_000_000_000]})
+    np.testing.assert_allclose(holder_balances(df), [3.0, 2.5, 1.0])
+    np.testing.assert_allclose(holder_balances(pd.DataFrame({'balance_token': [1.0, 4.0]})), [4.0, 1.0])
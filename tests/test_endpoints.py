@@ -0,0 +1,39 @@
+"""
+Tests for the Dune query execution endpoints
+"""
+from src.api.dune.endpoints import RESULTS_CACHE_ENTRIES, DuneAPI
+
+
+class FakeClient:
+    """Answers every results request with one page, recording the requested URLs"""
+    
+    def __init__(self):
+        self.urls = []
+    
+    def get(self, url, params=None):
+        self.urls.append(url)
+        return {"result": {"rows": [{"day": "2024-01-01", "total_volume": 1.0}],
+                           "metadata": {"column_names": ["day", "total_volume"]}}}
+
+
+def test_execution_results_are_downloaded_once():
+    client = FakeClient()
+    api = DuneAPI(client)
+    first = api.get_execution_results("01ABC")
+    assert api.get_execution_results("01ABC") is first
+    assert list(first.columns) == ["day", "total_volume"]
+    assert len(client.urls) == 1
+    
+    api.get_execution_results("01ABC", cache=False)
+    assert len(client.urls) == 2
+
+
+def test_results_cache_is_bounded():
+    client = FakeClient()
+    api = DuneAPI(client)
+    for i in range(RESULTS_CACHE_ENTRIES + 1):
+        api.get_execution_results(f"exec{i}")
+    # The most recently read execution stays, the oldest one is downloaded again
+    api.get_execution_results(f"exec{RESULTS_CACHE_ENTRIES}")
+    api.get_execution_results("exec0")
+    assert len(client.urls) == RESULTS_CACHE_ENTRIES + 2
@@ -0,0 +1,123 @@
+"""
+Tests for the day-partitioned transfer event store
+"""
+from datetime import date, datetime, timedelta, timezone
+import pandas as pd
+import pytest
+from src.ingest.worker import ingest_token_transfers
+from src.models import Token
+from src.store.events import TransferEventStore
+
+TOKEN = "0xToken"
+START = datetime(2024, 3, 1, tzinfo=timezone.utc)
+
+
+def transfers(hours: list, first_block: int = 100) -> pd.DataFrame:
+    """One transfer per offset (in hours) from ``START``"""
+    return pd.DataFrame({
+        'block_time': [(START + timedelta(hours=h)).isoformat() for h in hours],
+        'block_number': [first_block + i for i in range(len(hours))],
+        'tx_hash': [f"0x{i:064x}" for i in range(len(hours))],
+        'from_address': ["0xA"] * len(hours),
+        'to_address': ["0xB"] * len(hours),
+        'amount': [1.5] * len(hours)
+    })
+
+
+def test_append_partitions_by_day_and_advances_the_cursor(tmp_path):
+    store = TransferEventStore(str(tmp_path))
+    end = START + timedelta(days=2)
+    assert store.append(transfers([1, 30, 2, 47]), 1, TOKEN, START, end) == 4
+    
+    assert [p.name for p in store.list_partitions(1, TOKEN)] == ["date=2024-03-01", "date=2024-03-02"]
+    assert store.ingested_until(1, TOKEN) == end
+    assert store.read_cursor(1, TOKEN) == {"until": end.isoformat(), "last_block": 103, "rows": 4}
+    
+    df = store.load(1, TOKEN)
+    assert list(df['block_number']) == [100, 102, 101, 103]
+    assert list(df['from_address'].unique()) == ["0xa"]
+    assert str(df['block_time'].dtype) == "datetime64[us, UTC]"
+
+
+def test_load_selects_columns_and_days(tmp_path):
+    store = TransferEventStore(str(tmp_path))
+    store.append(transfers([1, 30, 50]), 1, TOKEN, START, START + timedelta(days=3))
+    df = store.load(1, TOKEN, columns=['block_number'], start=date(2024, 3, 2), end=date(2024, 3, 2))
+    assert list(df.columns) == ['block_number']
+    assert list(df['block_number']) == [101]
+    assert store.load(1, "0xother").empty
+
+
+def test_rerunning_a_window_does_not_duplicate_events(tmp_path):
+    store = TransferEventStore(str(tmp_path))
+    middle, end = START + timedelta(days=1), START + timedelta(days=2)
+    store.append(transfers([1, 2]), 1, TOKEN, START, middle)
+    store.append(transfers([25, 26], first_block=200), 1, TOKEN, middle, end)
+    # The second window is fetched again after a crash, this time with one more transfer
+    store.append(transfers([25, 26, 27], first_block=200), 1, TOKEN, middle, end)
+    
+    assert list(store.load(1, TOKEN)['block_number']) == [100, 101, 200, 201, 202]
+    assert store.read_cursor(1, TOKEN)["last_block"] == 202
+
+
+def test_empty_window_still_advances_the_cursor(tmp_path):
+    store = TransferEventStore(str(tmp_path))
+    end = START + timedelta(days=7)
+    assert store.append(transfers([]), 1, TOKEN, START, end) == 0
+    assert store.ingested_until(1, TOKEN) == end
+    assert store.read_cursor(1, TOKEN)["last_block"] is None
+
+
+def test_start_cursor_is_written_once(tmp_path):
+    store = TransferEventStore(str(tmp_path))
+    assert store.start_cursor(1, TOKEN, START) == START
+    assert store.read_cursor(1, TOKEN) == {"until": START.isoformat(), "last_block": None, "rows": 0}
+    # A later call, e.g. from a rerun with a different default, keeps the saved start
+    assert store.start_cursor(1, TOKEN, START + timedelta(hours=5)) == START
+
+
+def test_interrupted_first_window_resumes_from_the_saved_start(tmp_path, monkeypatch):
+    store = TransferEventStore(str(tmp_path))
+    end = START + timedelta(days=1)
+    store.start_cursor(1, TOKEN, START)
+    
+    # The process dies after the parts are written but before the cursor moves
+    def crash(*args):
+        raise KeyboardInterrupt
+    
+    monkeypatch.setattr(store, "_write_cursor", crash)
+    with pytest.raises(KeyboardInterrupt):
+        store.append(transfers([1, 2]), 1, TOKEN, START, end)
+    monkeypatch.undo()
+    
+    since = store.start_cursor(1, TOKEN, START + timedelta(minutes=7))
+    assert since == START
+    store.append(transfers([1, 2]), 1, TOKEN, since, end)
+    assert list(store.load(1, TOKEN)['block_number']) == [100, 101]
+    assert store.read_cursor(1, TOKEN)["rows"] == 2
+
+
+class FailingAPI:
+    """Transfers API whose first call fails, recording every requested window"""
+    
+    def __init__(self):
+        self.windows = []
+    
+    def get_token_transfers(self, query_id, chain_id, token_address, since, until):
+        self.windows.append((since, until))
+        if len(self.windows) == 1:
+            raise RuntimeError("execution failed")
+        return transfers([])
+
+
+def test_ingest_reruns_the_first_window_from_the_same_midnight_start(tmp_path):
+    store = TransferEventStore(str(tmp_path))
+    token = Token(symbol="TST", chain_id=1, address=TOKEN)
+    api = FailingAPI()
+    with pytest.raises(RuntimeError):
+        ingest_token_transfers(api, store, token, query_id="1")
+    ingest_token_transfers(api, store, token, query_id="1")
+    
+    first_start, rerun_start = api.windows[0][0], api.windows[1][0]
+    assert first_start == rerun_start
+    assert (first_start.hour, first_start.minute, first_start.second, first_start.microsecond) == (0, 0, 0, 0)
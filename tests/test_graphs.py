@@ -0,0 +1,98 @@
+"""
+Tests for LTTB downsampling and the figure cache
+"""
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+from src.utility.graphs.cache import figure_cache, frame_fingerprint, memoize_figure
+from src.utility.graphs.downsample import downsample_frame, lttb_indices
+
+# Times each test builder ran
+builds = []
+
+
+@memoize_figure(x="x", y="y")
+def line_chart(df: pd.DataFrame, x: str, y: str, title: str = "", max_points: int = None) -> go.Figure:
+    """Minimal builder: one named line trace"""
+    builds.append(title)
+    data = downsample_frame(df, x, y, max_points)
+    return go.Figure(go.Scatter(x=data[x].to_numpy(), y=data[y].to_numpy(), name=y), layout={"title": title})
+
+
+def series(n: int, seed: int = 0) -> pd.DataFrame:
+    """Random walk with one spike"""
+    rng = np.random.default_rng(seed)
+    y = rng.normal(size=n).cumsum()
+    y[n // 3] = 1000.0
+    return pd.DataFrame({"day": pd.date_range("2024-01-01", periods=n, freq="h", tz="UTC"), "holders": y})
+
+
+def test_lttb_keeps_endpoints_and_peaks():
+    df = series(10_000)
+    x = np.arange(len(df), dtype=np.float64)
+    indices = lttb_indices(x, df["holders"].to_numpy(), 200)
+    assert len(indices) == 200
+    assert indices[0] == 0 and indices[-1] == len(df) - 1
+    assert np.all(np.diff(indices) > 0)
+    assert len(df) // 3 in indices
+
+
+def test_lttb_keeps_short_series():
+    assert list(lttb_indices(np.arange(5.0), np.arange(5.0), 10)) == [0, 1, 2, 3, 4]
+
+
+def test_downsample_frame():
+    df = series(5_000)
+    small = downsample_frame(df, "day", "holders", 100)
+    assert len(small) == 100
+    assert small["holders"].max() == 1000.0
+    assert downsample_frame(df, "day", "holders", 10_000) is df
+
+
+def test_fingerprint_follows_content():
+    df = series(100)
+    assert frame_fingerprint(df) == frame_fingerprint(df.copy())
+    changed = df.copy()
+    changed.loc[5, "holders"] += 1
+    assert frame_fingerprint(changed) != frame_fingerprint(df)
+
+
+def test_memoized_builder_reuses_and_patches():
+    figure_cache.clear()
+    builds.clear()
+    df = series(50)
+    first = line_chart(df, "day", "holders", title="t")
+    assert line_chart(df.copy(), "day", "holders", title="t") is first
+    assert builds == ["t"]
+    
+    changed = series(60, seed=1)
+    patched = line_chart(changed, "day", "holders", title="t")
+    assert builds == ["t"]
+    assert patched.layout.title.text == "t"
+    np.testing.assert_array_equal(patched.data[0].y, changed["holders"].to_numpy())
+    
+    line_chart(df, "day", "holders", title="other")
+    assert builds == ["t", "other"]
+
+
+def test_figures_handed_out_are_never_modified():
+    figure_cache.clear()
+    df = series(50)
+    first = line_chart(df, "day", "holders")
+    before = first.to_json()
+    line_chart(series(80, seed=2), "day", "holders")
+    assert first.to_json() == before
+    np.testing.assert_array_equal(first.data[0].y, df["holders"].to_numpy())
+
+
+def test_memoized_builder_downsamples_patches():
+    figure_cache.clear()
+    line_chart(series(50), "day", "holders", max_points=100)
+    patched = line_chart(series(5_000, seed=3), "day", "holders", max_points=100)
+    assert len(patched.data[0].y) == 100
+
+
+def test_json_is_cached():
+    figure_cache.clear()
+    df = series(20)
+    assert line_chart.json(df, "day", "holders") == line_chart(df, "day", "holders").to_json()
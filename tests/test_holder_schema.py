@@ -0,0 +1,36 @@
+"""
+Tests for the compact holder schema
+"""
+import numpy as np
+import pandas as pd
+from src.models import HOLDER_DTYPES, apply_holder_schema
+
+# Synthetic holders measured per test
+HOLDERS = 100_000
+
+# Upper bound on deep memory per holder after the schema is applied (about 71 bytes today)
+MAX_BYTES_PER_HOLDER = 80
+
+
+def synthetic_holders(n: int) -> pd.DataFrame:
+    """Holders as they come out of a JSON page: object strings, ISO timestamps, nullable flags"""
+    rng = np.random.default_rng(0)
+    return pd.DataFrame({
+        'wallet_address': [f"0x{i:040x}" for i in range(n)],
+        'first_acquired': pd.date_range("2024-01-01", periods=n, freq="min", tz="UTC").strftime("%Y-%m-%dT%H:%M:%SZ"),
+        'has_initiated_transfer': pd.Series(rng.integers(0, 2, n).astype(bool), dtype=object),
+        'balance_hi': rng.integers(0, 10 ** 6, n),
+        'balance_lo': rng.integers(0, 10 ** 18, n)
+    })
+
+
+def test_schema_dtypes():
+    df = apply_holder_schema(synthetic_holders(10))
+    assert {col: df[col].dtype for col in HOLDER_DTYPES} == {col: pd.api.types.pandas_dtype(dtype)
+                                                           for col, dtype in HOLDER_DTYPES.items()}
+
+
+def test_memory_per_holder():
+    df = apply_holder_schema(synthetic_holders(HOLDERS))
+    bytes_per_holder = df.memory_usage(deep=True).sum() / HOLDERS
+    assert bytes_per_holder < MAX_BYTES_PER_HOLDER
@@ -0,0 +1,181 @@
+"""
+Tests for DuneHttpClient and its response cache against a local stub server
+"""
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import pytest
+from src.api.dune.httpClient import DuneHttpClient
+from src.api.dune.rateLimiter import RateLimiter
+from src.api.dune.responseCache import CachedResponse, ResponseCache
+
+
+class StubServer(ThreadingHTTPServer):
+    """Local server answering JSON with an ETag, counting requests per path"""
+    
+    daemon_threads = True
+    
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), StubHandler)
+        self.version = 1
+        self.calls = {}
+        self.validators = []
+        self.failures = {}
+        self.url = f"http://127.0.0.1:{self.server_address[1]}"
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    """Serves ``{"path", "version"}``, honours If-None-Match and replays queued failures"""
+    
+    def do_GET(self) -> None:
+        server = self.server
+        path = self.path.split("?")[0]
+        server.calls[path] = server.calls.get(path, 0) + 1
+        server.validators.append(self.headers.get("If-None-Match"))
+        if server.failures.get(path):
+            self.send_response(server.failures[path].pop(0))
+            self.send_header("Retry-After", "0")
+            self.end_headers()
+            return
+        etag = f'"v{server.version}"'
+        if self.headers.get("If-None-Match") == etag:
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.end_headers()
+            return
+        body = json.dumps({"path": path, "version": server.version}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("ETag", etag)
+        self.end_headers()
+        self.wfile.write(body)
+    
+    def do_POST(self) -> None:
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        self.do_GET()
+    
+    def log_message(self, *args) -> None:
+        pass
+
+
+@pytest.fixture
+def server():
+    server = StubServer()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def make_client(cache: ResponseCache = None, **kwargs) -> DuneHttpClient:
+    """Client without rate limiting, with its own response cache"""
+    options = dict(api_key="test", max_retries=0,
+                   rate_limiter=RateLimiter(requests_per_minute=0, credits_per_minute=0),
+                   response_cache=cache or ResponseCache(max_bytes=1_000_000, directory=None))
+    options.update(kwargs)
+    return DuneHttpClient(**options)
+
+
+def test_revalidated_get_reuses_the_cached_result(server):
+    client = make_client()
+    first = client.get(f"{server.url}/holders")
+    second = client.get(f"{server.url}/holders")
+    
+    assert first == {"path": "/holders", "version": 1}
+    assert second is first
+    assert server.validators == [None, '"v1"']
+
+
+def test_changed_resource_is_downloaded_again(server):
+    client = make_client()
+    client.get(f"{server.url}/holders")
+    server.version = 2
+    assert client.get(f"{server.url}/holders") == {"path": "/holders", "version": 2}
+    assert client.get(f"{server.url}/holders")["version"] == 2
+    assert server.validators == [None, '"v1"', '"v2"']
+
+
+def test_api_keys_do_not_share_entries(server):
+    cache = ResponseCache(max_bytes=1_000_000, directory=None)
+    make_client(cache).get(f"{server.url}/holders")
+    make_client(cache, api_key="other").get(f"{server.url}/holders")
+    assert server.validators == [None, None]
+
+
+def test_disk_tier_survives_a_new_process(server, tmp_path):
+    make_client(ResponseCache(max_bytes=1_000_000, directory=str(tmp_path))).get(f"{server.url}/holders")
+    data = make_client(ResponseCache(max_bytes=1_000_000, directory=str(tmp_path))).get(f"{server.url}/holders")
+    assert data == {"path": "/holders", "version": 1}
+    assert server.validators == [None, '"v1"']
+
+
+def test_memory_tier_evicts_least_recently_used():
+    cache = ResponseCache(max_bytes=250, directory=None)
+    for key in ("a", "b"):
+        cache.put(key, CachedResponse(body=b"x" * 100, etag=key))
+    cache.get("a")
+    cache.put("c", CachedResponse(body=b"x" * 100, etag="c"))
+    assert cache.get("b") is None
+    assert cache.get("a").etag == "a" and cache.get("c").etag == "c"
+
+
+def test_retried_request_charges_its_credits_once(server):
+    client = make_client(max_retries=2, backoff_base=0.001)
+    server.failures["/execute"] = [429, 503]
+    assert client._request("POST", f"{server.url}/execute", credits=10, json={}).status_code == 200
+    assert client.rate_limiter.total_requests == 3
+    assert client.rate_limiter.total_credits == 10
+
+
+def start_leader(server, leader_get) -> threading.Thread:
+    """Start a GET on ``/holders`` that runs ``leader_get`` instead of the request"""
+    client, started = make_client(), threading.Event()
+    
+    def conditional_get(*args):
+        started.set()
+        return leader_get()
+    
+    def get():
+        with pytest.raises(BaseException):
+            client.get(f"{server.url}/holders")
+    
+    client._conditional_get = conditional_get
+    thread = threading.Thread(target=get)
+    thread.start()
+    started.wait(5)
+    return thread
+
+
+def test_follower_retries_when_the_leader_is_interrupted(server):
+    release = threading.Event()
+    
+    def interrupted():
+        release.wait(5)
+        raise KeyboardInterrupt
+    
+    leader = start_leader(server, interrupted)
+    threading.Timer(0.05, release.set).start()
+    assert make_client().get(f"{server.url}/holders") == {"path": "/holders", "version": 1}
+    leader.join(5)
+    assert server.calls["/holders"] == 1
+
+
+def test_follower_stops_waiting_for_a_stuck_leader(server):
+    release = threading.Event()
+    
+    def stuck():
+        release.wait(5)
+        raise RuntimeError("stuck")
+    
+    leader = start_leader(server, stuck)
+    follower = make_client(connect_timeout=0.05, read_timeout=0.05, backoff_max=0)
+    started = time.monotonic()
+    try:
+        assert follower.get(f"{server.url}/holders") == {"path": "/holders", "version": 1}
+        assert time.monotonic() - started < 1
+    finally:
+        release.set()
+        leader.join(5)
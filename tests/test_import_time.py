@@ -0,0 +1,57 @@
+"""
+Cold import budget of the src packages
+"""
+import re
+import subprocess
+import sys
+from typing import Dict, List, Tuple
+
+PACKAGES = [
+    "src",
+    "src.config",
+    "src.models",
+    "src.api",
+    "src.helpers",
+    "src.utility",
+    "src.store",
+    "src.services",
+    "src.ingest"
+]
+
+# Libraries that must only be imported when an export needing them is first used
+HEAVY_MODULES = ["pandas", "numpy", "pyarrow", "plotly", "requests", "aiohttp"]
+
+# Maximum cold import time of the src packages
+BUDGET_MS = 100.0
+
+_IMPORTTIME_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|(\s*)(\S+)$")
+
+
+def cold_import(packages: List[str]) -> Tuple[Dict[str, int], List[str]]:
+    """
+    Import packages in a fresh interpreter with ``-X importtime``
+    
+    Args:
+        packages: Packages to import
+        
+    Returns:
+        Tuple of (cumulative microseconds per top-level import, modules loaded afterwards)
+    """
+    code = f"import sys; import {', '.join(packages)}; print('\\n'.join(sys.modules))"
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", code],
+                            capture_output=True, text=True, check=True)
+    cumulative = {}
+    for line in result.stderr.splitlines():
+        match = _IMPORTTIME_LINE.match(line)
+        if match and len(match.group(3)) == 1:
+            cumulative[match.group(4)] = int(match.group(2))
+    return cumulative, result.stdout.split()
+
+
+def test_cold_import_is_light():
+    cumulative, modules = cold_import(PACKAGES)
+    total_ms = sum(us for name, us in cumulative.items() if name.split(".")[0] == "src") / 1000
+    heavy = sorted({name.split(".")[0] for name in modules} & set(HEAVY_MODULES))
+    
+    assert heavy == [], f"heavy libraries imported eagerly: {', '.join(heavy)}"
+    assert total_ms <= BUDGET_MS, f"cold import took {total_ms:.1f} ms, budget is {BUDGET_MS:g} ms"
@@ -0,0 +1,109 @@
+"""
+Tests for the SQLite metrics time-series store
+"""
+import sqlite3
+from datetime import datetime, timezone
+import pytest
+from src.models import Token
+from src.store.metrics import MetricsStore, bucket_start
+
+TOKEN = Token(symbol="TST", chain_id=1, address="0xABC")
+
+
+def at(day: int, hour: int, minute: int = 0) -> datetime:
+    """UTC time in January 2024 (the 1st was a Monday)"""
+    return datetime(2024, 1, day, hour, minute, tzinfo=timezone.utc)
+
+
+def store_with_points(tmp_path) -> MetricsStore:
+    """Store with three points in one hour and one the next day"""
+    store = MetricsStore(str(tmp_path / "metrics.db"))
+    for recorded_at, holders in ((at(2, 10, 5), 10), (at(2, 10, 50), 30), (at(2, 10, 20), 20), (at(3, 8), 40)):
+        store.record(TOKEN, {'total_holders': holders, 'gini': holders / 100}, recorded_at=recorded_at)
+    return store
+
+
+def test_bucket_start():
+    ms = int(at(3, 15, 42).timestamp() * 1000)
+    assert bucket_start(ms, 'hourly') == int(at(3, 15).timestamp() * 1000)
+    assert bucket_start(ms, 'daily') == int(at(3, 0).timestamp() * 1000)
+    # Weeks start on Monday
+    assert bucket_start(ms, 'weekly') == int(at(1, 0).timestamp() * 1000)
+
+
+def test_raw_series(tmp_path):
+    df = store_with_points(tmp_path).read_series(TOKEN, granularity='raw', metrics=['total_holders'])
+    assert list(df['total_holders']) == [10, 20, 30, 40]
+    assert str(df['timestamp'].dt.tz) == 'UTC'
+
+
+def test_rollup_aggregates(tmp_path):
+    store = store_with_points(tmp_path)
+    read = lambda aggregate: list(store.read_series(TOKEN, granularity='hourly', aggregate=aggregate,
+                                                    metrics=['total_holders'])['total_holders'])
+    # The last value follows the recording time, not the insertion order
+    assert read('last') == [30, 40]
+    assert read('min') == [10, 40]
+    assert read('max') == [30, 40]
+    assert read('avg') == [20, 40]
+    
+    weekly = store.read_series(TOKEN, granularity='weekly', aggregate='max', metrics=['gini'])
+    assert list(weekly['timestamp']) == [at(1, 0)]
+    assert list(weekly['gini']) == [0.4]
+
+
+def test_missing_metrics_are_null(tmp_path):
+    df = store_with_points(tmp_path).read_series(TOKEN, granularity='daily', metrics=['hhi'])
+    assert df['hhi'].isna().all()
+
+
+def test_series_are_separated_per_token(tmp_path):
+    store = store_with_points(tmp_path)
+    other = Token(symbol="OTH", chain_id=137, address="0xABC")
+    assert store.read_series(other, granularity='raw').empty
+    # Addresses compare case-insensitively
+    assert len(store.read_series(Token(symbol="TST", chain_id=1, address="0xabc"), granularity='raw')) == 4
+
+
+def test_replaced_point_rebuilds_its_rollups(tmp_path):
+    store = store_with_points(tmp_path)
+    store.record(TOKEN, {'total_holders': 5}, recorded_at=at(2, 10, 50))
+    
+    raw = store.read_series(TOKEN, granularity='raw', metrics=['total_holders'])
+    assert list(raw['total_holders']) == [10, 20, 5, 40]
+    for aggregate, expected in (('last', 5), ('min', 5), ('max', 20), ('avg', 35 / 3)):
+        hourly = store.read_series(TOKEN, granularity='hourly', aggregate=aggregate, metrics=['total_holders'])
+        assert hourly['total_holders'].iloc[0] == expected, aggregate
+
+
+def test_avg_skips_missing_samples(tmp_path):
+    store = store_with_points(tmp_path)
+    # A refresh that could not compute the Gini coefficient
+    store.record(TOKEN, {'total_holders': 50}, recorded_at=at(2, 10, 55))
+    hourly = store.read_series(TOKEN, granularity='hourly', aggregate='avg', metrics=['total_holders', 'gini'])
+    assert list(hourly['total_holders']) == [27.5, 40]
+    assert list(hourly['gini']) == pytest.approx([0.2, 0.4])
+    
+    store.record(TOKEN, {'total_holders': 1}, recorded_at=at(4, 0))
+    assert store.read_series(TOKEN, granularity='daily', aggregate='avg', metrics=['gini'])['gini'].isna().iloc[-1]
+
+
+def test_rollups_keep_the_bucket_containing_start(tmp_path):
+    store = store_with_points(tmp_path)
+    hourly = store.read_series(TOKEN, granularity='hourly', metrics=['total_holders'], start=at(2, 10, 30))
+    assert list(hourly['timestamp']) == [at(2, 10), at(3, 8)]
+    daily = store.read_series(TOKEN, granularity='daily', metrics=['total_holders'], start=at(3, 0))
+    assert list(daily['timestamp']) == [at(3, 0)]
+    raw = store.read_series(TOKEN, granularity='raw', metrics=['total_holders'], start=at(2, 10, 30))
+    assert list(raw['total_holders']) == [30, 40]
+
+
+def test_outdated_rollups_are_rebuilt(tmp_path):
+    store = store_with_points(tmp_path)
+    with sqlite3.connect(store.path) as conn:
+        conn.execute("ALTER TABLE metric_rollups DROP COLUMN gini_count")
+    
+    reopened = MetricsStore(str(store.path))
+    hourly = reopened.read_series(TOKEN, granularity='hourly', aggregate='avg', metrics=['total_holders', 'gini'])
+    assert list(hourly['total_holders']) == [20, 40]
+    assert list(hourly['gini']) == pytest.approx([0.2, 0.4])
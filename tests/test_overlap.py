@@ -0,0 +1,90 @@
+"""
+Tests for the cross-token wallet overlap index
+"""
+import numpy as np
+import pandas as pd
+import pytest
+from src.helpers.dune.overlap import AddressIndex, address_keys, key_addresses
+
+
+def address(i: int) -> str:
+    """Distinct 0x address for an integer"""
+    return f"0x{i:040x}"
+
+
+def holders(balances: dict) -> pd.DataFrame:
+    """Holders frame from an {address number: token balance} mapping"""
+    return pd.DataFrame({'wallet_address': [address(i) for i in balances],
+                         'balance_token': list(balances.values())})
+
+
+def decode(keys: np.ndarray) -> set:
+    """Address numbers of a key array"""
+    return {int(value, 16) for value in key_addresses(keys)}
+
+
+INDEX = AddressIndex.from_holders({
+    'A': holders({1: 10.0, 2: 20.0, 3: 30.0, 2 ** 150: 5.0}),
+    'B': holders({2: 1.0, 3: 2.0, 4: 3.0}),
+    'C': holders({3: 7.0, 5: 1.0})
+})
+
+
+def test_address_keys_round_trip():
+    addresses = pd.Series(["0x" + "ab" * 20, "0X" + "CD" * 20, address(7)])
+    keys = address_keys(addresses)
+    assert keys.dtype == np.dtype('S20')
+    assert list(key_addresses(keys)) == ["0x" + "ab" * 20, "0x" + "cd" * 20, address(7)]
+
+
+@pytest.mark.parametrize("bad", ["0x1234", "0x" + "g" * 40, "1x" + "0" * 40])
+def test_address_keys_rejects_malformed_addresses(bad):
+    with pytest.raises(ValueError):
+        address_keys(pd.Series([address(1), bad]))
+
+
+def test_set_operations():
+    assert decode(INDEX.intersection()) == {3}
+    assert decode(INDEX.intersection('A', 'B')) == {2, 3}
+    assert decode(INDEX.union('B', 'C')) == {2, 3, 4, 5}
+    assert decode(INDEX.difference('A')) == {1, 2 ** 150}
+    assert decode(INDEX.difference('A', 'B')) == {1, 2 ** 150}
+    for keys in (INDEX.union(), INDEX.keys('A')):
+        assert np.all(keys[1:] > keys[:-1])
+
+
+def test_set_operations_match_python_sets():
+    rng = np.random.default_rng(2)
+    sets = {symbol: set(rng.integers(0, 2 ** 62, 300).tolist()) | set(range(50)) for symbol in 'XYZ'}
+    index = AddressIndex.from_holders({symbol: holders(dict.fromkeys(values, 1.0)) for symbol, values in sets.items()})
+    assert decode(index.intersection()) == sets['X'] & sets['Y'] & sets['Z']
+    assert decode(index.union()) == sets['X'] | sets['Y'] | sets['Z']
+    assert decode(index.difference('X')) == sets['X'] - sets['Y'] - sets['Z']
+
+
+def test_repeated_wallets_are_merged():
+    df = pd.DataFrame({'wallet_address': [address(1), address(2), address(1).upper().replace('0X', '0x')],
+                       'balance_token': [1.0, 2.0, 3.0]})
+    index = AddressIndex.from_holders({'A': df})
+    assert len(index.keys('A')) == 2
+    assert list(index.balances('A', address_keys(pd.Series([address(1), address(9)])))) == [4.0, 0.0]
+
+
+def test_migrations():
+    previous = AddressIndex.from_holders({'A': holders({1: 1.0, 2: 1.0, 3: 1.0}), 'B': holders({3: 1.0})})
+    current = AddressIndex.from_holders({'A': holders({2: 1.0}), 'B': holders({1: 1.0, 3: 1.0})})
+    assert decode(current.migrations(previous, 'A', 'B')) == {1}
+
+
+def test_overlap_matrix_and_shared_holders():
+    matrix = INDEX.overlap_matrix()
+    assert matrix.loc['A', 'A'] == 4
+    assert matrix.loc['A', 'B'] == matrix.loc['B', 'A'] == 2
+    assert matrix.loc['B', 'C'] == 1
+    
+    shared = INDEX.shared_holders('A', 'B')
+    assert list(shared['wallet_address']) == [address(3), address(2)]
+    assert list(shared['A']) == [30.0, 20.0] and list(shared['B']) == [2.0, 1.0]
+    
+    overlap = INDEX.balance_overlap('A', 'B').set_index('Token')
+    assert overlap.loc['A', 'Supply Share'] == pytest.approx(50 / 65)
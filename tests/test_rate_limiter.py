@@ -0,0 +1,92 @@
+"""
+Tests for the priority token-bucket rate limiter
+"""
+import asyncio
+import threading
+import time
+from src.api.dune.rateLimiter import PRIORITY_BACKGROUND, PRIORITY_INTERACTIVE, RateLimiter
+
+
+def test_burst_then_sustained_rate():
+    limiter = RateLimiter(requests_per_minute=600, burst=3, credits_per_minute=0)
+    assert sum(limiter.acquire() for _ in range(3)) < 0.05
+    # Past the burst, requests are spaced at 10 per second
+    assert limiter.acquire() >= 0.08
+
+
+def test_background_never_overtakes_waiting_interactive():
+    limiter = RateLimiter(requests_per_minute=600, burst=1, credits_per_minute=0)
+    limiter.acquire()
+    order = []
+    
+    def acquire(priority: int, name: str) -> None:
+        limiter.acquire(priority)
+        order.append(name)
+    
+    background = threading.Thread(target=acquire, args=(PRIORITY_BACKGROUND, "background"))
+    interactive = threading.Thread(target=acquire, args=(PRIORITY_INTERACTIVE, "interactive"))
+    background.start()
+    time.sleep(0.02)
+    interactive.start()
+    background.join()
+    interactive.join()
+    assert order == ["interactive", "background"]
+
+
+def test_penalize_pauses_every_request():
+    limiter = RateLimiter(requests_per_minute=0, credits_per_minute=0)
+    assert limiter.acquire() < 0.05
+    limiter.penalize(0.2)
+    assert limiter.acquire() >= 0.18
+
+
+def test_credit_budget():
+    limiter = RateLimiter(requests_per_minute=0, credits_per_minute=600)
+    limiter.acquire(credits=20)
+    limiter.acquire(credits=5)
+    budget = limiter.budget()
+    assert budget["requests_last_minute"] == 2
+    assert budget["credits_last_minute"] == 25
+    assert budget["total_credits"] == 25
+    # The credit bucket holds 10 seconds worth (100 credits), so 80 more must wait
+    started = time.monotonic()
+    limiter.acquire(credits=80)
+    assert time.monotonic() - started >= 0.4
+
+
+def test_acquire_async_does_not_block_the_loop():
+    limiter = RateLimiter(requests_per_minute=600, burst=1, credits_per_minute=0)
+    limiter.acquire()
+    
+    async def main():
+        ticks = []
+        
+        async def tick():
+            for _ in range(5):
+                ticks.append(time.monotonic())
+                await asyncio.sleep(0.01)
+        
+        waited, _ = await asyncio.gather(limiter.acquire_async(), tick())
+        return waited, ticks
+    
+    waited, ticks = asyncio.run(main())
+    assert waited >= 0.08
+    assert ticks[-1] - ticks[0] < 0.08
+
+
+def test_async_background_never_overtakes_waiting_interactive():
+    limiter = RateLimiter(requests_per_minute=600, burst=1, credits_per_minute=0)
+    limiter.acquire()
+    order = []
+    
+    async def acquire(priority: int, name: str, delay: float) -> None:
+        await asyncio.sleep(delay)
+        await limiter.acquire_async(priority)
+        order.append(name)
+    
+    async def main():
+        await asyncio.gather(acquire(PRIORITY_BACKGROUND, "background", 0),
+                             acquire(PRIORITY_INTERACTIVE, "interactive", 0.02))
+    
+    asyncio.run(main())
+    assert order == ["interactive", "background"]
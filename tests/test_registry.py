@@ -0,0 +1,64 @@
+"""
+Tests for the in-process metrics registry
+"""
+import pytest
+from src.utility.instrumentation.registry import Histogram, MetricsRegistry
+
+
+def test_quantile_interpolates_inside_the_bucket():
+    histogram = Histogram((1, 2, 4))
+    for value in (0.5, 1.5, 1.5, 3):
+        histogram.observe(value)
+    assert histogram.quantile(0.25) == pytest.approx(1.0)
+    assert histogram.quantile(0.5) == pytest.approx(1.5)
+    assert histogram.quantile(1.0) == pytest.approx(4.0)
+
+
+def test_quantile_edges():
+    histogram = Histogram((1, 2))
+    assert histogram.quantile(0.5) is None
+    histogram.observe(10)
+    # The overflow bucket has no upper bound, so the largest bound is reported
+    assert histogram.quantile(0.99) == 2
+
+
+def test_prometheus_text():
+    registry = MetricsRegistry(enabled=True, namespace="test")
+    registry.observe("rows", 5, operation='say "hi"')
+    registry.increment("cache_requests_total", 0.1, cache="query", result="hit")
+    registry.increment("cache_requests_total", 0.2, cache="query", result="hit")
+    
+    lines = registry.to_prometheus().splitlines()
+    assert lines[:3] == [
+        "# HELP test_rows Rows returned by instrumented operations",
+        "# TYPE test_rows histogram",
+        'test_rows_bucket{operation="say \\"hi\\"",le="1"} 0'
+    ]
+    assert 'test_rows_bucket{operation="say \\"hi\\"",le="10"} 1' in lines
+    assert 'test_rows_bucket{operation="say \\"hi\\"",le="+Inf"} 1' in lines
+    assert 'test_rows_sum{operation="say \\"hi\\""} 5.0' in lines
+    assert 'test_rows_count{operation="say \\"hi\\""} 1' in lines
+    assert "# TYPE test_cache_requests_total counter" in lines
+    # Values are written exactly, not rounded
+    assert lines[-1] == 'test_cache_requests_total{cache="query",result="hit"} 0.30000000000000004'
+
+
+def test_operations_summary():
+    registry = MetricsRegistry(enabled=True)
+    for seconds in (0.02, 0.04):
+        registry.record("fast", seconds, rows=10)
+    registry.record("slow", 5, error=True)
+    
+    slow, fast = registry.operations()
+    assert (slow["operation"], slow["calls"], slow["errors"], slow["rows"]) == ("slow", 1, 1, None)
+    assert (fast["operation"], fast["calls"], fast["errors"], fast["rows"]) == ("fast", 2, 0, 20)
+    assert fast["mean_seconds"] == pytest.approx(0.03)
+    assert 0.025 <= fast["p50_seconds"] <= fast["p95_seconds"] <= 0.05
+
+
+def test_disabled_registry_records_nothing():
+    registry = MetricsRegistry(enabled=False)
+    registry.record("op", 1.0, rows=3, error=True)
+    with registry.timer("op") as timer:
+        timer.rows = 1
+    assert registry.operations() == [] and registry.to_prometheus() == "\n"
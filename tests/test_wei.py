@@ -0,0 +1,65 @@
+"""
+Tests for the exact wei limb arithmetic
+"""
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pytest
+from src.utility.numbers import split_wei, wei_sum, wei_to_token, wei_total_to_token, wei_sort_order
+
+# Limb boundaries and amounts far beyond float64's 2**53 exact range
+AMOUNTS = [0, 1, 10 ** 18 - 1, 10 ** 18, 10 ** 18 + 1, 123456789 * 10 ** 18 + 987654321, 2 ** 100, 9 * 10 ** 36]
+
+
+def join_limbs(hi: np.ndarray, lo: np.ndarray) -> list:
+    """Rebuild Python integers from limbs"""
+    return [int(h) * 10 ** 18 + int(l) for h, l in zip(hi, lo)]
+
+
+def test_split_wei_round_trip():
+    hi, lo = split_wei(pd.Series([str(amount) for amount in AMOUNTS]))
+    assert hi.dtype == np.int64 and lo.dtype == np.int64
+    assert np.all((lo >= 0) & (lo < 10 ** 18))
+    assert join_limbs(hi, lo) == AMOUNTS
+
+
+def test_split_wei_accepts_arrow_arrays():
+    hi, lo = split_wei(pa.array([str(amount) for amount in AMOUNTS]))
+    assert join_limbs(hi, lo) == AMOUNTS
+
+
+def test_split_wei_reads_missing_balances_as_zero():
+    hi, lo = split_wei(pd.Series(["5", None, np.nan, str(10 ** 18)], dtype=object))
+    assert join_limbs(hi, lo) == [5, 0, 0, 10 ** 18]
+    hi, lo = split_wei(pa.array(["7", None]))
+    assert join_limbs(hi, lo) == [7, 0]
+
+
+def test_split_wei_rejects_non_integers():
+    with pytest.raises(pa.ArrowInvalid):
+        split_wei(pd.Series(["12", "1.5"]))
+
+
+def test_wei_sum_is_exact_beyond_int64():
+    amounts = [10 ** 36 + i for i in range(1000)]
+    hi, lo = split_wei(pd.Series([str(amount) for amount in amounts]))
+    assert wei_sum(hi, lo) == sum(amounts)
+
+
+def test_wei_to_token():
+    hi, lo = split_wei(pd.Series(["1500000000000000000", "250", str(10 ** 24)]))
+    np.testing.assert_allclose(wei_to_token(hi, lo), [1.5, 2.5e-16, 1e6])
+    np.testing.assert_allclose(wei_to_token(hi, lo, decimals=6), [1.5e12, 2.5e-4, 1e18])
+
+
+def test_wei_total_to_token():
+    assert wei_total_to_token(3 * 10 ** 18, count=2) == 1.5
+    assert wei_total_to_token(10 ** 40, decimals=18) == 1e22
+    assert wei_total_to_token(5, count=0) == 0.0
+
+
+def test_wei_sort_order_breaks_ties_on_low_limb():
+    amounts = [10 ** 18 + 5, 2 * 10 ** 18, 10 ** 18 + 7, 3]
+    hi, lo = split_wei(pd.Series([str(amount) for amount in amounts]))
+    assert list(wei_sort_order(hi, lo)) == [1, 2, 0, 3]
+    assert list(wei_sort_order(hi, lo, descending=False)) == [3, 0, 2, 1]